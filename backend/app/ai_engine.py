@@ -6,8 +6,11 @@ from sqlalchemy.orm import Session
 class AIRecommendationEngine:
     """Motor de IA para generar recomendaciones de componentes de PC."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Optional[Session], catalog: Optional[Dict[str, List[Component]]] = None):
         self.db = db
+        # Catálogo precargado por tipo (p. ej. desde una sesión asíncrona); si no
+        # se indica, los componentes se consultan en la sesión síncrona
+        self.catalog = catalog
         
         # Pesos para diferentes tipos de uso
         self.usage_weights = {
@@ -72,13 +75,19 @@ class AIRecommendationEngine:
             
         return adjusted_distribution
     
+    def _get_components_by_type(self, component_type: str) -> List[Component]:
+        """Obtiene los componentes de un tipo desde el catálogo precargado o la base de datos."""
+        if self.catalog is not None:
+            return self.catalog.get(component_type, [])
+        return self.db.query(Component).filter(Component.type == component_type).all()
+    
     def _select_components_by_budget(self, budget_distribution: Dict[str, float]) -> Dict[str, Component]:
         """Selecciona componentes según el presupuesto asignado para cada tipo."""
         selected_components = {}
         
         for component_type, budget in budget_distribution.items():
             # Obtener componentes del tipo específico
-            components = self.db.query(Component).filter(Component.type == component_type).all()
+            components = self._get_components_by_type(component_type)
             
             # Filtrar componentes dentro del presupuesto (con un margen del 10%)
             affordable_components = [c for c in components if c.price <= budget * 1.1]
@@ -179,9 +188,13 @@ class AIRecommendationEngine:
             "compatibility_score": compatibility_score
         }
     
-    def generate_recommendation(self, budget: float, usage_type: str, 
-                               preferences: Optional[Dict[str, bool]] = None) -> Dict:
-        """Genera una recomendación de componentes basada en presupuesto y preferencias."""
+    def select_components(self, budget: float, usage_type: str,
+                          preferences: Optional[Dict[str, bool]] = None) -> Dict[str, Component]:
+        """
+        Elige un componente por tipo según el presupuesto y las preferencias.
+        Solo usa id, precio y rendimiento, así que el catálogo puede contener
+        filas con esas columnas en lugar de componentes completos.
+        """
         # Calcular distribución de presupuesto
         budget_distribution = self._calculate_budget_distribution(budget, usage_type)
         
@@ -190,8 +203,15 @@ class AIRecommendationEngine:
             budget_distribution = self._adjust_budget_for_preferences(budget_distribution, preferences)
         
         # Seleccionar componentes iniciales
-        selected_components = self._select_components_by_budget(budget_distribution)
-        
+        return self._select_components_by_budget(budget_distribution)
+    
+    def generate_recommendation(self, budget: float, usage_type: str, 
+                               preferences: Optional[Dict[str, bool]] = None) -> Dict:
+        """Genera una recomendación de componentes basada en presupuesto y preferencias."""
+        return self.build_recommendation(self.select_components(budget, usage_type, preferences))
+    
+    def build_recommendation(self, selected_components: Dict[str, Component]) -> Dict:
+        """Compatibilidad, precio total y rendimiento de los componentes elegidos."""
         # Verificar compatibilidad
         compatibility_result = self._check_compatibility(selected_components)
         
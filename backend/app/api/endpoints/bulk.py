@@ -0,0 +1,141 @@
+"""
+Endpoints de operaciones masivas sobre componentes.
+
+Aceptan un array JSON o NDJSON en streaming (Content-Type:
+application/x-ndjson). Cada elemento se valida por separado, de modo que los
+inválidos se informan sin abortar el resto, y los válidos se escriben en una
+sola transacción con executemany.
+"""
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from ... import crud
+from ...database import get_write_db, mark_primary_sticky
+from ...schemas import BulkItemResult, BulkOperationResult, ComponentBulkUpdate, ComponentCreate
+
+router = APIRouter()
+
+class _InvalidItem:
+    """Elemento que no se pudo decodificar o validar."""
+
+    def __init__(self, error: str):
+        self.error = error
+
+async def _read_items(request: Request) -> List[Any]:
+    """Lee el cuerpo como NDJSON (línea a línea, en streaming) o como array JSON."""
+    if "ndjson" in request.headers.get("content-type", ""):
+        items: List[Any] = []
+        buffer = b""
+
+        def parse(line: bytes) -> None:
+            if line.strip():
+                try:
+                    items.append(orjson.loads(line))
+                except orjson.JSONDecodeError as e:
+                    items.append(_InvalidItem(f"JSON inválido: {e}"))
+
+        async for chunk in request.stream():
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            for line in lines:
+                parse(line)
+        parse(buffer)
+        return items
+
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"JSON inválido: {e}")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Se esperaba un array de elementos")
+    return payload
+
+def _validate(items: Sequence[Any], schema: type) -> List[Any]:
+    """Valida cada elemento con el esquema; los errores quedan como _InvalidItem."""
+    validated: List[Any] = []
+    for item in items:
+        if isinstance(item, _InvalidItem):
+            validated.append(item)
+            continue
+        try:
+            validated.append(schema.model_validate(item))
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            validated.append(_InvalidItem(f"{location}: {error['msg']}" if location else error["msg"]))
+    return validated
+
+def _build_result(results: List[BulkItemResult]) -> BulkOperationResult:
+    succeeded = sum(result.status in ("created", "updated", "deleted") for result in results)
+    return BulkOperationResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+async def _run(operation: Callable, db: Session, payload: Any) -> List[int]:
+    ids = await run_in_threadpool(operation, db, payload)
+    if ids is None:
+        raise HTTPException(status_code=500, detail="Error en la operación masiva; no se aplicó ningún cambio")
+    return ids
+
+@router.post("", response_model=BulkOperationResult)
+async def bulk_create(request: Request, response: Response, db: Session = Depends(get_write_db)):
+    """Crea componentes con sus especificaciones en una sola transacción."""
+    items = _validate(await _read_items(request), ComponentCreate)
+    valid = [(index, item) for index, item in enumerate(items) if not isinstance(item, _InvalidItem)]
+    ids = await _run(crud.bulk_create_components, db, [item for _, item in valid])
+    mark_primary_sticky(response)
+
+    results = [
+        BulkItemResult(index=index, status="invalid", error=item.error)
+        for index, item in enumerate(items) if isinstance(item, _InvalidItem)
+    ]
+    results += [
+        BulkItemResult(index=index, status="created", id=component_id)
+        for (index, _), component_id in zip(valid, ids)
+    ]
+    results.sort(key=lambda result: result.index)
+    return _build_result(results)
+
+@router.put("", response_model=BulkOperationResult)
+async def bulk_update(request: Request, response: Response, db: Session = Depends(get_write_db)):
+    """Actualiza componentes existentes (identificados por `id`) en una sola transacción."""
+    items = _validate(await _read_items(request), ComponentBulkUpdate)
+    results: List[Optional[BulkItemResult]] = [None] * len(items)
+    updates: List[Tuple[int, ComponentCreate]] = []
+    index_by_id = {}
+    for index, item in enumerate(items):
+        if isinstance(item, _InvalidItem):
+            results[index] = BulkItemResult(index=index, status="invalid", error=item.error)
+        elif item.id in index_by_id:
+            results[index] = BulkItemResult(index=index, status="invalid", id=item.id, error="ID duplicado en la petición")
+        else:
+            index_by_id[item.id] = index
+            updates.append((item.id, ComponentCreate(**item.model_dump(exclude={"id"}))))
+
+    updated = set(await _run(crud.bulk_update_components, db, updates))
+    mark_primary_sticky(response)
+    for component_id, index in index_by_id.items():
+        status = "updated" if component_id in updated else "not_found"
+        results[index] = BulkItemResult(index=index, status=status, id=component_id)
+    return _build_result(results)
+
+class _DeleteItem(BaseModel):
+    id: int
+
+@router.delete("", response_model=BulkOperationResult)
+async def bulk_delete(request: Request, response: Response, db: Session = Depends(get_write_db)):
+    """Elimina componentes en una sola transacción. Acepta IDs o objetos {"id": ...}."""
+    raw_items = [{"id": item} if isinstance(item, int) else item for item in await _read_items(request)]
+    items = _validate(raw_items, _DeleteItem)
+    ids = list(dict.fromkeys(item.id for item in items if not isinstance(item, _InvalidItem)))
+    deleted = set(await _run(crud.bulk_delete_components, db, ids))
+    mark_primary_sticky(response)
+
+    results = [
+        BulkItemResult(index=index, status="invalid", error=item.error) if isinstance(item, _InvalidItem)
+        else BulkItemResult(index=index, status="deleted" if item.id in deleted else "not_found", id=item.id)
+        for index, item in enumerate(items)
+    ]
+    return _build_result(results)
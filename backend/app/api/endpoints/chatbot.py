@@ -1,24 +1,32 @@
 """
 Endpoints para la API del chatbot.
 """
-from typing import Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+import orjson
+import os
+import time
 import uuid
-import re
 
 from ...chatbot import ChatMessage, ComputerChatbot
-from ...ai_engine import get_ai_engine
-from sqlalchemy.orm import Session
-from ...database import get_db
-from ...models import User
+from ... import async_crud
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from ...database import AsyncReadSessionLocal, AsyncSessionLocal, get_async_read_db, get_async_read_session_factory
+from ...keyword_matcher import chat_matcher
+from ...models import Component, User
+from ...retrieval import retrieval_index
+from ...scrape_jobs import scrape_jobs
 from ...auth import get_current_user
-
-# Instancia global del chatbot
-chatbot = ComputerChatbot()
+from ...services import get_chatbot
 
 router = APIRouter()
 
+# Tiempo máximo que el chat en streaming espera al scraping en segundo plano
+CHAT_SCRAPE_WAIT_SECONDS = float(os.getenv("CHAT_SCRAPE_WAIT_SECONDS", "30"))
+
 class ChatRequest(BaseModel):
     """Modelo para las solicitudes de chat."""
     message: str
@@ -28,16 +36,116 @@ class ChatResponse(BaseModel):
     """Modelo para las respuestas de chat."""
     message: str
     session_id: str
+    # Hay un scraping en segundo plano para el tipo pedido; repetir la pregunta más tarde
+    catalog_refresh_pending: bool = False
 
 class ChatHistoryResponse(BaseModel):
     """Modelo para las respuestas de historial de chat."""
     messages: List[ChatMessage]
     session_id: str
 
+async def _catalog_components(db: AsyncSession, message: str, component_type: Optional[str]) -> List[Component]:
+    """
+    Los componentes más relevantes para el mensaje según el índice de
+    recuperación del catálogo, solo del tipo pedido si se conoce. Si el índice
+    no da resultados (p. ej. aún no se ha construido), los primeros del tipo.
+    """
+    query = f"{message} {component_type}" if component_type else message
+    hits = retrieval_index.search(query, k=3, component_type=component_type)
+    if hits:
+        components = await async_crud.get_components_by_ids(db, [component_id for component_id, _ in hits])
+        if components:
+            return components
+    if not component_type:
+        return []
+    return await async_crud.get_components_by_type_variants(db, component_type, limit=3)
+
+async def _find_components(db: AsyncSession, message: str) -> Tuple[List[Component], Optional[str]]:
+    """
+    Componentes del catálogo relacionados con el mensaje y, si no hay ninguno
+    del tipo pedido, el tipo cuyo scraping queda pendiente en segundo plano.
+    """
+    # Verificar si el mensaje contiene palabras clave para buscar componentes
+    matches = chat_matcher.match(message)
+    if not matches.has("catalog_search"):
+        return [], None
+    
+    # Tipo de componente pedido, si el mensaje lo menciona
+    component_type = matches.first("catalog_type")
+    try:
+        components = await _catalog_components(db, message, component_type)
+    except Exception as e:
+        print(f"Error al buscar componentes: {e}")
+        return [], None
+    if components or not component_type:
+        return components, None
+    
+    # Sin resultados: el scraping se hace fuera de la petición
+    return [], component_type if scrape_jobs.enqueue(component_type) else None
+
+def _format_components(components: List[Component]) -> str:
+    component_info = "\n\nAquí tienes algunas recomendaciones de nuestra base de datos:\n"
+    for i, comp in enumerate(components, 1):
+        component_info += f"{i}. {comp.name} - {comp.price}€\n"
+    return component_info
+
+def _pending_text(component_type: str) -> str:
+    return f"\n\nAhora mismo no tengo componentes de tipo {component_type} en el catálogo; los estoy buscando en tiendas online."
+
+def _components_event(components: List[Component]) -> Dict[str, Any]:
+    return {
+        "type": "components",
+        "text": _format_components(components),
+        "components": [{"id": comp.id, "name": comp.name, "price": comp.price} for comp in components]
+    }
+
+async def _chat_events(
+    chatbot: ComputerChatbot, session_factory: async_sessionmaker, session_id: str, message: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Eventos de una respuesta en streaming: la sesión, cada fragmento de texto
+    en cuanto se genera, las sugerencias del catálogo y el final.
+
+    La sesión de base de datos se abre solo para buscar los componentes y se
+    cierra antes de esperar al scraping, para no retener una conexión del pool
+    (ni una transacción abierta) mientras tanto.
+    """
+    yield {"type": "session", "session_id": session_id}
+    
+    # La respuesta se genera en un hilo; cada fragmento se envía al producirse
+    chunks = chatbot.stream_message(session_id, message)
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield {"type": "chunk", "text": chunk}
+    finally:
+        # Guarda la sesión aunque el cliente se desconecte a mitad
+        try:
+            await run_in_threadpool(chunks.close)
+        except ValueError:
+            # Un fragmento aún se está generando en otro hilo: se cierra al recolectarse
+            pass
+    
+    requested_at = time.monotonic()
+    async with session_factory() as db:
+        components, pending_type = await _find_components(db, message)
+    if components:
+        yield _components_event(components)
+    elif pending_type:
+        # Aviso inmediato y, cuando termine el scraping, un evento con los componentes nuevos
+        yield {"type": "components_pending", "component_type": pending_type, "text": _pending_text(pending_type)}
+        if await scrape_jobs.wait(pending_type, CHAT_SCRAPE_WAIT_SECONDS, since=requested_at):
+            # Recién escritos en la principal: no se leen de una réplica que aún no los tenga
+            async with AsyncSessionLocal() as primary_db:
+                components = await _catalog_components(primary_db, message, pending_type)
+            if components:
+                yield _components_event(components)
+    yield {"type": "done"}
+
 @router.post("/chat", response_model=ChatResponse)
-def chat(
+async def chat(
     request: ChatRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db),
+    chatbot: ComputerChatbot = Depends(get_chatbot)
 ) -> Dict:
     """
     Endpoint para enviar un mensaje al chatbot y recibir una respuesta.
@@ -45,95 +153,84 @@ def chat(
     # Crear un ID de sesión si no se proporciona
     session_id = request.session_id or str(uuid.uuid4())
     
-    # Configurar el motor de IA si es necesario
-    if chatbot.ai_engine is None:
-        chatbot.set_ai_engine(get_ai_engine(db))
-    
-    # Procesar el mensaje y obtener respuesta
-    response = chatbot.process_message(session_id, request.message)
-    
-    # Verificar si el mensaje contiene palabras clave para buscar componentes
-    keywords = ["recomienda", "busca", "encuentra", "mejor", "componente", "cpu", "gpu", "ram", "placa", "motherboard", "fuente", "psu", "almacenamiento", "ssd", "hdd"]
+    # Procesar el mensaje y obtener respuesta (el almacén de sesiones puede ser la base de datos)
+    response = await run_in_threadpool(chatbot.process_message, session_id, request.message)
     
-    if any(keyword in request.message.lower() for keyword in keywords):
-        # Intentar obtener componentes de la base de datos
-        try:
-            from ...scraper import ComponentScraper
-            from ... import crud
-            
-            # Inicializar el scraper
-            component_scraper = ComponentScraper()
-            
-            # Determinar qué tipo de componente buscar
-            component_type = None
-            if "cpu" in request.message.lower():
-                component_type = "CPU"
-            elif "gpu" in request.message.lower() or "tarjeta" in request.message.lower():
-                component_type = "GPU"
-            elif "ram" in request.message.lower() or "memoria" in request.message.lower():
-                component_type = "RAM"
-            elif "placa" in request.message.lower() or "motherboard" in request.message.lower():
-                component_type = "Motherboard"
-            elif "fuente" in request.message.lower() or "psu" in request.message.lower():
-                component_type = "PSU"
-            elif "almacenamiento" in request.message.lower() or "ssd" in request.message.lower() or "hdd" in request.message.lower():
-                component_type = "Storage"
-            
-            if component_type:
-                # Buscar componentes en la base de datos
-                components = crud.get_components_by_type(db, component_type, limit=3)
-                
-                # Si no hay componentes, intentar hacer scraping
-                if not components:
-                    # Hacer scraping y guardar en la base de datos
-                    scraped_components = component_scraper.scrape_newegg_components(component_type, max_pages=1)
-                    for comp_data in scraped_components[:5]:  # Limitar a 5 componentes
-                        component = crud.create_component(
-                            db,
-                            name=comp_data.name,
-                            type=comp_data.type,
-                            brand=comp_data.brand,
-                            model=comp_data.model,
-                            price=comp_data.price,
-                            description=comp_data.description,
-                            image_url=comp_data.image_url
-                        )
-                    
-                    # Obtener los componentes recién añadidos
-                    components = crud.get_components_by_type(db, component_type, limit=3)
-                
-                # Añadir información de componentes a la respuesta
-                if components:
-                    component_info = "\n\nAquí tienes algunas recomendaciones de nuestra base de datos:\n"
-                    for i, comp in enumerate(components, 1):
-                        component_info += f"{i}. {comp.name} - {comp.price}€\n"
-                    
-                    # Añadir la información al final de la respuesta
-                    response += component_info
-        except Exception as e:
-            print(f"Error al buscar componentes: {e}")
-            # No modificar la respuesta si hay error
+    # Añadir información de componentes a la respuesta
+    components, pending_type = await _find_components(db, request.message)
+    if components:
+        response += _format_components(components)
+    elif pending_type:
+        response += _pending_text(pending_type)
     
     # No hay usuario autenticado en este endpoint público
     return {
         "message": response,
-        "session_id": session_id
+        "session_id": session_id,
+        "catalog_refresh_pending": pending_type is not None
     }
 
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    session_factory: async_sessionmaker = Depends(get_async_read_session_factory),
+    chatbot: ComputerChatbot = Depends(get_chatbot)
+) -> StreamingResponse:
+    """
+    Igual que /chat, pero responde con Server-Sent Events: `session`, un
+    `chunk` por fragmento de la respuesta, `components` con las sugerencias
+    del catálogo (si las hay) y `done`. Si el catálogo no tiene el tipo
+    pedido se envía `components_pending` y, cuando el scraping en segundo
+    plano añade componentes, un evento `components` con ellos.
+    """
+    session_id = request.session_id or str(uuid.uuid4())
+    
+    async def event_stream() -> AsyncIterator[bytes]:
+        async for event in _chat_events(chatbot, session_factory, session_id, request.message):
+            yield b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+    
+    # X-Accel-Buffering evita que nginx acumule los eventos antes de enviarlos
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket, chatbot: ComputerChatbot = Depends(get_chatbot)) -> None:
+    """
+    Chat por WebSocket: cada mensaje JSON ({"message", "session_id"}) recibe
+    los mismos eventos que /chat/stream, como objetos JSON con `type`.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                request = ChatRequest.model_validate(await websocket.receive_json())
+            except (ValueError, ValidationError) as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            session_id = request.session_id or str(uuid.uuid4())
+            # La sesión de base de datos se abre por mensaje y solo mientras se consulta
+            async for event in _chat_events(chatbot, AsyncReadSessionLocal, session_id, request.message):
+                await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+
 @router.get("/history/{session_id}", response_model=ChatHistoryResponse)
 def get_chat_history(
     session_id: str,
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[User] = Depends(get_current_user),
+    chatbot: ComputerChatbot = Depends(get_chatbot)
 ) -> Dict:
     """
     Obtiene el historial de mensajes de una sesión de chat.
     """
     # Verificar si la sesión existe
-    if session_id not in chatbot.sessions:
+    session = chatbot.get_session(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Sesión de chat no encontrada")
     
-    session = chatbot.sessions[session_id]
-    
     # Verificar si el usuario tiene acceso a esta sesión
     if current_user and session.user_id and session.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para acceder a esta sesión de chat")
@@ -146,22 +243,22 @@ def get_chat_history(
 @router.delete("/history/{session_id}")
 def delete_chat_history(
     session_id: str,
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[User] = Depends(get_current_user),
+    chatbot: ComputerChatbot = Depends(get_chatbot)
 ) -> Dict:
     """
     Elimina el historial de mensajes de una sesión de chat.
     """
     # Verificar si la sesión existe
-    if session_id not in chatbot.sessions:
+    session = chatbot.get_session(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Sesión de chat no encontrada")
     
-    session = chatbot.sessions[session_id]
-    
     # Verificar si el usuario tiene acceso a esta sesión
     if current_user and session.user_id and session.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="No tienes permiso para eliminar esta sesión de chat")
     
     # Eliminar la sesión
-    del chatbot.sessions[session_id]
+    chatbot.delete_session(session_id)
     
     return {"message": "Historial de chat eliminado correctamente"}
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Endpoints de descarga de las instantáneas columnares del catálogo.
+"""
+import os
+from typing import Dict
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from ...snapshots import SNAPSHOT_TABLES, get_latest_manifest, get_latest_snapshot_dir
+
+router = APIRouter()
+
+SNAPSHOT_MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+@router.get("/latest")
+def get_latest_snapshot() -> Dict:
+    """Devuelve el manifiesto (tablas y número de filas) de la última instantánea."""
+    manifest = get_latest_manifest()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No hay instantáneas disponibles")
+    return manifest
+
+@router.get("/latest/{table_name}.{file_format}")
+def download_latest_snapshot(table_name: str, file_format: str) -> FileResponse:
+    """Descarga una tabla de la última instantánea en Parquet o Arrow IPC."""
+    if table_name not in SNAPSHOT_TABLES or file_format not in SNAPSHOT_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Tabla o formato desconocido")
+    directory = get_latest_snapshot_dir()
+    if directory is None:
+        raise HTTPException(status_code=404, detail="No hay instantáneas disponibles")
+    filename = f"{table_name}.{file_format}"
+    return FileResponse(
+        os.path.join(directory, filename),
+        media_type=SNAPSHOT_MEDIA_TYPES[file_format],
+        filename=f"{os.path.basename(directory)}-{filename}"
+    )
@@ -0,0 +1,89 @@
+"""
+Endpoints de estadísticas del catálogo.
+"""
+from typing import Dict, List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ...catalog_json import component_renderer
+from ...crud import get_components_by_ids
+from ...database import get_pool_metrics, get_read_db
+from ...popularity import popularity_tracker
+from ...response_cache import catalog_versions, response_cache
+from ...retrieval import retrieval_index
+from ...schemas import PopularComponent
+from ...scrape_jobs import scrape_jobs
+from ...services import services
+from ...stats import stats_service
+
+router = APIRouter()
+
+@router.get("/components")
+def get_component_stats(db: Session = Depends(get_read_db)) -> Dict:
+    """
+    Devuelve conteos, percentiles de precio y puntuaciones medias por tipo
+    desde la instantánea materializada.
+    """
+    snapshot = stats_service.get_snapshot(db)
+    return {**snapshot, "stale": stats_service.is_stale}
+
+@router.get("/popular-components", response_model=List[PopularComponent])
+def get_popular_components(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+) -> List[Dict]:
+    """
+    Devuelve los componentes más vistos, comparados y recomendados según el
+    ranking en memoria; solo se leen de la base de datos las filas del resultado.
+    `impressions` es el mínimo garantizado y `impressions_upper_bound` la
+    estimación del ranking; coinciden salvo que el componente entrara al
+    ranking reemplazando a otro.
+    """
+    top = {
+        component_id: (impressions, upper_bound)
+        for component_id, impressions, upper_bound in popularity_tracker.top(limit)
+    }
+    components = get_components_by_ids(db, list(top))
+    return [
+        {
+            "component": component,
+            "impressions": top[component.id][0],
+            "impressions_upper_bound": top[component.id][1],
+        }
+        for component in components
+    ]
+
+@router.get("/database")
+def get_database_pool_stats() -> Dict:
+    """Devuelve las métricas de los pools de conexiones a la base de datos."""
+    return get_pool_metrics()
+
+@router.get("/cache")
+def get_response_cache_stats() -> Dict:
+    """Devuelve las métricas de la caché de respuestas del catálogo."""
+    return {
+        **response_cache.get_metrics(),
+        "catalog_version": catalog_versions.catalog_version,
+        "component_fragments": component_renderer.fragments.get_metrics(),
+    }
+
+@router.get("/chat-sessions")
+def get_chat_session_stats() -> Dict:
+    """Devuelve las métricas del almacén de sesiones del chatbot (tamaño, aciertos y expulsiones)."""
+    return services.session_store.get_metrics()
+
+@router.get("/intents")
+def get_intent_cache_stats() -> Dict:
+    """Devuelve el estado del modelo de intenciones y el acierto de sus cachés."""
+    chatbot = services.chatbot
+    return {**chatbot.intent_classifier.get_metrics(), "detection_cache": chatbot.intent_cache.get_metrics()}
+
+@router.get("/scrape-jobs")
+def get_scrape_job_stats() -> Dict:
+    """Devuelve los trabajos de scraping en segundo plano pendientes y completados."""
+    return scrape_jobs.get_metrics()
+
+@router.get("/retrieval")
+def get_retrieval_index_stats() -> Dict:
+    """Devuelve el tamaño del índice de recuperación de componentes del chat."""
+    return retrieval_index.get_metrics()
@@ -0,0 +1,128 @@
+"""
+Versiones asíncronas de las funciones de lectura de crud.py.
+Usan AsyncSession y cargan las especificaciones con selectinload, ya que en
+una sesión asíncrona no se permite la carga perezosa de relaciones.
+"""
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import Row, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from . import models
+from .ai_engine import AIRecommendationEngine
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+def _components_query():
+    return select(models.Component).options(selectinload(models.Component.specifications))
+
+async def get_component(db: AsyncSession, component_id: int) -> Optional[models.Component]:
+    """Obtiene un componente por ID con sus especificaciones."""
+    try:
+        result = await db.execute(_components_query().where(models.Component.id == component_id))
+        return result.scalars().first()
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componente {component_id}: {e}")
+        return None
+
+async def get_components(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Component]:
+    """Obtiene lista de componentes con paginación."""
+    try:
+        result = await db.execute(_components_query().offset(skip).limit(limit))
+        return list(result.scalars().all())
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componentes: {e}")
+        return []
+
+async def get_components_by_type(db: AsyncSession, type: str, skip: int = 0, limit: int = 100) -> List[models.Component]:
+    """Obtiene componentes filtrados por tipo."""
+    try:
+        result = await db.execute(
+            _components_query().where(models.Component.type == type).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componentes por tipo {type}: {e}")
+        return []
+
+async def get_components_by_type_variants(db: AsyncSession, type: str, limit: int = 100) -> List[models.Component]:
+    """
+    Componentes cuyo tipo coincide sin distinguir mayúsculas en sus grafías
+    habituales ("CPU", "cpu", "Cpu"); usa el índice de tipo en lugar de lower().
+    """
+    variants = {type, type.lower(), type.upper(), type.capitalize()}
+    try:
+        result = await db.execute(
+            _components_query().where(models.Component.type.in_(variants)).limit(limit)
+        )
+        return list(result.scalars().all())
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componentes por tipo {type}: {e}")
+        return []
+
+async def get_components_by_ids(db: AsyncSession, component_ids: List[int]) -> List[models.Component]:
+    """Obtiene componentes por ID conservando el orden solicitado."""
+    if not component_ids:
+        return []
+    try:
+        result = await db.execute(_components_query().where(models.Component.id.in_(component_ids)))
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componentes por ID: {e}")
+        return []
+    by_id = {component.id: component for component in result.scalars().all()}
+    return [by_id[component_id] for component_id in component_ids if component_id in by_id]
+
+async def get_selection_candidates(db: AsyncSession, types: List[str]) -> Dict[str, List[Row]]:
+    """
+    Candidatos de varios tipos para el motor de recomendaciones, agrupados
+    por tipo y en una sola consulta. Solo se leen las columnas con las que se
+    elige (id, tipo, precio y rendimiento), sin especificaciones.
+    """
+    catalog: Dict[str, List[Row]] = {component_type: [] for component_type in types}
+    try:
+        result = await db.execute(
+            select(
+                models.Component.id,
+                models.Component.type,
+                models.Component.price,
+                models.Component.performance_score,
+            ).where(models.Component.type.in_(types))
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componentes por tipos {types}: {e}")
+        return catalog
+    for row in result.all():
+        catalog[row.type].append(row)
+    return catalog
+
+async def check_compatibility(db: AsyncSession, component_ids: List[int]) -> Dict:
+    """
+    Verifica la compatibilidad entre componentes utilizando el motor de IA.
+    """
+    components = {component.type: component for component in await get_components_by_ids(db, component_ids)}
+    return AIRecommendationEngine(None)._check_compatibility(components)
+
+async def generate_recommendations(db: AsyncSession, budget: float, usage_type: str,
+                                   preferences: Optional[Dict[str, bool]] = None) -> Dict:
+    """
+    Genera recomendaciones con el motor de IA: elige sobre las columnas
+    mínimas de los tipos necesarios y carga completos, con sus
+    especificaciones, solo los componentes elegidos.
+    """
+    ai_engine = AIRecommendationEngine(None)
+    budget_distribution = ai_engine._calculate_budget_distribution(budget, usage_type)
+    ai_engine.catalog = await get_selection_candidates(db, list(budget_distribution))
+    chosen = ai_engine.select_components(budget, usage_type, preferences)
+    components = {
+        component.id: component
+        for component in await get_components_by_ids(db, [row.id for row in chosen.values()])
+    }
+    selected = {
+        component_type: components[row.id]
+        for component_type, row in chosen.items() if row.id in components
+    }
+    return ai_engine.build_recommendation(selected)
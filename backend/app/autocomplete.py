@@ -0,0 +1,225 @@
+"""
+Índice de autocompletado en memoria para la búsqueda de componentes.
+Mantiene un trie sobre nombres, marcas y modelos normalizados para
+responder sugerencias por prefijo sin consultar la base de datos.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import heapq
+import re
+import threading
+import unicodedata
+
+from sqlalchemy.orm import Session
+
+from .models import Component
+
+# Número máximo de sugerencias que se guardan por nodo del trie
+MAX_SUGGESTIONS = 10
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normaliza un texto: minúsculas, sin acentos y sin signos de puntuación."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^\w]+", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class _TrieNode:
+    """Nodo del trie con las mejores sugerencias de su subárbol."""
+
+    __slots__ = ("children", "terminals", "top", "dirty")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terminals: Set[int] = set()
+        # Lista (peso, id) ordenada de mayor a menor peso
+        self.top: List[Tuple[float, int]] = []
+        self.dirty = False
+
+
+class AutocompleteIndex:
+    """Trie de prefijos con pesos de popularidad para sugerencias rápidas."""
+
+    def __init__(self, max_suggestions: int = MAX_SUGGESTIONS):
+        self.max_suggestions = max_suggestions
+        self._root = _TrieNode()
+        self._lock = threading.Lock()
+        self._components: Dict[int, Dict] = {}
+        self._keys: Dict[int, Set[str]] = {}
+        self._weights: Dict[int, float] = {}
+        self._popularity: Dict[int, float] = {}
+
+    def _component_keys(self, component: Component) -> Set[str]:
+        """Genera las claves indexadas: cada sufijo de palabra del nombre, la marca y el modelo."""
+        keys = set()
+        words = normalize_text(component.name).split()
+        for position in range(len(words)):
+            keys.add(" ".join(words[position:]))
+        for value in (component.brand, component.model):
+            normalized = normalize_text(value)
+            if normalized:
+                keys.add(normalized)
+        return keys
+
+    def _weight(self, component_id: int) -> float:
+        """Peso de una entrada: puntuación de rendimiento más popularidad acumulada."""
+        return self._weights.get(component_id, 0.0) + self._popularity.get(component_id, 0.0)
+
+    def _insert_key(self, key: str, component_id: int, weight: float) -> None:
+        node = self._root
+        self._merge_top(node, component_id, weight)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            self._merge_top(node, component_id, weight)
+        node.terminals.add(component_id)
+
+    def _remove_key(self, key: str, component_id: int) -> None:
+        path = [self._root]
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        node.terminals.discard(component_id)
+        for visited in path:
+            if any(entry_id == component_id for _, entry_id in visited.top):
+                visited.dirty = True
+
+    def _merge_top(self, node: _TrieNode, component_id: int, weight: float) -> None:
+        """Inserta una entrada en la lista de mejores sugerencias de un nodo limpio."""
+        if node.dirty:
+            return
+        entries = [entry for entry in node.top if entry[1] != component_id]
+        if len(entries) < len(node.top):
+            # El componente ya estaba (por otra clave); se reemplaza su peso
+            entries.append((weight, component_id))
+        elif len(entries) < self.max_suggestions:
+            entries.append((weight, component_id))
+        elif (-weight, component_id) < (-entries[-1][0], entries[-1][1]):
+            entries[-1] = (weight, component_id)
+        else:
+            return
+        entries.sort(key=lambda entry: (-entry[0], entry[1]))
+        node.top = entries
+
+    def _refresh(self, node: _TrieNode) -> List[Tuple[float, int]]:
+        """Recalcula las sugerencias de un nodo marcado como sucio."""
+        if node.dirty:
+            candidates = {component_id: self._weight(component_id) for component_id in node.terminals}
+            for child in node.children.values():
+                for weight, component_id in self._refresh(child):
+                    candidates[component_id] = weight
+            node.top = heapq.nsmallest(
+                self.max_suggestions,
+                ((weight, component_id) for component_id, weight in candidates.items()),
+                key=lambda entry: (-entry[0], entry[1])
+            )
+            node.dirty = False
+        return node.top
+
+    def _insert_key_lazy(self, key: str, component_id: int) -> None:
+        """Inserta una clave marcando su camino como sucio en lugar de fusionar las listas."""
+        node = self._root
+        node.dirty = True
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            node.dirty = True
+        node.terminals.add(component_id)
+
+    def _add(self, component: Component, lazy: bool = False) -> None:
+        self._remove(component.id)
+        self._components[component.id] = {
+            "id": component.id,
+            "name": component.name,
+            "brand": component.brand,
+            "model": component.model,
+            "type": component.type,
+        }
+        self._weights[component.id] = float(component.performance_score or 0.0)
+        keys = self._component_keys(component)
+        self._keys[component.id] = keys
+        weight = self._weight(component.id)
+        for key in keys:
+            if lazy:
+                self._insert_key_lazy(key, component.id)
+            else:
+                self._insert_key(key, component.id, weight)
+
+    def _remove(self, component_id: int) -> None:
+        for key in self._keys.pop(component_id, ()):
+            self._remove_key(key, component_id)
+        self._components.pop(component_id, None)
+        self._weights.pop(component_id, None)
+
+    def add_component(self, component: Component) -> None:
+        """Añade o reemplaza un componente en el índice."""
+        with self._lock:
+            self._add(component)
+
+    def add_components(self, components: List[Component]) -> None:
+        """
+        Añade o reemplaza varios componentes a la vez (importaciones masivas).
+        Las listas de sugerencias afectadas se recalculan en la siguiente consulta.
+        """
+        with self._lock:
+            for component in components:
+                self._add(component, lazy=True)
+
+    def remove_component(self, component_id: int) -> None:
+        """Elimina un componente del índice."""
+        with self._lock:
+            self._remove(component_id)
+            self._popularity.pop(component_id, None)
+
+    def add_popularity(self, component_id: int, amount: float = 1.0) -> None:
+        """Incrementa el peso de popularidad de un componente."""
+        with self._lock:
+            self._popularity[component_id] = self._popularity.get(component_id, 0.0) + amount
+            keys = self._keys.get(component_id)
+            if not keys:
+                return
+            for key in keys:
+                self._remove_key(key, component_id)
+            weight = self._weight(component_id)
+            for key in keys:
+                self._insert_key(key, component_id, weight)
+
+    def rebuild(self, components: List[Component]) -> None:
+        """Reconstruye el índice completo a partir de una lista de componentes."""
+        with self._lock:
+            self._root = _TrieNode()
+            self._components.clear()
+            self._keys.clear()
+            self._weights.clear()
+            self._popularity.clear()
+            for component in components:
+                self._add(component)
+
+    def build_from_db(self, db: Session) -> None:
+        """Carga todos los componentes del catálogo en el índice."""
+        self.rebuild(db.query(Component).all())
+
+    def suggest(self, query: str, limit: int = MAX_SUGGESTIONS) -> List[Dict]:
+        """Devuelve las mejores sugerencias cuyo texto empieza por la consulta."""
+        prefix = normalize_text(query)
+        if not prefix:
+            return []
+        with self._lock:
+            node = self._root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            top = self._refresh(node)
+            return [dict(self._components[component_id]) for _, component_id in top[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+
+# Instancia global del índice de autocompletado
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,104 @@
+"""
+Serialización rápida del catálogo a JSON.
+
+Los listados de componentes no pasan por Pydantic ni por objetos ORM: las
+filas se leen con selects de Core, se codifican con orjson y cada componente
+se guarda como un fragmento JSON versionado. Un listado es la concatenación
+de los fragmentos de sus componentes, así que solo se consultan y codifican
+los que cambiaron desde la última petición.
+"""
+from typing import Dict, List, Optional
+import os
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models
+from .response_cache import ResponseCache, catalog_versions
+
+# Número máximo de fragmentos de componentes en memoria
+COMPONENT_FRAGMENT_CACHE_SIZE = int(os.getenv("COMPONENT_FRAGMENT_CACHE_SIZE", "100000"))
+
+# Columnas en el mismo orden que serializa schemas.Component
+COMPONENT_COLUMNS = (
+    "name", "type", "brand", "model", "price", "description", "image_url",
+    "performance_score", "power_consumption", "id",
+)
+SPECIFICATION_COLUMNS = ("name", "value", "id", "component_id")
+
+_components = models.Component.__table__
+_specifications = models.Specification.__table__
+
+def _component_ids_query(skip: int, limit: int, type: Optional[str] = None):
+    query = select(_components.c.id)
+    if type:
+        query = query.where(_components.c.type == type)
+    return query.order_by(_components.c.id).offset(skip).limit(limit)
+
+def encode_components(component_rows: List[Dict], specification_rows: List[Dict]) -> Dict[int, bytes]:
+    """Codifica cada componente con sus especificaciones como un fragmento JSON."""
+    specifications: Dict[int, List[Dict]] = {row["id"]: [] for row in component_rows}
+    for spec in specification_rows:
+        specifications[spec["component_id"]].append(spec)
+    return {
+        row["id"]: orjson.dumps({**row, "specifications": specifications[row["id"]]})
+        for row in component_rows
+    }
+
+def join_fragments(fragments: List[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+class ComponentJSONRenderer:
+    """Genera cuerpos JSON de componentes a partir de fragmentos cacheados."""
+
+    def __init__(self, max_fragments: int = COMPONENT_FRAGMENT_CACHE_SIZE):
+        self.fragments = ResponseCache(max_entries=max_fragments)
+
+    async def _load_fragments(self, db: AsyncSession, component_ids: List[int]) -> Dict[int, bytes]:
+        """Lee de la base de datos y codifica los componentes indicados."""
+        versions = {component_id: catalog_versions.component_version(component_id) for component_id in component_ids}
+        component_result = await db.execute(
+            select(*(_components.c[column] for column in COMPONENT_COLUMNS))
+            .where(_components.c.id.in_(component_ids))
+        )
+        spec_result = await db.execute(
+            select(*(_specifications.c[column] for column in SPECIFICATION_COLUMNS))
+            .where(_specifications.c.component_id.in_(component_ids))
+            .order_by(_specifications.c.id)
+        )
+        encoded = encode_components(
+            [dict(row) for row in component_result.mappings()],
+            [dict(row) for row in spec_result.mappings()]
+        )
+        for component_id, fragment in encoded.items():
+            self.fragments.put(str(component_id), str(versions[component_id]), fragment)
+        return encoded
+
+    async def get_fragments(self, db: AsyncSession, component_ids: List[int]) -> List[bytes]:
+        """Fragmentos de los componentes existentes, en el orden solicitado."""
+        found: Dict[int, bytes] = {}
+        missing = []
+        for component_id in component_ids:
+            fragment = self.fragments.get(str(component_id), str(catalog_versions.component_version(component_id)))
+            if fragment is None:
+                missing.append(component_id)
+            else:
+                found[component_id] = fragment
+        if missing:
+            found.update(await self._load_fragments(db, missing))
+        return [found[component_id] for component_id in component_ids if component_id in found]
+
+    async def render_component(self, db: AsyncSession, component_id: int) -> Optional[bytes]:
+        """JSON de un componente, o None si no existe."""
+        fragments = await self.get_fragments(db, [component_id])
+        return fragments[0] if fragments else None
+
+    async def render_components(self, db: AsyncSession, skip: int = 0, limit: int = 100,
+                                type: Optional[str] = None) -> bytes:
+        """JSON de una página de componentes, opcionalmente filtrada por tipo."""
+        result = await db.execute(_component_ids_query(skip, limit, type))
+        return join_fragments(await self.get_fragments(db, list(result.scalars().all())))
+
+# Instancia global
+component_renderer = ComponentJSONRenderer()
@@ -0,0 +1,264 @@
+"""
+Almacenes de sesiones del chatbot.
+
+Dos implementaciones de la interfaz abstracta SessionStore (get, save,
+delete, count, get_metrics):
+- MemorySessionStore: LRU acotada en número de sesiones y con caducidad por
+  inactividad, para un único proceso. Guarda y devuelve copias, igual que la
+  base de datos: dos peticiones concurrentes de la misma sesión no comparten
+  ni modifican el mismo objeto.
+- DatabaseSessionStore: tabla chat_sessions en la base de datos principal
+  (SQLite o PostgreSQL); las sesiones sobreviven a reinicios y se comparten
+  entre workers de uvicorn.
+Ambas recortan el historial a los últimos CHAT_MAX_MESSAGES mensajes al
+guardar. El backend se elige con CHAT_SESSION_BACKEND (memory o database).
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+
+from . import models
+from .database import SessionLocal
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+CHAT_SESSION_BACKEND = os.getenv("CHAT_SESSION_BACKEND", "memory")
+CHAT_SESSION_TTL_SECONDS = float(os.getenv("CHAT_SESSION_TTL_SECONDS", "86400"))
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "10000"))
+CHAT_MAX_MESSAGES = int(os.getenv("CHAT_MAX_MESSAGES", "50"))
+# Cada cuánto se borran de la tabla las sesiones caducadas
+CHAT_SESSION_PURGE_SECONDS = float(os.getenv("CHAT_SESSION_PURGE_SECONDS", "300"))
+
+# Modelos de datos para el chatbot
+class ChatMessage(BaseModel):
+    """Modelo para los mensajes del chat."""
+    role: str  # 'user' o 'assistant'
+    content: str
+    timestamp: Optional[str] = None
+
+class ChatSession(BaseModel):
+    """Modelo para una sesión de chat."""
+    session_id: str
+    messages: List[ChatMessage] = []
+    user_id: Optional[int] = None
+    context: Dict[str, Any] = {}
+
+class SessionStore(ABC):
+    """Interfaz común de los almacenes de sesiones."""
+
+    backend = "base"
+
+    def __init__(self, ttl_seconds: float = CHAT_SESSION_TTL_SECONDS, max_messages: int = CHAT_MAX_MESSAGES):
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_messages
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.trimmed_messages = 0
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        """Sesión guardada, o None si no existe o ha caducado."""
+
+    @abstractmethod
+    def save(self, session: ChatSession) -> None:
+        """Guarda la sesión (recortando su historial)."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Borra la sesión; devuelve si existía."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Número de sesiones guardadas."""
+
+    def _trim(self, session: ChatSession) -> None:
+        """Conserva solo los últimos `max_messages` mensajes de la sesión."""
+        excess = len(session.messages) - self.max_messages
+        if excess > 0:
+            del session.messages[:excess]
+            self.trimmed_messages += excess
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "sessions": self.count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "expired_evictions": self.expired,
+            "trimmed_messages": self.trimmed_messages,
+            "ttl_seconds": self.ttl_seconds,
+            "max_messages": self.max_messages,
+        }
+
+class MemorySessionStore(SessionStore):
+    """Sesiones en memoria con expulsión LRU y caducidad por inactividad."""
+
+    backend = "memory"
+
+    def __init__(self, max_sessions: int = CHAT_MAX_SESSIONS, ttl_seconds: float = CHAT_SESSION_TTL_SECONDS,
+                 max_messages: int = CHAT_MAX_MESSAGES):
+        super().__init__(ttl_seconds, max_messages)
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[ChatSession, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.lru_evictions = 0
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_seconds:
+                del self._sessions[session_id]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            self.hits += 1
+            session = entry[0]
+        # Copia propia para el llamante: sus cambios solo se ven al guardarla
+        return session.model_copy(deep=True)
+
+    def save(self, session: ChatSession) -> None:
+        self._trim(session)
+        session = session.model_copy(deep=True)
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session.session_id] = (session, now)
+            self._sessions.move_to_end(session.session_id)
+            # Las menos usadas están al principio; primero salen las caducadas
+            while self._sessions:
+                oldest_id, (_, updated_at) = next(iter(self._sessions.items()))
+                if now - updated_at > self.ttl_seconds:
+                    self.expired += 1
+                elif len(self._sessions) > self.max_sessions:
+                    self.lru_evictions += 1
+                else:
+                    break
+                del self._sessions[oldest_id]
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**super().get_metrics(), "max_sessions": self.max_sessions, "lru_evictions": self.lru_evictions}
+
+class DatabaseSessionStore(SessionStore):
+    """Sesiones persistidas en la tabla chat_sessions, compartidas entre procesos."""
+
+    backend = "database"
+
+    def __init__(self, session_factory: Callable[[], Session], ttl_seconds: float = CHAT_SESSION_TTL_SECONDS,
+                 max_messages: int = CHAT_MAX_MESSAGES, purge_seconds: float = CHAT_SESSION_PURGE_SECONDS):
+        super().__init__(ttl_seconds, max_messages)
+        self.session_factory = session_factory
+        self.purge_seconds = purge_seconds
+        self._last_purge = time.monotonic()
+
+    def _expiry_cutoff(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        db = self.session_factory()
+        try:
+            record = db.get(models.ChatSessionRecord, session_id)
+            if record is not None and record.updated_at < self._expiry_cutoff():
+                db.delete(record)
+                db.commit()
+                self.expired += 1
+                record = None
+            if record is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return ChatSession.model_validate_json(record.data)
+        finally:
+            db.close()
+
+    def save(self, session: ChatSession) -> None:
+        self._trim(session)
+        values = {"user_id": session.user_id, "data": session.model_dump_json(), "updated_at": datetime.utcnow()}
+        db = self.session_factory()
+        try:
+            # Otro worker puede crear la misma sesión a la vez: se reintenta como actualización
+            for _ in range(2):
+                record = db.get(models.ChatSessionRecord, session.session_id)
+                if record is None:
+                    db.add(models.ChatSessionRecord(session_id=session.session_id, **values))
+                else:
+                    for key, value in values.items():
+                        setattr(record, key, value)
+                try:
+                    db.commit()
+                    break
+                except IntegrityError:
+                    db.rollback()
+        except SQLAlchemyError as e:
+            logger.error(f"Error guardando la sesión de chat {session.session_id}: {e}")
+            db.rollback()
+        finally:
+            db.close()
+        if time.monotonic() - self._last_purge > self.purge_seconds:
+            self.purge_expired()
+
+    def delete(self, session_id: str) -> bool:
+        db = self.session_factory()
+        try:
+            deleted = db.execute(
+                delete(models.ChatSessionRecord).where(models.ChatSessionRecord.session_id == session_id)
+            ).rowcount
+            db.commit()
+            return deleted > 0
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """Borra las sesiones caducadas; devuelve cuántas se eliminaron."""
+        self._last_purge = time.monotonic()
+        db = self.session_factory()
+        try:
+            purged = db.execute(
+                delete(models.ChatSessionRecord).where(models.ChatSessionRecord.updated_at < self._expiry_cutoff())
+            ).rowcount
+            db.commit()
+        except SQLAlchemyError as e:
+            logger.error(f"Error purgando sesiones de chat caducadas: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+        self.expired += purged
+        return purged
+
+    def count(self) -> int:
+        db = self.session_factory()
+        try:
+            return db.execute(select(func.count()).select_from(models.ChatSessionRecord)).scalar() or 0
+        finally:
+            db.close()
+
+def create_session_store(backend: str = CHAT_SESSION_BACKEND) -> SessionStore:
+    """Crea el almacén configurado en CHAT_SESSION_BACKEND."""
+    if backend == "database":
+        return DatabaseSessionStore(SessionLocal)
+    if backend != "memory":
+        logger.warning(f"CHAT_SESSION_BACKEND desconocido ({backend}); se usa memory")
+    return MemorySessionStore()
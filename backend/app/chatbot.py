@@ -3,25 +3,16 @@ Módulo de chatbot para el sistema ComPuter.
 Proporciona funcionalidades de asistente virtual para ayudar a los usuarios
 en la selección de componentes y responder preguntas técnicas.
 """
-from typing import Dict, List, Optional, Any
-import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
 import json
 import os
-from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
-# Modelos de datos para el chatbot
-class ChatMessage(BaseModel):
-    """Modelo para los mensajes del chat."""
-    role: str  # 'user' o 'assistant'
-    content: str
-    timestamp: Optional[str] = None
-
-class ChatSession(BaseModel):
-    """Modelo para una sesión de chat."""
-    session_id: str
-    messages: List[ChatMessage] = []
-    user_id: Optional[int] = None
-    context: Dict[str, Any] = {}
+from .chat_sessions import ChatMessage, ChatSession, SessionStore, create_session_store
+from .dialogue_state import USAGE_INTENTS, DialogueState, get_dialogue_state, save_dialogue_state
+from .keyword_matcher import chat_matcher
+from .intent_service import IntentCache, IntentClassifier, create_intent_classifier
+from .nlp_training import preprocess_text
 
 # Base de conocimiento simple para el chatbot
 KNOWLEDGE_BASE = {
@@ -81,92 +72,119 @@ KNOWLEDGE_BASE = {
     }
 }
 
-# Patrones de preguntas comunes
-PATTERNS = [
-    (r"(?i)qu[eé] es (un |una |el |la )?(\w+)", "component_info"),
-    (r"(?i)recomienda (un |una |)(\w+)", "component_recommendation"),
-    (r"(?i)cu[aá]l es (la |el |)(mejor|buena|bueno) (\w+)", "best_component"),
-    (r"(?i)compatib(le|ilidad)", "compatibility"),
-    (r"(?i)presupuesto", "budget"),
-    (r"(?i)(gaming|juegos|videojuegos)", "gaming_usage"),
-    (r"(?i)(trabajo|profesional|workstation)", "work_usage"),
-    (r"(?i)(oficina|básico|básica)", "office_usage"),
-]
-
 class ComputerChatbot:
     """Clase principal del chatbot para ComPuter."""
     
-    def __init__(self):
-        """Inicializa el chatbot."""
-        self.sessions: Dict[str, ChatSession] = {}
-        self.ai_engine = None
-        self.nlp_trainer = None
-        self._load_nlp_model()
-        
-    def _load_nlp_model(self):
-        """Carga el modelo NLP entrenado."""
-        try:
-            from .nlp_training import NLPTrainer
-            self.nlp_trainer = NLPTrainer()
-            
-            # Verificar si existe el modelo entrenado
-            model_path = "backend/app/models/nlp_model.joblib"
-            if os.path.exists(model_path):
-                # El modelo se carga automáticamente en predict_intent
-                pass
-            else:
-                print("Modelo NLP no encontrado. Usando detección de intención básica.")
-        except ImportError:
-            print("NLPTrainer no disponible. Usando detección de intención básica.")
-            self.nlp_trainer = None
-        
-    def set_ai_engine(self, ai_engine):
-        """Establece el motor de IA para recomendaciones."""
-        self.ai_engine = ai_engine
+    def __init__(self, session_store: Optional[SessionStore] = None,
+                 engine_factory: Optional[Callable[[Session], Any]] = None,
+                 intent_classifier: Optional[IntentClassifier] = None,
+                 session_factory: Optional[Callable[[], Session]] = None):
+        """
+        Inicializa el chatbot. Las sesiones se guardan en `session_store`
+        (por defecto, el backend configurado en CHAT_SESSION_BACKEND).
+        `engine_factory` crea un motor de recomendaciones para una sesión de
+        base de datos; el chatbot es compartido y no guarda ningún motor.
+        Con `session_factory` (sesiones de lectura) el chatbot pide la
+        configuración al motor en cuanto conoce el presupuesto y el uso.
+        `intent_classifier` es el modelo NLP ya cargado; si no se indica, se
+        carga desde NLP_MODEL_PATH. La intención detectada para cada texto
+        preprocesado se guarda en `intent_cache` mientras no cambie el modelo.
+        """
+        self.session_store = session_store or create_session_store()
+        self.engine_factory = engine_factory
+        self.session_factory = session_factory
+        self.intent_classifier = intent_classifier or create_intent_classifier()
+        if not self.intent_classifier.available:
+            print("Modelo NLP no encontrado. Usando detección de intención básica.")
+        self.intent_cache = IntentCache()
     
     def get_or_create_session(self, session_id: str, user_id: Optional[int] = None) -> ChatSession:
-        """Obtiene una sesión existente o crea una nueva."""
-        if session_id not in self.sessions:
-            self.sessions[session_id] = ChatSession(session_id=session_id, user_id=user_id)
-        return self.sessions[session_id]
+        """
+        Obtiene una sesión existente o crea una nueva. Las sesiones nuevas no
+        se guardan hasta que reciben un mensaje.
+        """
+        session = self.session_store.get(session_id)
+        if session is None:
+            session = ChatSession(session_id=session_id, user_id=user_id)
+        return session
+    
+    def get_session(self, session_id: str) -> Optional[ChatSession]:
+        """Devuelve la sesión si existe y no ha caducado."""
+        return self.session_store.get(session_id)
+    
+    def delete_session(self, session_id: str) -> bool:
+        return self.session_store.delete(session_id)
     
     def add_message(self, session_id: str, message: ChatMessage) -> None:
         """Añade un mensaje a la sesión."""
         session = self.get_or_create_session(session_id)
         session.messages.append(message)
+        self.session_store.save(session)
     
     def process_message(self, session_id: str, message: str) -> str:
         """Procesa un mensaje del usuario y genera una respuesta."""
-        # Añadir mensaje del usuario
+        return "".join(self.stream_message(session_id, message))
+    
+    def stream_message(self, session_id: str, message: str) -> Iterator[str]:
+        """
+        Procesa un mensaje del usuario y devuelve la respuesta por fragmentos a
+        medida que se generan. La sesión se lee una vez y se guarda una vez con
+        los dos mensajes al terminar (también si el cliente se desconecta a
+        mitad, con la parte ya enviada).
+        
+        Solo se analiza el mensaje nuevo: los datos de los anteriores ya están
+        en el estado de la conversación, junto con la intención detectada
+        (clasificador NLP con caché o palabras clave). Si con él quedan
+        completos el presupuesto y el uso, la respuesta es directamente la
+        configuración del motor de recomendaciones.
+        """
+        session = self.get_or_create_session(session_id)
         user_message = ChatMessage(role="user", content=message)
-        self.add_message(session_id, user_message)
+        session.messages.append(user_message)
+        state = get_dialogue_state(session.context)
+        state.update(message)
+        state.apply_intent(self._detect_intent(message))
+        save_dialogue_state(session.context, state)
         
-        # Generar respuesta directamente desde el manejador de OpenAI
+        chunks: List[str] = []
         try:
-            # Usar el manejador de OpenAI con respuestas simuladas
+            if state.needs_recommendation:
+                recommendation = self._recommend_from_state(state)
+                if recommendation:
+                    state.recommended = state.signature()
+                    save_dialogue_state(session.context, state)
+                    chunks.append(recommendation)
+                    yield recommendation
+                    return
+            
+            # Usar el manejador de OpenAI (respuestas locales si no hay modelo configurado)
             from .openai_integration import openai_handler
             
-            # Preparar historial de chat para contexto
+            # Preparar historial de chat para contexto, con los datos ya conocidos del usuario
             chat_history = []
-            session = self.get_or_create_session(session_id)
+            summary = state.summary()
+            if summary:
+                chat_history.append({"role": "system", "content": summary})
             for msg in session.messages[-5:]:  # Usar los últimos 5 mensajes para contexto
                 chat_history.append({
                     "role": msg.role,
                     "content": msg.content
                 })
             
-            # Generar respuesta directamente
-            response = openai_handler.generate_response(message, chat_history)
+            for chunk in openai_handler.stream_response(message, chat_history):
+                chunks.append(chunk)
+                yield chunk
         except Exception as e:
             print(f"Error al generar respuesta: {str(e)}")
-            # Respuesta amigable en caso de error
-            response = "Hola, soy el asistente de ComPuter. ¿En qué puedo ayudarte con componentes de PC?"
-        
-        # Añadir respuesta del chatbot
-        bot_message = ChatMessage(role="assistant", content=response)
-        self.add_message(session_id, bot_message)
-        
-        return response
+            if not chunks:
+                # Respuesta amigable en caso de error
+                chunks.append("Hola, soy el asistente de ComPuter. ¿En qué puedo ayudarte con componentes de PC?")
+                yield chunks[0]
+        finally:
+            # Añadir respuesta del chatbot
+            bot_message = ChatMessage(role="assistant", content="".join(chunks))
+            session.messages.append(bot_message)
+            self.session_store.save(session)
     
     def _generate_response(self, session_id: str, message: str) -> str:
         """Genera una respuesta basada en el mensaje del usuario."""
@@ -214,9 +232,12 @@ class ComputerChatbot:
             elif intent == "budget":
                 return self._budget_info()
             
-            elif intent == "gaming_usage" or intent == "work_usage" or intent == "office_usage":
-                usage = "gaming" if intent == "gaming_usage" else "workstation" if intent == "work_usage" else "office"
-                session.context["usage_type"] = usage
+            elif intent in USAGE_INTENTS:
+                usage = USAGE_INTENTS[intent]
+                state = get_dialogue_state(session.context)
+                state.usage_type = usage
+                save_dialogue_state(session.context, state)
+                self.session_store.save(session)
                 return self._usage_type_info(usage)
             
             else:
@@ -224,49 +245,37 @@ class ComputerChatbot:
     
     def _detect_intent(self, message: str) -> str:
         """Detecta la intención del mensaje del usuario usando NLP o patrones básicos."""
+        text = preprocess_text(message)
+        self.intent_classifier.refresh()
+        version = self.intent_classifier.version
+        intent = self.intent_cache.get(text, version)
+        if intent is None:
+            intent = self._classify_intent(text)
+            self.intent_cache.put(text, version, intent)
+        return intent
+    
+    def _classify_intent(self, text: str) -> str:
         # Intentar usar el modelo NLP entrenado
-        if self.nlp_trainer:
+        if self.intent_classifier.available:
             try:
-                result = self.nlp_trainer.predict_intent(message)
+                result = self.intent_classifier.predict_intent(text)
                 # Solo usar la predicción si la confianza es alta
                 if result['confidence'] > 0.6:
                     return result['intent']
             except Exception as e:
                 print(f"Error en predicción NLP: {e}")
         
-        # Fallback a detección por patrones
-        for pattern, intent in PATTERNS:
-            if re.search(pattern, message):
-                return intent
-        return "unknown"
+        # Fallback a detección por palabras clave y patrones
+        return chat_matcher.match(text).first("intent", "unknown")
     
     def _extract_component(self, message: str) -> str:
         """Extrae el tipo de componente mencionado en el mensaje."""
-        # Mapeo de términos comunes a componentes en la base de conocimiento
-        component_mapping = {
-            "procesador": "cpu", "cpu": "cpu", "microprocesador": "cpu",
-            "tarjeta gráfica": "gpu", "gpu": "gpu", "gráfica": "gpu", "video": "gpu",
-            "memoria": "ram", "ram": "ram",
-            "disco": "storage", "almacenamiento": "storage", "ssd": "storage", "hdd": "storage",
-            "placa": "motherboard", "placa base": "motherboard", "motherboard": "motherboard", "tarjeta madre": "motherboard",
-            "fuente": "psu", "fuente de poder": "psu", "psu": "psu", "alimentación": "psu"
-        }
-        
-        message = message.lower()
-        for term, component in component_mapping.items():
-            if term in message:
-                return component
-        
-        # Buscar componentes directamente
-        for component in KNOWLEDGE_BASE.keys():
-            if component in message:
-                return component
-        
-        return "general"
+        # Términos comunes y nombres de la base de conocimiento (tabla "component")
+        return chat_matcher.match(message).first("component", "general")
     
     def _extract_usage_type(self, session: ChatSession) -> str:
-        """Extrae el tipo de uso del contexto de la sesión o asume un valor predeterminado."""
-        return session.context.get("usage_type", "general")
+        """Extrae el tipo de uso del estado de la conversación o asume un valor predeterminado."""
+        return get_dialogue_state(session.context).usage_type or session.context.get("usage_type", "general")
     
     def _get_component_info(self, component: str) -> str:
         """Obtiene información sobre un componente específico."""
@@ -316,35 +325,74 @@ class ComputerChatbot:
                 "- Gama entusiasta (2000€+): Máximo rendimiento para gaming 4K y cargas de trabajo intensivas\n\n"
                 "¿Cuál es tu presupuesto aproximado? Puedo ayudarte a distribuirlo entre componentes.")
                 
-    def generate_recommendation(self, budget: float, usage_type: str, preferences: Dict[str, bool] = None) -> str:
-        """Genera una recomendación utilizando el motor de IA."""
-        if not self.ai_engine:
+    def _select_recommendation(self, db: Session, budget: float, usage_type: str,
+                               preferences: Optional[Dict[str, bool]] = None,
+                               owned_types: Iterable[str] = ()) -> Dict[str, Any]:
+        """Componentes elegidos por el motor; los tipos de `owned_types` no se compran."""
+        ai_engine = self.engine_factory(db)
+        # Calcular distribución del presupuesto
+        budget_distribution = ai_engine._calculate_budget_distribution(budget, usage_type)
+        
+        # Ajustar según preferencias
+        if preferences:
+            budget_distribution = ai_engine._adjust_budget_for_preferences(budget_distribution, preferences)
+        
+        # El presupuesto de los componentes que el usuario ya tiene se reparte entre el resto
+        owned = set(owned_types)
+        remaining = {t: amount for t, amount in budget_distribution.items() if t not in owned}
+        if remaining and len(remaining) < len(budget_distribution):
+            scale = budget / sum(remaining.values())
+            budget_distribution = {t: amount * scale for t, amount in remaining.items()}
+        
+        # Seleccionar componentes
+        return ai_engine._select_components_by_budget(budget_distribution)
+    
+    def _format_recommendation(self, budget: float, usage_type: str, selected_components: Dict[str, Any]) -> str:
+        response = f"Basado en tu presupuesto de {budget}€ para un uso de tipo {usage_type}, te recomiendo:\n\n"
+        
+        for component_type, component in selected_components.items():
+            response += f"- {component_type.upper()}: {component.name} - {component.price}€\n"
+        
+        total_price = sum(component.price for component in selected_components.values())
+        response += f"\nPrecio total estimado: {total_price}€"
+        
+        return response
+    
+    def generate_recommendation(self, db: Session, budget: float, usage_type: str, preferences: Dict[str, bool] = None) -> str:
+        """Genera una recomendación con un motor de IA ligado a la sesión `db` de la petición."""
+        if not self.engine_factory:
             return "Lo siento, el motor de recomendaciones no está disponible en este momento."
             
         try:
-            # Calcular distribución del presupuesto
-            budget_distribution = self.ai_engine._calculate_budget_distribution(budget, usage_type)
-            
-            # Ajustar según preferencias
-            if preferences:
-                budget_distribution = self.ai_engine._adjust_budget_for_preferences(budget_distribution, preferences)
-            
-            # Seleccionar componentes
-            selected_components = self.ai_engine._select_components_by_budget(budget_distribution)
-            
-            # Formatear respuesta
-            response = f"Basado en tu presupuesto de {budget}€ para un uso de tipo {usage_type}, te recomiendo:\n\n"
-            
-            for component_type, component in selected_components.items():
-                response += f"- {component_type.upper()}: {component.name} - {component.price}€\n"
-            
-            total_price = sum(component.price for component in selected_components.values())
-            response += f"\nPrecio total estimado: {total_price}€"
-            
-            return response
+            selected_components = self._select_recommendation(db, budget, usage_type, preferences)
+            return self._format_recommendation(budget, usage_type, selected_components)
         except Exception as e:
             return f"Lo siento, ha ocurrido un error al generar la recomendación: {str(e)}"
     
+    def _recommend_from_state(self, state: DialogueState) -> Optional[str]:
+        """
+        Configuración para los slots de la conversación, o None si no hay motor,
+        falla o el catálogo no tiene componentes (responde el asistente).
+        """
+        if not (self.engine_factory and self.session_factory):
+            return None
+        db = self.session_factory()
+        try:
+            selected_components = self._select_recommendation(
+                db, state.budget, state.engine_usage_type, state.preferences(), owned_types=state.chosen_parts
+            )
+            if not selected_components:
+                return None
+            response = self._format_recommendation(state.budget, state.usage_type, selected_components)
+        except Exception as e:
+            print(f"Error al generar la recomendación: {e}")
+            return None
+        finally:
+            db.close()
+        if state.chosen_parts:
+            response += f"\n\nNo incluyo lo que ya tienes: {', '.join(state.chosen_parts.values())}."
+        return response
+    
     def _usage_type_info(self, usage_type: str) -> str:
         """Proporciona información sobre un tipo de uso específico."""
         if usage_type == "gaming":
@@ -371,6 +419,3 @@ class ComputerChatbot:
                     "4. Placa base confiable (15-20% del presupuesto)\n"
                     "5. Fuente de calidad (10-15% del presupuesto)\n\n"
                     "¿Tienes algún presupuesto en mente o algún componente específico sobre el que quieras saber más?")
-
-# Instancia global del chatbot
-chatbot = ComputerChatbot()
\ No newline at end of file
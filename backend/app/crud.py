@@ -1,15 +1,88 @@
+from sqlalchemy import bindparam, delete, func, insert, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+from types import SimpleNamespace
 import random
 import logging
 
 from . import models, schemas
 from .ai_engine import get_ai_engine
+from .autocomplete import autocomplete_index
+from .facets import facet_index
+from .stats import stats_service
+from .popularity import popularity_tracker
+from .retrieval import retrieval_index
+from .response_cache import catalog_versions
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+def _sync_component_indexes(component: models.Component) -> None:
+    """Propaga la creación o actualización de un componente a los índices en memoria."""
+    autocomplete_index.add_component(component)
+    facet_index.add_component(component)
+    retrieval_index.add_component(component)
+    stats_service.mark_stale()
+    catalog_versions.bump(component.id)
+
+def _remove_component_from_indexes(component_id: int) -> None:
+    """Elimina un componente de los índices en memoria."""
+    autocomplete_index.remove_component(component_id)
+    facet_index.remove_component(component_id)
+    retrieval_index.remove_component(component_id)
+    stats_service.mark_stale()
+    popularity_tracker.forget(component_id)
+    catalog_versions.bump(component_id)
+
+def allocate_versions(db: Session, count: int = 1) -> int:
+    """
+    Reserva `count` versiones consecutivas del catálogo en la transacción
+    actual y devuelve la primera. El UPDATE del contador bloquea su fila hasta
+    el commit, así que otra escritura concurrente espera y recibe versiones
+    mayores solo después de que esta se confirme: una versión visible implica
+    que todas las menores ya están confirmadas.
+    """
+    counter = models.CatalogVersionCounter.__table__
+    updated = db.execute(
+        update(counter).where(counter.c.id == 1).values(value=counter.c.value + count)
+    ).rowcount
+    if not updated:
+        # Bases de datos sin la fila del contador (no creadas con create_all)
+        latest = db.execute(select(func.max(models.ComponentChange.version))).scalar() or 0
+        db.execute(insert(counter).values(id=1, value=latest + count))
+    return db.execute(select(counter.c.value).where(counter.c.id == 1)).scalar_one() - count + 1
+
+def record_component_change(db: Session, component_id: int, deleted: bool = False) -> int:
+    """
+    Asigna al componente la siguiente versión del catálogo dentro de la
+    transacción actual; la exportación incremental lee las versiones mayores.
+    """
+    version = allocate_versions(db)
+    change = db.get(models.ComponentChange, component_id)
+    if change is None:
+        change = models.ComponentChange(component_id=component_id)
+        db.add(change)
+    change.version = version
+    change.deleted = deleted
+    return version
+
+def record_component_changes(db: Session, component_ids: Sequence[int], deleted: bool = False) -> None:
+    """Versión por lotes de record_component_change: versiones consecutivas con executemany."""
+    if not component_ids:
+        return
+    first_version = allocate_versions(db, len(component_ids))
+    for chunk in _chunks(component_ids):
+        db.execute(delete(models.ComponentChange.__table__).where(models.ComponentChange.component_id.in_(chunk)))
+    db.execute(insert(models.ComponentChange.__table__), [
+        {"component_id": component_id, "version": first_version + i, "deleted": deleted}
+        for i, component_id in enumerate(component_ids)
+    ])
+
+def record_price(db: Session, component_id: int, price: float) -> None:
+    """Añade una entrada al historial de precios del componente."""
+    db.add(models.PriceHistory(component_id=component_id, price=price))
+
 # Funciones mejoradas para componentes
 def get_component(db: Session, component_id: int) -> Optional[models.Component]:
     """Obtiene un componente por ID con manejo de errores."""
@@ -35,6 +108,18 @@ def get_components_by_type(db: Session, type: str, skip: int = 0, limit: int = 1
         logger.error(f"Error al obtener componentes por tipo {type}: {e}")
         return []
 
+def get_components_by_ids(db: Session, component_ids: List[int]) -> List[models.Component]:
+    """Obtiene componentes por ID conservando el orden solicitado."""
+    if not component_ids:
+        return []
+    try:
+        components = db.query(models.Component).filter(models.Component.id.in_(component_ids)).all()
+    except SQLAlchemyError as e:
+        logger.error(f"Error al obtener componentes por ID: {e}")
+        return []
+    by_id = {component.id: component for component in components}
+    return [by_id[component_id] for component_id in component_ids if component_id in by_id]
+
 def search_components(db: Session, query: str, component_type: Optional[str] = None, 
                      min_price: Optional[float] = None, max_price: Optional[float] = None,
                      skip: int = 0, limit: int = 100) -> List[models.Component]:
@@ -93,8 +178,11 @@ def create_component(db: Session, component: schemas.ComponentCreate) -> Optiona
                 )
                 db.add(db_spec)
         
+        record_component_change(db, db_component.id)
+        record_price(db, db_component.id, db_component.price)
         db.commit()
         db.refresh(db_component)
+        _sync_component_indexes(db_component)
         logger.info(f"Componente creado exitosamente: {db_component.id}")
         return db_component
     except SQLAlchemyError as e:
@@ -107,6 +195,9 @@ def update_component(db: Session, component_id: int, component: schemas.Componen
     if not db_component:
         return None
         
+    if db_component.price != component.price:
+        record_price(db, component_id, component.price)
+
     # Actualizar campos del componente
     db_component.name = component.name
     db_component.type = component.type
@@ -130,8 +221,10 @@ def update_component(db: Session, component_id: int, component: schemas.Componen
         )
         db.add(db_spec)
     
+    record_component_change(db, component_id)
     db.commit()
     db.refresh(db_component)
+    _sync_component_indexes(db_component)
     return db_component
 
 def delete_component(db: Session, component_id: int):
@@ -139,14 +232,223 @@ def delete_component(db: Session, component_id: int):
     if not db_component:
         return False
         
-    # Eliminar especificaciones
+    # Eliminar especificaciones y contadores de popularidad
     db.query(models.Specification).filter(models.Specification.component_id == component_id).delete()
+    db.query(models.ComponentPopularity).filter(models.ComponentPopularity.component_id == component_id).delete()
     
     # Eliminar componente
     db.delete(db_component)
+    record_component_change(db, component_id, deleted=True)
     db.commit()
+    _remove_component_from_indexes(component_id)
     return True
 
+# Operaciones masivas: una transacción y executemany por tabla con Core
+_components = models.Component.__table__
+BULK_IN_CHUNK_SIZE = 5000  # por debajo del límite de variables de SQLite
+# Campos de ComponentBase; se leen por atributo para aceptar también los
+# registros ligeros de app.seeding en las cargas de millones de filas
+COMPONENT_FIELDS = tuple(schemas.ComponentBase.model_fields)
+
+def _chunks(items: Sequence, size: int = BULK_IN_CHUNK_SIZE) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _component_values(component: schemas.ComponentCreate) -> Dict[str, Any]:
+    return {field: getattr(component, field) for field in COMPONENT_FIELDS}
+
+def _insert_specifications(db: Session, items: Sequence[Tuple[int, schemas.ComponentCreate]]) -> None:
+    spec_rows = [
+        {"component_id": component_id, "name": spec.name, "value": spec.value}
+        for component_id, component in items for spec in component.specifications
+    ]
+    if spec_rows:
+        db.execute(insert(models.Specification.__table__), spec_rows)
+
+def _sync_bulk_indexes(items: Sequence[Tuple[int, schemas.ComponentCreate]]) -> None:
+    """Propaga a los índices en memoria los componentes escritos en una operación masiva."""
+    components = [
+        SimpleNamespace(id=component_id, specifications=component.specifications, **_component_values(component))
+        for component_id, component in items
+    ]
+    autocomplete_index.add_components(components)
+    retrieval_index.add_components(components)
+    for component in components:
+        facet_index.add_component(component)
+        catalog_versions.bump(component.id)
+    stats_service.mark_stale()
+
+def _create_rows(db: Session, components: Sequence[schemas.ComponentCreate]
+                 ) -> List[Tuple[int, schemas.ComponentCreate]]:
+    """Inserta componentes, especificaciones, versiones e historial de precios sin confirmar."""
+    # En SQLite el orden garantizado obliga a insertar fila a fila; allí cada
+    # lote es un único INSERT multi-fila cuyos rowids crecen en el orden de
+    # los parámetros, así que basta con ordenar los IDs devueltos
+    ordered = db.get_bind().dialect.name != "sqlite"
+    ids = db.execute(
+        insert(_components).returning(_components.c.id, sort_by_parameter_order=ordered),
+        [_component_values(component) for component in components]
+    ).scalars().all()
+    if not ordered:
+        ids = sorted(ids)
+    items = list(zip(ids, components))
+    _insert_specifications(db, items)
+    record_component_changes(db, ids)
+    db.execute(insert(models.PriceHistory.__table__), [
+        {"component_id": component_id, "price": component.price} for component_id, component in items
+    ])
+    return items
+
+def bulk_create_components(db: Session, components: Sequence[schemas.ComponentCreate],
+                           sync_indexes: bool = True) -> Optional[List[int]]:
+    """
+    Crea los componentes y sus especificaciones en una sola transacción.
+    Devuelve los IDs en el orden recibido, o None si la transacción falla.
+    Con sync_indexes=False no se tocan los índices en memoria (cargas desde
+    scripts, fuera del proceso de la API).
+    """
+    if not components:
+        return []
+    try:
+        items = _create_rows(db, components)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Error en la creación masiva de componentes: {e}")
+        db.rollback()
+        return None
+    if sync_indexes:
+        _sync_bulk_indexes(items)
+    logger.info(f"Creación masiva: {len(items)} componentes")
+    return [component_id for component_id, _ in items]
+
+def _spec_pairs(specifications: Iterable[Any]) -> List[Tuple[str, str]]:
+    return sorted((str(spec.name), str(spec.value)) for spec in specifications)
+
+def _load_current_state(db: Session, ids: Sequence[int]) -> Dict[int, Tuple[Dict[str, Any], List[Tuple[str, str]]]]:
+    """Campos y especificaciones guardados de los componentes, por ID (solo los existentes)."""
+    columns = [_components.c[field] for field in COMPONENT_FIELDS]
+    current: Dict[int, Tuple[Dict[str, Any], List[Tuple[str, str]]]] = {}
+    for chunk in _chunks(ids):
+        for row in db.execute(select(_components.c.id, *columns).where(_components.c.id.in_(chunk))):
+            current[row.id] = ({field: row._mapping[field] for field in COMPONENT_FIELDS}, [])
+        specs = db.execute(
+            select(models.Specification.component_id, models.Specification.name, models.Specification.value)
+            .where(models.Specification.component_id.in_(chunk))
+        )
+        for component_id, name, value in specs:
+            current[component_id][1].append((str(name), str(value)))
+    for _, spec_pairs in current.values():
+        spec_pairs.sort()
+    return current
+
+def _changed_items(updates: Sequence[Tuple[int, schemas.ComponentCreate]],
+                   current: Dict[int, Tuple[Dict[str, Any], List[Tuple[str, str]]]]
+                   ) -> List[Tuple[int, schemas.ComponentCreate]]:
+    return [
+        (component_id, component) for component_id, component in updates
+        if component_id in current
+        and current[component_id] != (_component_values(component), _spec_pairs(component.specifications))
+    ]
+
+def _update_rows(db: Session, items: Sequence[Tuple[int, schemas.ComponentCreate]],
+                 current: Dict[int, Tuple[Dict[str, Any], List[Tuple[str, str]]]]) -> None:
+    """Reescribe campos y especificaciones de `items` y les da versión nueva, sin confirmar."""
+    ids = [component_id for component_id, _ in items]
+    db.execute(
+        update(_components).where(_components.c.id == bindparam("component_id")),
+        [{"component_id": component_id, **_component_values(component)} for component_id, component in items]
+    )
+    for chunk in _chunks(ids):
+        db.execute(delete(models.Specification).where(models.Specification.component_id.in_(chunk)))
+    _insert_specifications(db, items)
+    record_component_changes(db, ids)
+    price_rows = [
+        {"component_id": component_id, "price": component.price}
+        for component_id, component in items if current[component_id][0]["price"] != component.price
+    ]
+    if price_rows:
+        db.execute(insert(models.PriceHistory.__table__), price_rows)
+
+def bulk_update_components(db: Session, updates: Sequence[Tuple[int, schemas.ComponentCreate]],
+                           sync_indexes: bool = True) -> Optional[List[int]]:
+    """
+    Actualiza componentes existentes (campos y especificaciones) en una sola
+    transacción. Devuelve los IDs existentes; los que no existen se omiten.
+    Los componentes cuyos campos y especificaciones no cambian no se
+    reescriben ni reciben una versión nueva del catálogo, así que repetir la
+    misma actualización no aparece en la exportación incremental.
+    """
+    if not updates:
+        return []
+    try:
+        current = _load_current_state(db, [component_id for component_id, _ in updates])
+        existing = [component_id for component_id, _ in updates if component_id in current]
+        items = _changed_items(updates, current)
+        if not items:
+            return existing
+        _update_rows(db, items, current)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Error en la actualización masiva de componentes: {e}")
+        db.rollback()
+        return None
+    # Las filas cargadas antes de la actualización pueden estar en la sesión
+    db.expire_all()
+    if sync_indexes:
+        _sync_bulk_indexes(items)
+    logger.info(f"Actualización masiva: {len(items)} componentes modificados de {len(existing)}")
+    return existing
+
+def bulk_upsert_components(db: Session, creates: Sequence[schemas.ComponentCreate],
+                           updates: Sequence[Tuple[int, schemas.ComponentCreate]],
+                           sync_indexes: bool = True) -> Optional[Tuple[List[int], List[int]]]:
+    """
+    Crea `creates` y actualiza los `updates` que cambian algo en una sola
+    transacción, leyendo una vez el estado guardado de los actualizados.
+    Devuelve los IDs creados y los modificados (los idénticos a lo guardado
+    no se reescriben), o None si la transacción falla y no se aplica nada.
+    """
+    try:
+        current = _load_current_state(db, [component_id for component_id, _ in updates]) if updates else {}
+        changed = _changed_items(updates, current)
+        created = _create_rows(db, creates) if creates else []
+        if changed:
+            _update_rows(db, changed, current)
+        if created or changed:
+            db.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Error en la escritura masiva de componentes: {e}")
+        db.rollback()
+        return None
+    if changed:
+        db.expire_all()
+    if sync_indexes and (created or changed):
+        _sync_bulk_indexes(created + changed)
+    return [component_id for component_id, _ in created], [component_id for component_id, _ in changed]
+
+def bulk_delete_components(db: Session, component_ids: Sequence[int]) -> Optional[List[int]]:
+    """Elimina componentes en una sola transacción; devuelve los IDs que existían."""
+    if not component_ids:
+        return []
+    try:
+        ids: List[int] = []
+        for chunk in _chunks(component_ids):
+            ids.extend(db.execute(select(models.Component.id).where(models.Component.id.in_(chunk))).scalars())
+        for chunk in _chunks(ids):
+            db.execute(delete(models.Specification).where(models.Specification.component_id.in_(chunk)))
+            db.execute(delete(models.ComponentPopularity).where(models.ComponentPopularity.component_id.in_(chunk)))
+            db.execute(delete(models.Component).where(models.Component.id.in_(chunk)))
+        record_component_changes(db, ids, deleted=True)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Error en el borrado masivo de componentes: {e}")
+        db.rollback()
+        return None
+    for component_id in ids:
+        _remove_component_from_indexes(component_id)
+    logger.info(f"Borrado masivo: {len(ids)} componentes")
+    return ids
+
 def check_compatibility(db: Session, component_ids: List[int]) -> Dict:
     """
     Verifica la compatibilidad entre componentes utilizando el motor de IA.
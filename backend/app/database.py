@@ -1,7 +1,13 @@
-from sqlalchemy import create_engine
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, Dict, Optional
 import os
+import time
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -9,23 +15,211 @@ load_dotenv()
 
 # URL de conexión a la base de datos (usando SQLite para desarrollo)
 SQLALCHEMY_DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
+    "DATABASE_URL",
     "sqlite:///./computer.db"
 )
 
+# URL de la réplica de solo lectura (opcional). Sin réplica, las lecturas
+# usan la misma base de datos con un pool propio
+SQLALCHEMY_READ_DATABASE_URL = os.getenv("DATABASE_READ_URL") or None
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+# Configuración del pool de conexiones (PostgreSQL y SQLite en fichero)
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 20)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 30)
+DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 1800)
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+# PRAGMAs de SQLite aplicados a cada conexión nueva
+SQLITE_BUSY_TIMEOUT_MS = _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": _env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+    "cache_size": _env_int("SQLITE_CACHE_SIZE", -64000),  # negativo = KiB (64 MB)
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    "temp_store": "MEMORY",
+}
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and (":memory:" in url or url.rstrip("/").endswith(":"))
+
+def get_engine_options(url: str) -> Dict[str, Any]:
+    """Opciones de create_engine según el dialecto de la URL."""
+    if _is_sqlite_memory(url):
+        # Las bases en memoria usan un pool propio de SQLAlchemy sin dimensionado
+        return {"connect_args": {"check_same_thread": False}} if "aiosqlite" not in url else {}
+
+    options: Dict[str, Any] = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if _is_sqlite(url):
+        connect_args: Dict[str, Any] = {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if "aiosqlite" in url:
+            # aiosqlite usa NullPool por defecto; un pool real evita reabrir el
+            # fichero (y reaplicar los PRAGMAs) en cada petición
+            options["poolclass"] = AsyncAdaptedQueuePool
+        else:
+            # Las sesiones se crean en el threadpool y se cierran en otro hilo
+            connect_args["check_same_thread"] = False
+        options["connect_args"] = connect_args
+    return options
+
+def configure_sqlite_pragmas(sync_engine: Engine, read_only: bool = False) -> None:
+    """
+    Aplica los PRAGMAs de rendimiento en cada conexión SQLite nueva. Las
+    conexiones de lectura se marcan con query_only: en modo WAL leen sin
+    bloquear ni ser bloqueadas por el escritor.
+    """
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+def _get_read_url(url: str) -> Optional[str]:
+    """
+    URL del motor de lectura: la réplica configurada o, para SQLite en
+    fichero, la misma base abierta con otro pool. None si las lecturas deben
+    compartir el motor principal (PostgreSQL sin réplica o SQLite en memoria).
+    """
+    if SQLALCHEMY_READ_DATABASE_URL:
+        return SQLALCHEMY_READ_DATABASE_URL
+    if _is_sqlite(url) and not _is_sqlite_memory(url):
+        return url
+    return None
+
 # Crear el motor de SQLAlchemy
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
 
 # Crear una sesión local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor y sesiones de lectura
+_READ_URL = _get_read_url(SQLALCHEMY_DATABASE_URL)
+read_engine = create_engine(_READ_URL, **get_engine_options(_READ_URL)) if _READ_URL else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Drivers asíncronos equivalentes a cada driver síncrono
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Convierte una URL de base de datos síncrona en su equivalente asíncrona."""
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+# Crear el motor asíncrono y su fábrica de sesiones
+ASYNC_DATABASE_URL = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+if _READ_URL:
+    ASYNC_READ_DATABASE_URL = get_async_database_url(_READ_URL)
+    async_read_engine = create_async_engine(ASYNC_READ_DATABASE_URL, **get_engine_options(ASYNC_READ_DATABASE_URL))
+else:
+    async_read_engine = async_engine
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, expire_on_commit=False, autoflush=False)
+
+if _is_sqlite(SQLALCHEMY_DATABASE_URL):
+    configure_sqlite_pragmas(engine)
+    configure_sqlite_pragmas(async_engine.sync_engine)
+if _READ_URL and _is_sqlite(_READ_URL):
+    configure_sqlite_pragmas(read_engine, read_only=True)
+    configure_sqlite_pragmas(async_read_engine.sync_engine, read_only=True)
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Estado actual de los pools de conexiones de los motores de escritura y lectura."""
+    engines = [("sync", engine), ("async", async_engine.sync_engine)]
+    if _READ_URL:
+        engines += [("sync_read", read_engine), ("async_read", async_read_engine.sync_engine)]
+    metrics = {}
+    for name, db_engine in engines:
+        pool = db_engine.pool
+        pool_metrics: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        for metric in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, metric):
+                pool_metrics[metric] = getattr(pool, metric)()
+        metrics[name] = pool_metrics
+    return metrics
+
 # Crear la base para los modelos declarativos
 Base = declarative_base()
 
-# Función para obtener una sesión de base de datos
-def get_db():
+# Lectura de las propias escrituras: tras una escritura, las lecturas del
+# mismo cliente se sirven desde el principal durante este intervalo para no
+# ver datos anteriores por el retraso de la réplica
+READ_YOUR_WRITES_SECONDS = _env_int("READ_YOUR_WRITES_SECONDS", 5)
+PRIMARY_STICKY_COOKIE = "computer_primary_until"
+
+def mark_primary_sticky(response: Response) -> None:
+    """Fija las lecturas del cliente al principal tras una escritura."""
+    until = time.time() + READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        PRIMARY_STICKY_COOKIE, f"{until:.3f}",
+        max_age=READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+    )
+
+def should_read_from_primary(request: Request) -> bool:
+    """Indica si la petición debe leer del principal por una escritura reciente."""
+    if read_engine is engine:
+        return False
+    try:
+        return float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+# Función para obtener una sesión de base de datos (escritura, motor principal)
+def get_write_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Compatibilidad: las dependencias existentes siguen usando el principal
+get_db = get_write_db
+
+# Función para obtener una sesión de solo lectura (réplica salvo escritura reciente)
+def get_read_db(request: Request):
+    db = SessionLocal() if should_read_from_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Función para obtener una sesión asíncrona de base de datos
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Fábrica de sesiones asíncronas de solo lectura para la petición; las respuestas
+# en streaming abren la sesión solo mientras consultan, no durante toda la respuesta
+def get_async_read_session_factory(request: Request) -> async_sessionmaker:
+    return AsyncSessionLocal if should_read_from_primary(request) else AsyncReadSessionLocal
+
+# Función para obtener una sesión asíncrona de solo lectura
+async def get_async_read_db(request: Request):
+    async with get_async_read_session_factory(request)() as db:
+        yield db
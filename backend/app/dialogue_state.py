@@ -0,0 +1,174 @@
+"""
+Estado incremental de la conversación del chatbot.
+
+Cada mensaje del usuario se analiza una sola vez al llegar y los datos que
+aporta (presupuesto, tipo de uso, resolución, marca preferida y componentes
+que ya tiene) se acumulan en `session.context["dialogue_state"]`, que se
+guarda con la sesión. Así el chatbot no vuelve a leer el historial para
+recordar lo que el usuario ya dijo: en cuanto hay presupuesto y tipo de uso
+puede pedir la configuración directamente al motor de recomendaciones, sin
+volver a preguntar el presupuesto.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from pydantic import BaseModel
+
+from .keyword_matcher import chat_matcher
+
+CONTEXT_KEY = "dialogue_state"
+
+# Presupuesto mínimo que se acepta sin mencionar la palabra "presupuesto";
+# cantidades menores suelen ser el precio de una pieza ("una RAM de 80€")
+MIN_IMPLICIT_BUDGET = 300.0
+
+# Cantidad: 1200, 1.200, 1,200.50, 1.5 (con k/mil), con multiplicador opcional
+_AMOUNT = r"(?P<int>\d{1,3}(?:[.,]\d{3})+|\d+)(?:[.,](?P<dec>\d{1,2}))?\s*(?P<mult>k|mil\b)?"
+_CURRENCY = r"(?:€|\$|eur(?:os)?\b|usd\b|d[oó]lares\b)"
+BUDGET_PATTERNS = [
+    # "1200€", "1.5k euros", "2 mil dólares"
+    (re.compile(_AMOUNT + r"\s*" + _CURRENCY), False),
+    # "€1200", "$ 900"
+    (re.compile(r"[€$]\s*" + _AMOUNT), False),
+    # "presupuesto de unos 900", "quiero gastar 1000", "hasta 800" (no "1440p", "16gb"...)
+    (re.compile(r"(?:presupuesto|gastar|hasta|m[aá]ximo)\D{0,20}?\b" + _AMOUNT +
+                r"(?!\s*(?:p|gb|tb|hz|mhz|ghz|w|fps)\b)(?!\w|[.,]\d)"), True),
+]
+# Intenciones del clasificador que indican el tipo de uso (mismas etiquetas que el slot)
+USAGE_INTENTS = {"gaming_usage": "gaming", "work_usage": "workstation", "office_usage": "office"}
+# Tipo de uso del motor de recomendaciones (AIRecommendationEngine.usage_weights)
+# para cada valor del slot; "workstation" agrupa edición, renderizado y diseño
+ENGINE_USAGE_TYPES = {"gaming": "gaming", "workstation": "design", "office": "office"}
+# Cantidad que sigue a un componente en la misma frase, a lo sumo tres palabras
+# después ("una gpu de 500€", "rtx 4070 por 600€"): es el precio de esa pieza.
+# La palabra del componente no puede continuar con letras ("video" no es
+# "videojuegos"), pero sí con cifras ("core i7").
+_COMPONENT_WORD = r"\b(?:" + "|".join(
+    re.escape(word) for word in sorted(
+        {word for _, words, _ in chat_matcher.entries("component") for word in words}, key=len, reverse=True
+    )
+) + r")(?![a-záéíóúñ])"
+PART_PRICE_PREFIX = re.compile(_COMPONENT_WORD + r"[^\s,;.!?]*(?:\s+[^\s,;.!?]+){0,3}\s*$")
+# "ya tengo una RTX 3060", "ya compré la placa base", "cuento con 16GB de RAM"
+CHOSEN_PART_PATTERN = re.compile(r"\b(?:ya tengo|ya compr[eé]|cuento con)\b([^.;!?]*)")
+_LEADING_ARTICLE = re.compile(r"^(?:un|una|el|la|los|las|mi)\s+")
+
+def _amount_value(match: "re.Match[str]") -> float:
+    integer = re.sub(r"[.,]", "", match.group("int"))
+    value = float(f"{integer}.{match.group('dec') or 0}")
+    if match.group("mult"):
+        value *= 1000
+    return value
+
+def parse_budget(text: str) -> Tuple[Optional[float], str]:
+    """
+    Busca un presupuesto en el texto (ya en minúsculas). Devuelve la cantidad
+    y el texto sin ella, para que "4k€" no se lea además como resolución.
+    Sin la palabra "presupuesto" (o "gastar", "hasta"...) no se toman las
+    cantidades pequeñas ni las que acompañan a un componente, que son el
+    precio de esa pieza ("una gpu de 500€").
+    """
+    for pattern, explicit in BUDGET_PATTERNS:
+        for match in pattern.finditer(text):
+            value = _amount_value(match)
+            if explicit or (value >= MIN_IMPLICIT_BUDGET and not PART_PRICE_PREFIX.search(text, 0, match.start())):
+                return value, text[:match.start()] + " " + text[match.end():]
+    return None, text
+
+def parse_chosen_parts(text: str) -> Dict[str, str]:
+    """Componentes que el usuario dice tener ya: {tipo: descripción}."""
+    parts: Dict[str, str] = {}
+    for match in CHOSEN_PART_PATTERN.finditer(text):
+        for clause in re.split(r",|\s+y\s+", match.group(1)):
+            clause = _LEADING_ARTICLE.sub("", clause.strip())
+            component = chat_matcher.match(clause).first("component")
+            if component and clause:
+                parts[component] = clause
+    return parts
+
+class DialogueState(BaseModel):
+    """Slots acumulados de la conversación."""
+    budget: Optional[float] = None
+    usage_type: Optional[str] = None
+    resolution: Optional[str] = None
+    brand: Optional[str] = None
+    chosen_parts: Dict[str, str] = {}
+    # Intención del último mensaje (modelo NLP o palabras clave)
+    intent: Optional[str] = None
+    # Huella de los slots con los que ya se hizo una recomendación
+    recommended: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        """Hay datos suficientes para pedir una configuración al motor."""
+        return self.budget is not None and self.usage_type is not None
+
+    @property
+    def engine_usage_type(self) -> Optional[str]:
+        """Tipo de uso con el que se piden las recomendaciones al motor."""
+        return ENGINE_USAGE_TYPES.get(self.usage_type, self.usage_type)
+
+    def signature(self) -> str:
+        """
+        Huella de los slots que cambian la configuración del motor. La marca
+        no la cambia (solo se pasa al modelo de lenguaje), así que no cuenta.
+        """
+        parts = ",".join(sorted(self.chosen_parts))
+        return f"{self.budget}|{self.usage_type}|{self.resolution}|{parts}"
+
+    @property
+    def needs_recommendation(self) -> bool:
+        """Slots completos y distintos de los de la última recomendación."""
+        return self.ready and self.recommended != self.signature()
+
+    def preferences(self) -> Dict[str, bool]:
+        """Preferencias para AIRecommendationEngine._adjust_budget_for_preferences."""
+        return {"prefer_performance": self.resolution in ("4k", "1440p")}
+
+    def summary(self) -> str:
+        """Resumen de los slots conocidos, para dar contexto al modelo de lenguaje."""
+        known: List[str] = []
+        if self.budget is not None:
+            known.append(f"presupuesto {self.budget:g}€")
+        if self.usage_type:
+            known.append(f"uso {self.usage_type}")
+        if self.resolution:
+            known.append(f"resolución {self.resolution}")
+        if self.brand:
+            known.append(f"marca preferida {self.brand}")
+        if self.chosen_parts:
+            known.append("ya tiene " + ", ".join(self.chosen_parts.values()))
+        return "Datos del usuario: " + "; ".join(known) + "." if known else ""
+
+    def update(self, message: str) -> bool:
+        """Incorpora los slots que aporta un mensaje; devuelve si cambió alguno."""
+        text = message.lower()
+        before = (self.signature(), self.brand)
+        budget, rest = parse_budget(text)
+        matches = chat_matcher.match(rest)
+        if budget is not None:
+            self.budget = budget
+        self.usage_type = matches.first("usage", self.usage_type)
+        self.resolution = matches.first("resolution", self.resolution)
+        # La marca de una pieza que ya tiene ("ya tengo una rtx 3060") no es una preferencia
+        self.brand = chat_matcher.match(CHOSEN_PART_PATTERN.sub(" ", rest)).first("brand", self.brand)
+        chosen = parse_chosen_parts(text)
+        if chosen:
+            self.chosen_parts = {**self.chosen_parts, **chosen}
+        return (self.signature(), self.brand) != before
+
+    def apply_intent(self, intent: str) -> None:
+        """
+        Guarda la intención del mensaje; una intención de uso completa el
+        slot si las palabras clave del mensaje no lo dieron.
+        """
+        self.intent = intent
+        if self.usage_type is None and intent in USAGE_INTENTS:
+            self.usage_type = USAGE_INTENTS[intent]
+
+def get_dialogue_state(context: Dict[str, Any]) -> DialogueState:
+    """Estado guardado en el contexto de la sesión (vacío si no hay ninguno)."""
+    return DialogueState(**context.get(CONTEXT_KEY, {}))
+
+def save_dialogue_state(context: Dict[str, Any], state: DialogueState) -> None:
+    context[CONTEXT_KEY] = state.model_dump()
@@ -0,0 +1,190 @@
+"""
+Exportación del catálogo completo en streaming (NDJSON o CSV).
+
+Los componentes y sus especificaciones se leen en una sola consulta ordenada
+por componente con un cursor del lado del servidor (yield_per), y cada
+componente se codifica en cuanto llegan todas sus filas, de modo que la
+memoria usada no depende del tamaño del catálogo. La exportación incremental
+devuelve solo los componentes con versión mayor que la indicada, más las
+marcas de borrado.
+
+La versión de la cabecera X-Catalog-Version y las filas se leen con la misma
+sesión, y solo se exportan versiones hasta esa marca: como las versiones se
+asignan en orden de commit (crud.allocate_versions), todas las menores ya
+están confirmadas, y lo escrito durante la exportación sale en la siguiente.
+"""
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+import csv
+import io
+import os
+import zlib
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+
+from . import models
+from .catalog_json import COMPONENT_COLUMNS, SPECIFICATION_COLUMNS
+
+# Filas leídas por cada viaje al cursor del servidor
+EXPORT_YIELD_PER = int(os.getenv("EXPORT_YIELD_PER", "1000"))
+# Tamaño aproximado de cada bloque enviado al cliente
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = ("id", "version", "deleted") + tuple(c for c in COMPONENT_COLUMNS if c != "id") + ("specifications",)
+
+_components = models.Component.__table__
+_specifications = models.Specification.__table__
+_changes = models.ComponentChange.__table__
+
+def get_export_version(db: Session) -> int:
+    """Versión más alta registrada; el cliente la usa como `since` en la siguiente exportación."""
+    return db.execute(select(func.max(_changes.c.version))).scalar() or 0
+
+def begin_export(session_factory: Callable[[], Session]) -> Tuple[Session, int]:
+    """
+    Abre la sesión de una exportación y lee su versión. En PostgreSQL la
+    transacción es REPEATABLE READ para que la versión y todas las filas
+    salgan de la misma instantánea. La sesión la cierra stream_export al
+    terminar; si el cuerpo no llega a empezar, quien la abrió debe cerrarla
+    (export_response lo hace con una tarea de fondo).
+    """
+    db = session_factory()
+    try:
+        if db.get_bind().dialect.name != "sqlite":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        return db, get_export_version(db)
+    except Exception:
+        db.close()
+        raise
+
+def iter_components(db: Session, since: Optional[int] = None, until: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Recorre los componentes con sus especificaciones en orden de ID. Con
+    `since`, solo los modificados después de esa versión y los borrados; con
+    `until`, nada modificado después de esa versión.
+    """
+    version = func.coalesce(_changes.c.version, 0).label("version")
+    query = (
+        select(
+            *(_components.c[column] for column in COMPONENT_COLUMNS),
+            version,
+            *(_specifications.c[column].label(f"spec_{column}") for column in ("id", "name", "value")),
+        )
+        .select_from(
+            _components
+            .outerjoin(_changes, _changes.c.component_id == _components.c.id)
+            .outerjoin(_specifications, _specifications.c.component_id == _components.c.id)
+        )
+        .order_by(_components.c.id, _specifications.c.id)
+        .execution_options(yield_per=EXPORT_YIELD_PER)
+    )
+    if since is not None:
+        query = query.where(_changes.c.version > since)
+    if until is not None:
+        query = query.where(func.coalesce(_changes.c.version, 0) <= until)
+
+    rows = db.execute(query).mappings()
+    for component_id, group in groupby(rows, key=lambda row: row["id"]):
+        group = list(group)
+        first = group[0]
+        component = {column: first[column] for column in COMPONENT_COLUMNS}
+        component["version"] = first["version"]
+        component["specifications"] = [
+            {"name": row["spec_name"], "value": row["spec_value"], "id": row["spec_id"], "component_id": component_id}
+            for row in group if row["spec_id"] is not None
+        ]
+        yield component
+
+    if since is not None:
+        deleted = db.execute(
+            select(_changes.c.component_id, _changes.c.version)
+            .where(_changes.c.deleted.is_(True), _changes.c.version > since,
+                   _changes.c.version <= until if until is not None else True)
+            .order_by(_changes.c.component_id)
+            .execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+        for component_id, version in deleted:
+            yield {"id": component_id, "version": version, "deleted": True}
+
+def ndjson_lines(components: Iterable[Dict]) -> Iterator[bytes]:
+    for component in components:
+        yield orjson.dumps(component) + b"\n"
+
+def csv_lines(components: Iterable[Dict]) -> Iterator[bytes]:
+    """Una fila por componente; las especificaciones van como JSON en una columna."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for component in components:
+        record = {
+            **component,
+            "deleted": component.get("deleted", False),
+            "specifications": orjson.dumps(component.get("specifications", [])).decode(),
+        }
+        writer.writerow([record.get(column) for column in CSV_COLUMNS])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+def chunked(lines: Iterable[bytes], chunk_bytes: int = EXPORT_CHUNK_BYTES) -> Iterator[bytes]:
+    """Agrupa líneas pequeñas en bloques para reducir escrituras al socket."""
+    pending = []
+    size = 0
+    for line in lines:
+        pending.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield b"".join(pending)
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Comprime en streaming con formato gzip."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def stream_export(db: Session, version: Optional[int] = None, format: str = "ndjson",
+                  since: Optional[int] = None, gzip: bool = False) -> Iterator[bytes]:
+    """
+    Genera el cuerpo de la exportación con la sesión de begin_export (hasta
+    su `version`) y la cierra al terminar.
+    """
+    try:
+        components = iter_components(db, since, version)
+        lines = csv_lines(components) if format == "csv" else ndjson_lines(components)
+        chunks = chunked(lines)
+        yield from gzip_chunks(chunks) if gzip else chunks
+    finally:
+        db.close()
+
+def export_response(session_factory: Callable[[], Session], format: str = "ndjson",
+                    since: Optional[int] = None, gzip: bool = False) -> StreamingResponse:
+    """
+    Respuesta en streaming de una exportación, con la versión en la cabecera
+    X-Catalog-Version. La sesión se abre antes de responder para leer esa
+    versión; la tarea de fondo la cierra también cuando el cliente se
+    desconecta antes del primer bloque y el generador no llega a ejecutarse.
+    """
+    db, version = begin_export(session_factory)
+    headers = {
+        "X-Catalog-Version": str(version),
+        "Content-Disposition": f'attachment; filename="components.{format}"',
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_export(db, version, format=format, since=since, gzip=gzip),
+        media_type=EXPORT_FORMATS[format],
+        headers=headers,
+        background=BackgroundTask(db.close)
+    )
@@ -0,0 +1,225 @@
+"""
+Índice de facetas en memoria para el filtrado del catálogo.
+Cada valor de faceta (tipo, marca, rango de precio, socket y tipo de memoria)
+se guarda como un array booleano de NumPy, de modo que las intersecciones y
+los conteos por valor se resuelven con operaciones vectorizadas.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import re
+import threading
+
+import numpy as np
+from sqlalchemy.orm import Session, selectinload
+
+from .models import Component
+
+FACETS = ("type", "brand", "price_range", "socket", "memory_type")
+
+# Rangos de precio (mínimo incluido, máximo excluido)
+PRICE_RANGES: List[Tuple[float, Optional[float], str]] = [
+    (0.0, 100.0, "0-100"),
+    (100.0, 250.0, "100-250"),
+    (250.0, 500.0, "250-500"),
+    (500.0, 1000.0, "500-1000"),
+    (1000.0, None, "1000+"),
+]
+
+MEMORY_SPEC_NAMES = {"memory_type", "memory_support", "memory", "tipo_memoria", "type"}
+MEMORY_TYPE_PATTERN = re.compile(r"\b(G?DDR\d+X?)\b", re.IGNORECASE)
+
+
+def price_range_label(price: Optional[float]) -> Optional[str]:
+    """Devuelve la etiqueta del rango de precio de un importe."""
+    if price is None:
+        return None
+    for low, high, label in PRICE_RANGES:
+        if price >= low and (high is None or price < high):
+            return label
+    return None
+
+
+def extract_facet_values(component: Component) -> Dict[str, Set[str]]:
+    """Obtiene los valores de cada faceta para un componente."""
+    values: Dict[str, Set[str]] = {facet: set() for facet in FACETS}
+    if component.type:
+        values["type"].add(component.type.strip())
+    if component.brand:
+        values["brand"].add(component.brand.strip())
+    label = price_range_label(component.price)
+    if label:
+        values["price_range"].add(label)
+
+    for spec in component.specifications or []:
+        spec_name = (spec.name or "").strip().lower()
+        spec_value = (spec.value or "").strip()
+        if not spec_value:
+            continue
+        if spec_name == "socket":
+            values["socket"].add(spec_value)
+        elif spec_name in MEMORY_SPEC_NAMES:
+            values["memory_type"].update(m.upper() for m in MEMORY_TYPE_PATTERN.findall(spec_value))
+
+    # Los módulos de RAM suelen indicar el tipo solo en el nombre
+    if not values["memory_type"] and (component.type or "").lower() == "ram":
+        values["memory_type"].update(m.upper() for m in MEMORY_TYPE_PATTERN.findall(component.name or ""))
+    return values
+
+
+class FacetIndex:
+    """Bitmaps por valor de faceta sobre las posiciones de los componentes."""
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._reset(initial_capacity)
+
+    def _reset(self, capacity: int) -> None:
+        self._capacity = max(capacity, 1)
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._ids = np.zeros(self._capacity, dtype=np.int64)
+        self._prices = np.full(self._capacity, np.nan)
+        self._slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        self._next_slot = 0
+        self._slot_values: Dict[int, Dict[str, Set[str]]] = {}
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {facet: {} for facet in FACETS}
+        self._labels: Dict[str, Dict[str, str]] = {facet: {} for facet in FACETS}
+
+    def _grow(self) -> None:
+        """Duplica la capacidad de todos los arrays."""
+        extra = self._capacity
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        self._ids = np.concatenate([self._ids, np.zeros(extra, dtype=np.int64)])
+        self._prices = np.concatenate([self._prices, np.full(extra, np.nan)])
+        for bitmaps in self._bitmaps.values():
+            for key, bitmap in bitmaps.items():
+                bitmaps[key] = np.concatenate([bitmap, np.zeros(extra, dtype=bool)])
+        self._capacity += extra
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._next_slot >= self._capacity:
+            self._grow()
+        slot = self._next_slot
+        self._next_slot += 1
+        return slot
+
+    def _add(self, component: Component) -> None:
+        self._remove(component.id)
+        slot = self._allocate_slot()
+        self._slots[component.id] = slot
+        self._alive[slot] = True
+        self._ids[slot] = component.id
+        self._prices[slot] = component.price if component.price is not None else np.nan
+
+        values = extract_facet_values(component)
+        keyed: Dict[str, Set[str]] = {}
+        for facet, facet_values in values.items():
+            keyed[facet] = set()
+            for value in facet_values:
+                key = value.casefold()
+                bitmap = self._bitmaps[facet].get(key)
+                if bitmap is None:
+                    bitmap = np.zeros(self._capacity, dtype=bool)
+                    self._bitmaps[facet][key] = bitmap
+                    self._labels[facet][key] = value
+                bitmap[slot] = True
+                keyed[facet].add(key)
+        self._slot_values[slot] = keyed
+
+    def _remove(self, component_id: int) -> None:
+        slot = self._slots.pop(component_id, None)
+        if slot is None:
+            return
+        for facet, keys in self._slot_values.pop(slot, {}).items():
+            for key in keys:
+                bitmap = self._bitmaps[facet][key]
+                bitmap[slot] = False
+                if not bitmap.any():
+                    del self._bitmaps[facet][key]
+                    del self._labels[facet][key]
+        self._alive[slot] = False
+        self._prices[slot] = np.nan
+        self._free_slots.append(slot)
+
+    def add_component(self, component: Component) -> None:
+        """Añade o reemplaza un componente en el índice."""
+        with self._lock:
+            self._add(component)
+
+    def remove_component(self, component_id: int) -> None:
+        """Elimina un componente del índice."""
+        with self._lock:
+            self._remove(component_id)
+
+    def rebuild(self, components: Iterable[Component]) -> None:
+        """Reconstruye el índice completo a partir de los componentes dados."""
+        components = list(components)
+        with self._lock:
+            self._reset(max(len(components) * 2, 1024))
+            for component in components:
+                self._add(component)
+
+    def build_from_db(self, db: Session) -> None:
+        """Carga todo el catálogo, con sus especificaciones, en el índice."""
+        self.rebuild(db.query(Component).options(selectinload(Component.specifications)).all())
+
+    def _facet_mask(self, facet: str, values: List[str]) -> np.ndarray:
+        """Unión (OR) de los bitmaps de los valores seleccionados de una faceta."""
+        mask = np.zeros(self._capacity, dtype=bool)
+        for value in values:
+            bitmap = self._bitmaps[facet].get(value.strip().casefold())
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+
+    def search(self, filters: Optional[Dict[str, List[str]]] = None,
+               min_price: Optional[float] = None, max_price: Optional[float] = None) -> Dict:
+        """
+        Filtra el catálogo y calcula los conteos por valor de faceta.
+
+        Los valores de una misma faceta se combinan con OR y las facetas entre sí
+        con AND. Los conteos de cada faceta ignoran su propia selección, de modo
+        que el usuario ve cuántos resultados obtendría al cambiarla.
+
+        Returns:
+            Diccionario con los IDs que cumplen los filtros (ordenados) y los
+            conteos por faceta.
+        """
+        filters = {facet: values for facet, values in (filters or {}).items()
+                   if facet in FACETS and values}
+        with self._lock:
+            base = self._alive.copy()
+            if min_price is not None:
+                base &= self._prices >= min_price
+            if max_price is not None:
+                base &= self._prices <= max_price
+
+            masks = {facet: self._facet_mask(facet, values) for facet, values in filters.items()}
+            result = base.copy()
+            for mask in masks.values():
+                result &= mask
+
+            counts: Dict[str, Dict[str, int]] = {}
+            for facet in FACETS:
+                scope = base.copy()
+                for other, mask in masks.items():
+                    if other != facet:
+                        scope &= mask
+                counts[facet] = {
+                    self._labels[facet][key]: int(np.count_nonzero(bitmap & scope))
+                    for key, bitmap in self._bitmaps[facet].items()
+                }
+            counts["price_range"] = {
+                label: counts["price_range"].get(label, 0) for _, _, label in PRICE_RANGES
+            }
+
+            ids = np.sort(self._ids[result])
+        return {"ids": ids.tolist(), "facets": counts}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+# Instancia global del índice de facetas
+facet_index = FacetIndex()
@@ -0,0 +1,210 @@
+"""
+Servicio de clasificación de intenciones del chatbot.
+
+El pipeline entrenado (TF-IDF + Naive Bayes) se carga una sola vez desde
+NLP_MODEL_PATH, opcionalmente con memory-mapping (NLP_MODEL_MMAP) para que
+varios workers compartan las matrices del modelo en la caché de páginas.
+Cada predicción vectoriza el texto una vez: la intención y la confianza se
+obtienen de la misma llamada a predict_proba, y predict_intents procesa lotes
+de textos en una sola pasada.
+
+Las predicciones se guardan en una caché LRU indexada por el texto ya
+preprocesado ("hola", "Hola!" y "hola " comparten entrada). Cada entrada
+lleva la versión del modelo con que se calculó; si el fichero del modelo
+cambia en disco se recarga, la versión sube y las entradas antiguas dejan de
+servirse.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+import joblib
+
+from .nlp_training import NLP_MODEL_PATH, preprocess_text
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+NLP_MODEL_MMAP = os.getenv("NLP_MODEL_MMAP", "false").lower() == "true"
+# Número máximo de textos preprocesados con su predicción en memoria
+INTENT_CACHE_MAX_ENTRIES = int(os.getenv("INTENT_CACHE_MAX_ENTRIES", "4096"))
+# Cada cuánto se comprueba si el fichero del modelo ha cambiado
+INTENT_MODEL_CHECK_SECONDS = float(os.getenv("INTENT_MODEL_CHECK_SECONDS", "5"))
+
+class IntentCache:
+    """Caché LRU de resultados por texto, válidos solo para una versión del modelo."""
+
+    def __init__(self, max_entries: int = INTENT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: int, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+class IntentClassifier:
+    """Clasificador de intenciones cargado una vez y compartido entre peticiones."""
+
+    def __init__(self, model_path: str = NLP_MODEL_PATH, mmap: bool = NLP_MODEL_MMAP,
+                 cache_size: int = INTENT_CACHE_MAX_ENTRIES, check_seconds: float = INTENT_MODEL_CHECK_SECONDS):
+        self.model_path = model_path
+        self.mmap = mmap
+        # (pipeline, clases, versión) publicados juntos en una sola asignación: una
+        # predicción concurrente con una recarga nunca mezcla un modelo con las
+        # clases de otro. La versión sube con cada modelo e invalida las cachés.
+        self._model: Tuple[Any, List[str], int] = (None, [], 0)
+        self.cache = IntentCache(cache_size)
+        self.check_seconds = check_seconds
+        self._model_mtime: Optional[float] = None
+        self._last_check = time.monotonic()
+        self.reloads = 0
+        # Reentrante: set_pipeline se llama también desde la carga, con el cerrojo tomado
+        self._lock = threading.RLock()
+
+    @property
+    def pipeline(self):
+        return self._model[0]
+
+    @property
+    def classes(self) -> List[str]:
+        return self._model[1]
+
+    @property
+    def version(self) -> int:
+        return self._model[2]
+
+    @property
+    def available(self) -> bool:
+        return self.pipeline is not None
+
+    def _stat_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.model_path).st_mtime
+        except OSError:
+            return None
+
+    def load(self) -> bool:
+        """Carga el modelo si existe; devuelve si quedó disponible."""
+        with self._lock:
+            if self.pipeline is not None:
+                return True
+            return self._load_locked()
+
+    def _load_locked(self) -> bool:
+        mtime = self._stat_mtime()
+        self._last_check = time.monotonic()
+        if mtime is None:
+            logger.warning(f"Modelo NLP no encontrado en {self.model_path}. Se usará la detección básica.")
+            return False
+        self.set_pipeline(joblib.load(self.model_path, mmap_mode="r" if self.mmap else None))
+        self._model_mtime = mtime
+        logger.info(f"Modelo NLP cargado desde {self.model_path} (mmap={self.mmap})")
+        return True
+
+    def refresh(self) -> None:
+        """
+        Recarga el modelo si el fichero ha cambiado (o ha aparecido) desde la
+        última carga. Se comprueba como mucho una vez cada `check_seconds`.
+        """
+        if time.monotonic() - self._last_check < self.check_seconds:
+            return
+        with self._lock:
+            self._last_check = time.monotonic()
+            mtime = self._stat_mtime()
+            if mtime is None or mtime == self._model_mtime:
+                return
+            try:
+                self._load_locked()
+                self.reloads += 1
+            except Exception as e:
+                # Un fichero a medio escribir se reintenta en la siguiente comprobación
+                logger.error(f"Error recargando el modelo NLP desde {self.model_path}: {e}")
+
+    def set_pipeline(self, pipeline) -> None:
+        """Usa un pipeline ya entrenado (p. ej. recién entrenado o en pruebas)."""
+        classes = [str(label) for label in pipeline.classes_]
+        with self._lock:
+            self._model = (pipeline, classes, self.version + 1)
+            self.cache.clear()
+
+    def predict_intents(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Predice la intención de varios textos. Los que ya están en caché no se
+        vuelven a clasificar; el resto se vectoriza en una sola llamada a
+        predict_proba. Las puntuaciones se asocian a las clases en el orden
+        del modelo (pipeline.classes_). Los resultados se comparten con la
+        caché y no deben modificarse.
+        """
+        self.refresh()
+        pipeline, classes, version = self._model
+        if pipeline is None:
+            raise ValueError("Modelo no encontrado. Ejecuta el entrenamiento primero.")
+        keys = [preprocess_text(text) for text in texts]
+        found: Dict[str, Dict[str, Any]] = {}
+        for key in keys:
+            if key not in found:
+                result = self.cache.get(key, version)
+                if result is not None:
+                    found[key] = result
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            for key, scores in zip(missing, pipeline.predict_proba(missing)):
+                best = int(scores.argmax())
+                found[key] = {
+                    "intent": classes[best],
+                    "confidence": float(scores[best]),
+                    "all_scores": dict(zip(classes, scores.tolist())),
+                }
+                self.cache.put(key, version, found[key])
+        return [found[key] for key in keys]
+
+    def predict_intent(self, text: str) -> Dict[str, Any]:
+        return self.predict_intents([text])[0]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "model_available": self.available,
+            "model_path": self.model_path,
+            "model_version": self.version,
+            "model_reloads": self.reloads,
+            "prediction_cache": self.cache.get_metrics(),
+        }
+
+def create_intent_classifier(model_path: Optional[str] = None) -> IntentClassifier:
+    """Crea el clasificador y carga el modelo si está disponible."""
+    classifier = IntentClassifier(model_path or NLP_MODEL_PATH)
+    classifier.load()
+    return classifier
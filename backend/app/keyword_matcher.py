@@ -0,0 +1,164 @@
+"""
+Detección de palabras clave del chat.
+
+Todas las tablas (intenciones del chatbot, temas del asistente, componentes,
+tipos de catálogo, modificadores de uso...) se compilan al importar el módulo
+en un único vocabulario sin duplicados: cada mensaje se pasa a minúsculas una
+vez, cada palabra distinta se busca una sola vez y el resultado responde a
+todas las tablas. La semántica es la de las comprobaciones `palabra in
+mensaje` que sustituye: coincidencias por subcadena, sin distinguir
+mayúsculas, y con prioridad según el orden de cada tabla. Las entradas que
+necesitan algo más que una palabra (p. ej. "qué es" seguido de un término)
+llevan además una expresión regular precompilada que solo se evalúa si alguna
+de sus palabras aparece en el mensaje.
+"""
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+import re
+
+# Entrada de una tabla: (etiqueta, palabras, regex opcional que debe cumplirse además)
+KeywordEntry = Tuple[str, Sequence[str], Optional[str]]
+
+def _table(groups: Sequence[Tuple[str, Sequence[str]]]) -> List[KeywordEntry]:
+    """Convierte [(etiqueta, [palabras])] en entradas sin expresión regular."""
+    return [(label, words, None) for label, words in groups]
+
+CHAT_KEYWORDS: Dict[str, List[KeywordEntry]] = {
+    # Intenciones del chatbot en orden de prioridad (detección sin modelo NLP)
+    "intent": [
+        ("component_info", ["que es ", "qué es "], r"qu[eé] es (un |una |el |la )?\w"),
+        ("component_recommendation", ["recomienda "], r"recomienda (un |una |)\w"),
+        ("best_component", ["cual es ", "cuál es "], r"cu[aá]l es (la |el |)(mejor|buena|bueno) \w"),
+        ("compatibility", ["compatible", "compatibilidad"], None),
+        ("budget", ["presupuesto"], None),
+        ("gaming_usage", ["gaming", "juegos", "videojuegos"], None),
+        ("work_usage", ["trabajo", "profesional", "workstation"], None),
+        ("office_usage", ["oficina", "básico", "básica"], None),
+    ],
+    # Temas de las respuestas del asistente (OpenAIHandler)
+    "topic": _table([
+        ("greeting", ["hola", "buenos", "buenas", "saludos"]),
+        ("cpu", ["cpu", "procesador", "microprocesador"]),
+        ("gpu", ["gpu", "tarjeta", "gráfica", "video"]),
+        ("ram", ["ram", "memoria"]),
+        ("motherboard", ["placa", "motherboard", "tarjeta madre"]),
+        ("psu", ["fuente", "psu", "alimentación"]),
+        ("budget", ["presupuesto", "precio", "costo", "dinero"]),
+        ("compatibility", ["compatibilidad", "compatible"]),
+        ("recommendation", ["recomendación", "recomienda", "mejor", "bueno"]),
+    ]),
+    # Detalles que matizan la respuesta de cada tema
+    "modifier": _table([
+        ("gaming", ["gaming", "juegos"]),
+        ("work", ["trabajo", "productividad"]),
+        ("4k", ["4k"]),
+        ("1440p", ["1440p"]),
+        ("amd", ["amd", "ryzen"]),
+        ("intel", ["intel"]),
+    ]),
+    # Componente de la base de conocimiento del chatbot
+    "component": _table([
+        ("cpu", ["procesador", "cpu", "microprocesador", "ryzen", "core i"]),
+        ("gpu", ["tarjeta gráfica", "gpu", "gráfica", "video", "geforce", "rtx", "gtx", "radeon"]),
+        ("ram", ["memoria", "ram"]),
+        ("storage", ["disco", "almacenamiento", "ssd", "hdd", "storage"]),
+        ("motherboard", ["placa", "placa base", "motherboard", "tarjeta madre"]),
+        ("psu", ["fuente", "fuente de poder", "psu", "alimentación"]),
+    ]),
+    # Slots del estado de la conversación (dialogue_state)
+    "usage": _table([
+        ("gaming", ["gaming", "juegos", "jugar", "videojuegos"]),
+        ("workstation", ["trabajo", "profesional", "workstation", "edición", "renderizado", "diseño"]),
+        ("office", ["oficina", "ofimática", "básico", "básica"]),
+    ]),
+    "resolution": _table([
+        ("4k", ["4k", "2160p", "uhd"]),
+        ("1440p", ["1440p", "qhd"]),
+        ("1080p", ["1080p", "full hd", "fhd"]),
+    ]),
+    "brand": _table([
+        ("AMD", ["amd", "ryzen", "radeon"]),
+        ("Intel", ["intel", "core i"]),
+        ("NVIDIA", ["nvidia", "geforce", "rtx", "gtx"]),
+    ]),
+    # Palabras que hacen que el endpoint de chat añada componentes del catálogo
+    "catalog_search": _table([
+        ("search", ["recomienda", "busca", "encuentra", "mejor", "componente", "cpu", "gpu", "ram", "placa",
+                    "motherboard", "fuente", "psu", "almacenamiento", "ssd", "hdd"]),
+    ]),
+    # Tipo de componente del catálogo que se consulta
+    "catalog_type": _table([
+        ("CPU", ["cpu"]),
+        ("GPU", ["gpu", "tarjeta"]),
+        ("RAM", ["ram", "memoria"]),
+        ("Motherboard", ["placa", "motherboard"]),
+        ("PSU", ["fuente", "psu"]),
+        ("Storage", ["almacenamiento", "ssd", "hdd"]),
+    ]),
+}
+
+class KeywordMatches:
+    """Resultado de KeywordMatcher.match: palabras de las tablas presentes en el mensaje."""
+
+    __slots__ = ("_matcher", "text", "terms")
+
+    def __init__(self, matcher: "KeywordMatcher", text: str, terms: Set[str]):
+        self._matcher = matcher
+        self.text = text
+        self.terms = terms
+
+    def _present(self, words: FrozenSet[str], pattern: Optional["re.Pattern[str]"]) -> bool:
+        return not words.isdisjoint(self.terms) and (pattern is None or pattern.search(self.text) is not None)
+
+    def labels(self, category: str) -> List[str]:
+        """Etiquetas de la categoría presentes en el mensaje, en el orden de la tabla."""
+        labels: List[str] = []
+        for label, words, pattern in self._matcher.entries(category):
+            if label not in labels and self._present(words, pattern):
+                labels.append(label)
+        return labels
+
+    def first(self, category: str, default: Optional[str] = None) -> Optional[str]:
+        """Primera etiqueta de la categoría (por orden de la tabla) presente en el mensaje."""
+        for label, words, pattern in self._matcher.entries(category):
+            if self._present(words, pattern):
+                return label
+        return default
+
+    def has(self, category: str, label: Optional[str] = None) -> bool:
+        if label is None:
+            return self.first(category) is not None
+        return any(
+            entry_label == label and self._present(words, pattern)
+            for entry_label, words, pattern in self._matcher.entries(category)
+        )
+
+class KeywordMatcher:
+    """
+    Compila tablas {categoría: [(etiqueta, palabras, regex)]} en un
+    vocabulario común. Con CPython, buscar cada palabra con `in` (búsqueda de
+    subcadenas en C) es más rápido que una alternancia única con `re`, que
+    prueba las alternativas en cada posición del mensaje.
+    """
+
+    def __init__(self, tables: Dict[str, List[KeywordEntry]]):
+        self._entries: Dict[str, List[Tuple[str, FrozenSet[str], Optional["re.Pattern[str]"]]]] = {
+            category: [
+                (label, frozenset(word.lower() for word in words), re.compile(pattern) if pattern else None)
+                for label, words, pattern in entries
+            ]
+            for category, entries in tables.items()
+        }
+        self.vocabulary: Tuple[str, ...] = tuple(sorted({
+            word for entries in self._entries.values() for _, words, _ in entries for word in words
+        }))
+
+    def entries(self, category: str) -> List[Tuple[str, FrozenSet[str], Optional["re.Pattern[str]"]]]:
+        return self._entries.get(category, [])
+
+    def match(self, text: str) -> KeywordMatches:
+        """Devuelve todas las palabras del vocabulario presentes en el mensaje."""
+        text = text.lower()
+        return KeywordMatches(self, text, {word for word in self.vocabulary if word in text})
+
+# Instancia global con todas las tablas del chat
+chat_matcher = KeywordMatcher(CHAT_KEYWORDS)
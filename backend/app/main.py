@@ -1,18 +1,34 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import timedelta
+import orjson
 
-from .database import get_db
+from .database import get_db, get_read_db, get_write_db, get_async_read_db, mark_primary_sticky, should_read_from_primary
 from .models import Base
-from .database import engine
-from .schemas import ComponentCreate, Component, CompatibilityCheck, CompatibilityRequest, RecommendationRequest, RecommendationResult, UserCreate, User, UserProfileCreate, UserProfile, Token
-from .crud import get_components, get_component, get_components_by_type, create_component, update_component, delete_component, check_compatibility, generate_recommendations, create_user, get_user_by_email, create_user_profile, get_user_profile
-from .ai_engine import get_ai_engine
+from .database import engine, SessionLocal, ReadSessionLocal, async_engine, async_read_engine
+from .schemas import ComponentCreate, Component, ComponentSuggestion, FacetSearchResult, CompatibilityCheck, CompatibilityRequest, RecommendationRequest, RecommendationResult, UserCreate, User, UserProfileCreate, UserProfile, Token
+from .crud import get_component, get_components_by_ids, create_component, update_component, delete_component, check_compatibility, create_user, get_user_by_email, create_user_profile, get_user_profile
+from .ai_engine import AIRecommendationEngine
+from . import async_crud
+from .autocomplete import autocomplete_index
+from .facets import facet_index
+from .retrieval import retrieval_index
 from .auth import authenticate_user, create_access_token, get_current_active_user, ACCESS_TOKEN_EXPIRE_MINUTES
+from .stats import stats_service
+from .popularity import popularity_tracker
+from .scrape_jobs import scrape_jobs
+from .services import get_recommendation_engine, services
+from .catalog_json import component_renderer
+from .export import export_response
+from .response_cache import catalog_versions, response_cache, etag_matches, json_response, not_modified_response
+from .api.endpoints import bulk as bulk_endpoints
 from .api.endpoints import chatbot as chatbot_endpoints
+from .api.endpoints import stats as stats_endpoints
+from .api.endpoints import snapshots as snapshot_endpoints
 
 # Crear tablas en la base de datos
 Base.metadata.create_all(bind=engine)
@@ -32,44 +48,178 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# La popularidad acumulada también pondera las sugerencias de autocompletado
+popularity_tracker.add_listener(autocomplete_index.add_popularity)
+
+@app.on_event("startup")
+def build_search_indexes():
+    """Construye los índices en memoria del catálogo al arrancar la API."""
+    db = SessionLocal()
+    try:
+        autocomplete_index.build_from_db(db)
+        facet_index.build_from_db(db)
+        retrieval_index.build_from_db(db)
+        stats_service.refresh(db)
+        popularity_tracker.load(db)
+    finally:
+        db.close()
+    stats_service.start(SessionLocal)
+    popularity_tracker.start(SessionLocal)
+    scrape_jobs.start(SessionLocal)
+
+@app.on_event("startup")
+def start_services():
+    """Crea una sola vez el chatbot compartido (modelo NLP y almacén de sesiones)."""
+    services.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    """Detiene los hilos de mantenimiento en segundo plano y cierra el motor asíncrono."""
+    stats_service.stop()
+    popularity_tracker.stop(SessionLocal)
+    scrape_jobs.stop()
+    services.stop()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
 @app.get("/")
 def read_root():
     return {"message": "Bienvenido a la API de ComPuter"}
 
+# Operaciones masivas; se registran antes de /components/{component_id}
+app.include_router(bulk_endpoints.router, prefix="/components/bulk", tags=["components"])
+
 # Endpoints para componentes
 @app.get("/components/", response_model=List[Component])
-def read_components(
+async def read_components(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
     type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    await db.run_sync(catalog_versions.sync)
+    etag = catalog_versions.catalog_etag()
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    cache_key = f"components:{skip}:{limit}:{type}"
+    body = response_cache.get(cache_key, etag)
+    if body is None:
+        body = await component_renderer.render_components(db, skip=skip, limit=limit, type=type)
+        response_cache.put(cache_key, etag, body)
+    return json_response(body, etag)
+
+@app.get("/components/suggest", response_model=List[ComponentSuggestion])
+def suggest_components(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=10)
+):
+    """Sugerencias de autocompletado por prefijo servidas desde memoria."""
+    return autocomplete_index.suggest(q, limit=limit)
+
+@app.get("/components/facets", response_model=FacetSearchResult)
+def search_components_by_facets(
+    type: Optional[List[str]] = Query(None),
+    brand: Optional[List[str]] = Query(None),
+    price_range: Optional[List[str]] = Query(None),
+    socket: Optional[List[str]] = Query(None),
+    memory_type: Optional[List[str]] = Query(None),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
 ):
-    if type:
-        components = get_components_by_type(db, type=type, skip=skip, limit=limit)
-    else:
-        components = get_components(db, skip=skip, limit=limit)
-    return components
+    """Filtra componentes por facetas y devuelve los conteos de cada valor."""
+    result = facet_index.search(
+        filters={
+            "type": type,
+            "brand": brand,
+            "price_range": price_range,
+            "socket": socket,
+            "memory_type": memory_type,
+        },
+        min_price=min_price,
+        max_price=max_price
+    )
+    page_ids = result["ids"][skip:skip + limit]
+    return {
+        "total": len(result["ids"]),
+        "items": get_components_by_ids(db, page_ids),
+        "facets": result["facets"]
+    }
+
+# Endpoint para obtener estadísticas de componentes
+@app.get("/components/stats")
+def get_components_stats(request: Request, db: Session = Depends(get_read_db)):
+    """Obtiene el número de componentes por tipo desde la instantánea de estadísticas."""
+    try:
+        snapshot = stats_service.get_snapshot(db)
+        etag = catalog_versions.make_etag("stats", snapshot["version"])
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+        body = response_cache.get("components:stats", etag)
+        if body is None:
+            body = orjson.dumps(stats_service.get_type_counts(db))
+            response_cache.put("components:stats", etag, body)
+        return json_response(body, etag)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error obteniendo estadísticas: {str(e)}")
+
+@app.get("/components/export")
+def export_components(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[int] = Query(None, ge=0),
+    gzip: bool = False
+):
+    """
+    Exporta el catálogo completo con especificaciones en NDJSON o CSV, en
+    streaming. Con `since`, solo los cambios posteriores a esa versión; la
+    cabecera X-Catalog-Version indica el valor a usar en la siguiente exportación.
+    """
+    # La versión y las filas se leen con la misma sesión, abierta por la exportación
+    return export_response(
+        SessionLocal if should_read_from_primary(request) else ReadSessionLocal,
+        format=format, since=since, gzip=gzip
+    )
 
 @app.get("/components/{component_id}", response_model=Component)
-def read_component(component_id: int, db: Session = Depends(get_db)):
-    component = get_component(db, component_id=component_id)
-    if component is None:
-        raise HTTPException(status_code=404, detail="Componente no encontrado")
-    return component
+async def read_component(component_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    await db.run_sync(catalog_versions.sync)
+    etag = catalog_versions.component_etag(component_id)
+    # Los IDs sin cambios registrados comparten la versión base, así que el ETag
+    # no prueba que el componente exista: el 304 (y la visita) solo se dan con
+    # un cuerpo en caché para ese ETag o tras leerlo de la base de datos
+    cache_key = f"component:{component_id}"
+    body = response_cache.get(cache_key, etag)
+    if body is None:
+        body = await component_renderer.render_component(db, component_id)
+        if body is None:
+            raise HTTPException(status_code=404, detail="Componente no encontrado")
+        response_cache.put(cache_key, etag, body)
+    popularity_tracker.record("view", [component_id])
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    return json_response(body, etag)
 
 @app.post("/components/", response_model=Component)
-def add_component(component: ComponentCreate, db: Session = Depends(get_db)):
+def add_component(component: ComponentCreate, response: Response, db: Session = Depends(get_write_db)):
+    mark_primary_sticky(response)
     return create_component(db=db, component=component)
 
 @app.put("/components/{component_id}", response_model=Component)
-def update_component_endpoint(component_id: int, component: ComponentCreate, db: Session = Depends(get_db)):
+def update_component_endpoint(component_id: int, component: ComponentCreate, response: Response, db: Session = Depends(get_write_db)):
+    mark_primary_sticky(response)
     updated_component = update_component(db, component_id=component_id, component=component)
     if updated_component is None:
         raise HTTPException(status_code=404, detail="Componente no encontrado")
     return updated_component
 
 @app.delete("/components/{component_id}")
-def delete_component_endpoint(component_id: int, db: Session = Depends(get_db)):
+def delete_component_endpoint(component_id: int, response: Response, db: Session = Depends(get_write_db)):
+    mark_primary_sticky(response)
     success = delete_component(db, component_id=component_id)
     if not success:
         raise HTTPException(status_code=404, detail="Componente no encontrado")
@@ -77,19 +227,20 @@ def delete_component_endpoint(component_id: int, db: Session = Depends(get_db)):
 
 # Endpoints para verificación de compatibilidad
 @app.post("/compatibility/check/", response_model=CompatibilityCheck)
-def check_components_compatibility(request: CompatibilityRequest, db: Session = Depends(get_db)):
+def check_components_compatibility(request: CompatibilityRequest, db: Session = Depends(get_read_db)):
     result = check_compatibility(db, request.components)
     return result
 
 # Endpoints para recomendaciones
 @app.post("/recommendations/", response_model=RecommendationResult)
-def get_recommendations(request: RecommendationRequest, db: Session = Depends(get_db)):
-    recommendations = generate_recommendations(
+async def get_recommendations(request: RecommendationRequest, db: AsyncSession = Depends(get_async_read_db)):
+    recommendations = await async_crud.generate_recommendations(
         db, 
         budget=request.budget, 
         usage_type=request.usage_type, 
         preferences=request.preferences
     )
+    popularity_tracker.record("recommendation", [c.id for c in recommendations.get("components", [])])
     return recommendations
 
 # Endpoints para usuarios
@@ -109,21 +260,23 @@ def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db:
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/users/", response_model=User)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+def register_user(user: UserCreate, response: Response, db: Session = Depends(get_write_db)):
+    mark_primary_sticky(response)
     db_user = get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email ya registrado")
     return create_user(db=db, user=user)
 
 @app.post("/users/profile/", response_model=UserProfile)
-def create_profile(profile: UserProfileCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+def create_profile(profile: UserProfileCreate, response: Response, db: Session = Depends(get_write_db), current_user: User = Depends(get_current_active_user)):
+    mark_primary_sticky(response)
     # Verificar que el usuario solo pueda crear su propio perfil
     if profile.user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="No tienes permiso para crear este perfil")
     return create_user_profile(db=db, profile=profile)
 
 @app.get("/users/{user_id}/profile/", response_model=UserProfile)
-def read_user_profile(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+def read_user_profile(user_id: int, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_active_user)):
     # Verificar que el usuario solo pueda ver su propio perfil
     if user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="No tienes permiso para ver este perfil")
@@ -140,7 +293,7 @@ def read_users_me(current_user: User = Depends(get_current_active_user)):
 @app.post("/scraper/run")
 def run_scraper(
     component_types: Optional[List[str]] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """Ejecuta el scraper para obtener componentes de múltiples fuentes."""
     try:
@@ -176,7 +329,7 @@ def run_scraper(
 @app.post("/components/compare")
 def compare_components(
     component_ids: List[int],
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Compara múltiples componentes y verifica su compatibilidad."""
     try:
@@ -190,6 +343,8 @@ def compare_components(
         if not components:
             raise HTTPException(status_code=404, detail="No se encontraron componentes")
         
+        popularity_tracker.record("compare", [comp.id for comp in components])
+        
         # Verificar compatibilidad usando el motor de IA
         from .crud import check_compatibility
         compatibility_result = check_compatibility(db, component_ids)
@@ -232,14 +387,10 @@ def compare_components(
 @app.post("/components/recommendations")
 def get_component_recommendations(
     request: dict,
-    db: Session = Depends(get_db)
+    ai_engine: AIRecommendationEngine = Depends(get_recommendation_engine)
 ):
     """Obtiene recomendaciones de componentes basadas en presupuesto y uso."""
     try:
-        from .ai_engine import get_ai_engine
-        
-        ai_engine = get_ai_engine(db)
-        
         # Obtener recomendaciones usando el motor de IA
         recommendations = ai_engine.get_recommendations(
             budget=request.get("budget"),
@@ -251,24 +402,11 @@ def get_component_recommendations(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error obteniendo recomendaciones: {str(e)}")
 
-# Endpoint para obtener estadísticas de componentes
-@app.get("/components/stats")
-def get_components_stats(db: Session = Depends(get_db)):
-    """Obtiene estadísticas de los componentes en la base de datos."""
-    try:
-        stats = {}
-        component_types = ['CPU', 'GPU', 'RAM', 'Motherboard', 'Storage', 'PSU', 'Case', 'Cooler']
-        
-        for comp_type in component_types:
-            count = db.query(models.Component).filter(models.Component.type == comp_type).count()
-            stats[comp_type] = count
-        
-        total = sum(stats.values())
-        stats['total'] = total
-        
-        return stats
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error obteniendo estadísticas: {str(e)}")
-
 # Incluir los endpoints del chatbot
-app.include_router(chatbot_endpoints.router, prefix="/api/chatbot", tags=["chatbot"])
\ No newline at end of file
+app.include_router(chatbot_endpoints.router, prefix="/api/chatbot", tags=["chatbot"])
+
+# Incluir los endpoints de estadísticas
+app.include_router(stats_endpoints.router, prefix="/stats", tags=["stats"])
+
+# Incluir los endpoints de instantáneas del catálogo
+app.include_router(snapshot_endpoints.router, prefix="/snapshots", tags=["snapshots"])
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Table, Text, event, func, insert, select
+from datetime import datetime
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -60,4 +61,56 @@ class UserProfile(Base):
     usage_type = Column(String)  # gaming, office, design, etc.
     budget = Column(Float)
     preferences = Column(String)  # JSON string con preferencias
-    user = relationship("User", back_populates="profile")
\ No newline at end of file
+    user = relationship("User", back_populates="profile")
+
+class ComponentPopularity(Base):
+    __tablename__ = "component_popularity"
+
+    component_id = Column(Integer, ForeignKey("components.id"), primary_key=True)
+    views = Column(Integer, default=0)
+    comparisons = Column(Integer, default=0)
+    recommendations = Column(Integer, default=0)
+    impressions = Column(Integer, default=0, index=True)  # suma de todos los eventos
+
+class ComponentChange(Base):
+    __tablename__ = "component_changes"
+
+    # Sin clave foránea: la fila se conserva como marca de borrado
+    component_id = Column(Integer, primary_key=True)
+    version = Column(Integer, index=True, nullable=False)  # versión del catálogo en la última escritura
+    deleted = Column(Boolean, default=False, nullable=False)
+
+class CatalogVersionCounter(Base):
+    """
+    Contador único (id=1) de versiones del catálogo. Cada escritura lo
+    incrementa con UPDATE, que bloquea la fila hasta el commit: las versiones
+    se asignan en el mismo orden en que se confirman las transacciones.
+    """
+    __tablename__ = "catalog_version_counter"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+@event.listens_for(Base.metadata, "after_create")
+def _init_catalog_version_counter(target, connection, **kw):
+    """Crea la fila del contador continuando la versión más alta ya registrada."""
+    counter = CatalogVersionCounter.__table__
+    if connection.execute(select(counter.c.id)).first() is None:
+        latest = connection.execute(select(func.max(ComponentChange.__table__.c.version))).scalar() or 0
+        connection.execute(insert(counter).values(id=1, value=latest))
+
+class PriceHistory(Base):
+    __tablename__ = "price_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    component_id = Column(Integer, index=True, nullable=False)
+    price = Column(Float, nullable=False)
+    recorded_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class ChatSessionRecord(Base):
+    __tablename__ = "chat_sessions"
+
+    session_id = Column(String, primary_key=True)
+    user_id = Column(Integer, nullable=True)  # sin clave foránea: las sesiones anónimas no tienen usuario
+    data = Column(Text, nullable=False)  # ChatSession serializada en JSON
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True, nullable=False)
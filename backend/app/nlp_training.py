@@ -13,11 +13,28 @@ from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import os
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def resolve_model_path(path: str) -> str:
+    """Las rutas relativas se resuelven respecto al paquete app, no al directorio de trabajo."""
+    return path if os.path.isabs(path) else os.path.normpath(os.path.join(APP_DIR, path))
+
+NLP_MODEL_PATH = resolve_model_path(os.getenv("NLP_MODEL_PATH", "./models/nlp_model.joblib"))
+
+_SPECIAL_CHARS = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+def preprocess_text(text: str) -> str:
+    """Normaliza el texto igual en el entrenamiento y en la predicción."""
+    # Convertir a minúsculas, remover caracteres especiales y espacios extra
+    return _WHITESPACE.sub(' ', _SPECIAL_CHARS.sub('', text.lower())).strip()
+
 class NLPTrainer:
     def __init__(self):
         self.model = None
         self.vectorizer = None
         self.pipeline = None
+        self._classifier = None
         self.intent_labels = [
             'recommendation',
             'component_info',
@@ -111,16 +128,7 @@ class NLPTrainer:
     
     def preprocess_text(self, text: str) -> str:
         """Preprocesa el texto para el entrenamiento."""
-        # Convertir a minúsculas
-        text = text.lower()
-        
-        # Remover caracteres especiales pero mantener espacios
-        text = re.sub(r'[^\w\s]', '', text)
-        
-        # Remover espacios extra
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return preprocess_text(text)
     
     def train_model(self) -> Dict[str, Any]:
         """Entrena el modelo NLP con los datos de componentes."""
@@ -150,6 +158,7 @@ class NLPTrainer:
         
         # Entrenar modelo
         self.pipeline.fit(X_train, y_train)
+        self._classifier = None
         
         # Evaluar modelo
         y_pred = self.pipeline.predict(X_test)
@@ -159,8 +168,8 @@ class NLPTrainer:
         print("\nReporte de clasificación:")
         print(classification_report(y_test, y_pred))
         
-        # Guardar modelo
-        model_path = "backend/app/models/nlp_model.joblib"
+        # Guardar modelo (sin comprimir, para poder cargarlo con memory-mapping)
+        model_path = NLP_MODEL_PATH
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
         joblib.dump(self.pipeline, model_path)
         
@@ -174,27 +183,17 @@ class NLPTrainer:
         }
     
     def predict_intent(self, text: str) -> Dict[str, Any]:
-        """Predice la intención de un texto."""
-        if not self.pipeline:
-            # Cargar modelo si no está cargado
-            model_path = "backend/app/models/nlp_model.joblib"
-            if os.path.exists(model_path):
-                self.pipeline = joblib.load(model_path)
-            else:
+        """Predice la intención de un texto con el modelo entrenado o guardado."""
+        from .intent_service import IntentClassifier
+        
+        if self._classifier is None:
+            self._classifier = IntentClassifier()
+            if self.pipeline is not None:
+                self._classifier.set_pipeline(self.pipeline)
+            elif not self._classifier.load():
+                self._classifier = None
                 raise ValueError("Modelo no encontrado. Ejecuta el entrenamiento primero.")
-        
-        processed_text = self.preprocess_text(text)
-        predicted_intent = self.pipeline.predict([processed_text])[0]
-        confidence_scores = self.pipeline.predict_proba([processed_text])[0]
-        
-        # Obtener confianza de la predicción
-        max_confidence = max(confidence_scores)
-        
-        return {
-            "intent": predicted_intent,
-            "confidence": max_confidence,
-            "all_scores": dict(zip(self.intent_labels, confidence_scores))
-        }
+        return self._classifier.predict_intent(text)
     
     def test_predictions(self):
         """Prueba el modelo con algunos ejemplos."""
@@ -2,20 +2,79 @@
 Módulo para integración con OpenAI.
 Proporciona funcionalidades para conectar con la API de OpenAI
 y generar respuestas para el chatbot.
+
+Sin modelo configurado las respuestas se generan localmente por palabras
+clave. Con OPENAI_MODEL se transmiten por fragmentos desde la API de OpenAI
+a medida que el modelo los produce; OPENAI_MODEL=fake usa un backend local
+que transmite la respuesta por palabras (desarrollo del frontend y pruebas).
 """
+import logging
 import os
-from typing import List, Dict, Any, Optional
+import re
+import time
+from typing import Callable, Iterator, List, Dict, Any, Optional
+
+from .keyword_matcher import chat_matcher
+
+# Configurar logging
+logger = logging.getLogger(__name__)
 
 # Configurar la API key de OpenAI
 # En producción, esto debería venir de variables de entorno
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "tu-api-key-aqui")
+# Modelo para respuestas en streaming; vacío = respuestas locales
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "")
+# Pausa entre fragmentos del backend fake (s)
+FAKE_STREAM_DELAY_SECONDS = float(os.getenv("FAKE_STREAM_DELAY_SECONDS", "0.03"))
+
+class OpenAIStreamingBackend:
+    """Transmite la respuesta del modelo de OpenAI fragmento a fragmento."""
+
+    def __init__(self, model: str, api_key: str = OPENAI_API_KEY):
+        # Dependencia opcional: solo se importa si hay un modelo configurado
+        from openai import OpenAI
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+
+    def stream(self, user_message: str, chat_history: List[Dict[str, str]], system_prompt: str) -> Iterator[str]:
+        messages = [{"role": "system", "content": system_prompt}, *chat_history]
+        # El historial del chatbot ya suele terminar con el mensaje actual
+        if not chat_history or chat_history[-1].get("content") != user_message:
+            messages.append({"role": "user", "content": user_message})
+        for chunk in self.client.chat.completions.create(model=self.model, messages=messages, stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+class FakeStreamingBackend:
+    """
+    Backend local para pruebas y desarrollo: transmite `chunks` o, si no se
+    indican, la respuesta de `reply` palabra a palabra, con `delay` segundos
+    entre fragmentos.
+    """
+
+    def __init__(self, chunks: Optional[List[str]] = None, delay: float = 0.0,
+                 reply: Optional[Callable[[str], str]] = None):
+        self.chunks = chunks
+        self.delay = delay
+        self.reply = reply
+
+    def stream(self, user_message: str, chat_history: List[Dict[str, str]], system_prompt: str) -> Iterator[str]:
+        chunks = self.chunks if self.chunks is not None else re.findall(r"\S+\s*", self.reply(user_message) if self.reply else user_message)
+        for index, chunk in enumerate(chunks):
+            if index and self.delay:
+                time.sleep(self.delay)
+            yield chunk
 
 class OpenAIHandler:
     """Clase para manejar la integración con OpenAI."""
     
-    def __init__(self):
-        """Inicializa el manejador de OpenAI."""
-        self.model = "gpt-3.5-turbo"
+    def __init__(self, model: str = OPENAI_MODEL, streaming_backend: Any = None):
+        """
+        Inicializa el manejador de OpenAI. `streaming_backend` sustituye al
+        backend elegido a partir de `model` (p. ej. FakeStreamingBackend en
+        pruebas).
+        """
+        self.model = model or "gpt-3.5-turbo"
         self.system_prompt = """
         Eres un asistente especializado en componentes de computadoras y tecnología.
         Tu objetivo es ayudar a los usuarios a elegir los mejores componentes para sus necesidades,
@@ -26,6 +85,38 @@ class OpenAIHandler:
         Debes responder directamente a las preguntas del usuario sin mencionar que eres una IA.
         Proporciona información técnica precisa y recomendaciones basadas en las necesidades específicas del usuario.
         """
+        self.streaming_backend = streaming_backend if streaming_backend is not None else self._create_backend(model)
+    
+    def _create_backend(self, model: str) -> Any:
+        """Backend de streaming para el modelo configurado, o None para respuestas locales."""
+        if not model:
+            return None
+        if model == "fake":
+            return FakeStreamingBackend(delay=FAKE_STREAM_DELAY_SECONDS, reply=self.generate_response)
+        try:
+            return OpenAIStreamingBackend(model)
+        except ImportError:
+            logger.warning("Paquete openai no instalado; se usarán respuestas locales")
+            return None
+    
+    def stream_response(self, user_message: str, chat_history: Optional[List[Dict[str, str]]] = None) -> Iterator[str]:
+        """
+        Genera la respuesta por fragmentos a medida que el backend los produce.
+        Sin backend de streaming, la respuesta local se entrega en un único
+        fragmento; si el backend falla antes de producir nada, también.
+        """
+        if self.streaming_backend is None:
+            yield self.generate_response(user_message, chat_history)
+            return
+        produced = False
+        try:
+            for chunk in self.streaming_backend.stream(user_message, chat_history or [], self.system_prompt):
+                produced = True
+                yield chunk
+        except Exception as e:
+            logger.error(f"Error en la respuesta en streaming: {e}")
+            if not produced:
+                yield self.generate_response(user_message, chat_history)
     
     def generate_response(self, user_message: str, chat_history: Optional[List[Dict[str, str]]] = None) -> str:
         """
@@ -38,52 +129,54 @@ class OpenAIHandler:
         Returns:
             La respuesta generada.
         """
-        message_lower = user_message.lower()
+        # Una sola búsqueda resuelve el tema y sus matices (tablas "topic" y "modifier")
+        matches = chat_matcher.match(user_message)
+        topic = matches.first("topic")
         
         # Respuestas más dinámicas basadas en el contexto
-        if any(word in message_lower for word in ["hola", "buenos", "buenas", "saludos"]):
+        if topic == "greeting":
             return "¡Hola! Soy tu asistente especializado en componentes de PC. ¿En qué puedo ayudarte hoy? Puedo recomendarte CPUs, GPUs, RAM, placas base y más según tu presupuesto y necesidades."
         
-        elif any(word in message_lower for word in ["cpu", "procesador", "microprocesador"]):
-            if "gaming" in message_lower or "juegos" in message_lower:
+        elif topic == "cpu":
+            if matches.has("modifier", "gaming"):
                 return "Para gaming, te recomiendo los AMD Ryzen 7 7800X3D o Intel Core i5-13600K. El 7800X3D es excelente para juegos gracias a su cache 3D, mientras que el i5-13600K ofrece gran rendimiento por precio. ¿Tienes algún presupuesto en mente?"
-            elif "trabajo" in message_lower or "productividad" in message_lower:
+            elif matches.has("modifier", "work"):
                 return "Para trabajo y productividad, los AMD Ryzen 9 7900X o Intel Core i7-13700K son ideales. Ofrecen muchos núcleos para multitarea, renderizado y aplicaciones profesionales. ¿Qué tipo de trabajo realizas principalmente?"
             else:
                 return "Los procesadores más recomendados actualmente son los AMD Ryzen 7000 y los Intel Core de 13ª generación. Para gaming, el Ryzen 7 7800X3D es excelente. Para productividad, el Intel i9-13900K destaca. ¿Para qué uso principal necesitas el procesador?"
         
-        elif any(word in message_lower for word in ["gpu", "tarjeta", "gráfica", "video"]):
-            if "4k" in message_lower:
+        elif topic == "gpu":
+            if matches.has("modifier", "4k"):
                 return "Para gaming en 4K, necesitas una GPU potente como la RTX 4080, RTX 4090 o RX 7900 XTX. La RTX 4090 es la más potente pero costosa. La RTX 4080 ofrece excelente rendimiento 4K con mejor precio. ¿Cuál es tu presupuesto aproximado?"
-            elif "1440p" in message_lower:
+            elif matches.has("modifier", "1440p"):
                 return "Para 1440p, la RTX 4070, RTX 4070 Ti o RX 7800 XT son perfectas. La RTX 4070 ofrece gran relación calidad-precio, mientras que la RX 7800 XT compite muy bien en rendimiento puro. ¿Prefieres NVIDIA o AMD?"
             else:
                 return "Las mejores tarjetas gráficas actuales incluyen la RTX 4070 para 1440p, RTX 4080 para 4K, y RX 7800 XT como alternativa AMD. ¿A qué resolución planeas jugar y cuál es tu presupuesto?"
         
-        elif any(word in message_lower for word in ["ram", "memoria"]):
-            if "gaming" in message_lower:
+        elif topic == "ram":
+            if matches.has("modifier", "gaming"):
                 return "Para gaming, 16GB de RAM DDR4-3600 o DDR5-5200 es el estándar actual. 32GB es recomendable si también haces streaming o edición. Las marcas Corsair, G.Skill y Kingston son confiables. ¿Qué plataforma usarás (Intel o AMD)?"
             else:
                 return "La cantidad de RAM depende del uso: 16GB para gaming y uso general, 32GB para edición de video y trabajo profesional, 64GB+ para estaciones de trabajo intensivas. ¿Para qué la necesitas principalmente?"
         
-        elif any(word in message_lower for word in ["placa", "motherboard", "tarjeta madre"]):
-            if "amd" in message_lower or "ryzen" in message_lower:
+        elif topic == "motherboard":
+            if matches.has("modifier", "amd"):
                 return "Para AMD Ryzen, los chipsets B650 y X670 son los más actuales. B650 es perfecto para la mayoría de usuarios, mientras que X670 ofrece más conectividad. Marcas como ASUS, MSI y Gigabyte son confiables. ¿Qué procesador Ryzen planeas usar?"
-            elif "intel" in message_lower:
+            elif matches.has("modifier", "intel"):
                 return "Para Intel, los chipsets Z790 y B760 son los actuales. Z790 permite overclocking y tiene más funciones, B760 es más económico. ¿Qué procesador Intel tienes en mente?"
             else:
                 return "La elección de placa base depende de tu CPU. Para AMD Ryzen: B650/X670. Para Intel: B760/Z790. Considera puertos USB, slots PCIe y capacidad de expansión según tus necesidades. ¿Qué procesador usarás?"
         
-        elif any(word in message_lower for word in ["fuente", "psu", "alimentación"]):
+        elif topic == "psu":
             return "Para fuentes de alimentación, recomiendo 650W-750W para sistemas gaming, 850W+ para configuraciones high-end. Busca certificación 80+ Gold mínimo. Marcas confiables: Corsair, Seasonic, EVGA. ¿Qué GPU planeas usar?"
         
-        elif any(word in message_lower for word in ["presupuesto", "precio", "costo", "dinero"]):
+        elif topic == "budget":
             return "Puedo ayudarte según tu presupuesto:\n• 600-800€: PC básico para gaming 1080p\n• 800-1200€: Gaming 1440p sólido\n• 1200-1800€: High-end gaming/trabajo\n• 1800€+: Enthusiast/4K gaming\n¿Cuál es tu rango de presupuesto?"
         
-        elif any(word in message_lower for word in ["compatibilidad", "compatible"]):
+        elif topic == "compatibility":
             return "La compatibilidad es clave: CPU y placa base deben tener el mismo socket, RAM debe ser compatible con la placa, GPU necesita slot PCIe x16, y la fuente debe tener suficiente potencia. ¿Tienes componentes específicos en mente?"
         
-        elif any(word in message_lower for word in ["recomendación", "recomienda", "mejor", "bueno"]):
+        elif topic == "recommendation":
             return "Para darte la mejor recomendación necesito saber: ¿Para qué usarás la PC principalmente? ¿Gaming, trabajo, diseño gráfico? ¿Cuál es tu presupuesto aproximado? ¿Tienes preferencia por alguna marca?"
         
         else:
@@ -0,0 +1,284 @@
+"""
+Seguimiento de la popularidad de los componentes.
+Registra visitas, comparaciones e inclusiones en recomendaciones con
+contadores en memoria por hilo, los vuelca a la base de datos por lotes y
+mantiene un resumen de los componentes más populares (algoritmo Space-Saving)
+para servir el ranking sin recorrer la tabla.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import logging
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+from .models import Component, ComponentPopularity
+
+logger = logging.getLogger(__name__)
+
+# Tipos de evento y la columna que acumulan
+EVENT_COLUMNS = {
+    "view": "views",
+    "compare": "comparisons",
+    "recommendation": "recommendations",
+}
+
+POPULARITY_FLUSH_SECONDS = float(os.getenv("POPULARITY_FLUSH_SECONDS", "10"))
+POPULARITY_TOP_CAPACITY = int(os.getenv("POPULARITY_TOP_CAPACITY", "500"))
+
+
+class _CounterShard:
+    """Contadores de un único hilo."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts: Dict[Tuple[int, str], int] = {}
+
+
+class ShardedCounter:
+    """
+    Contadores repartidos por hilo.
+
+    Cada hilo incrementa su propio diccionario sin tomar ningún bloqueo. Al
+    recoger, los diccionarios se sustituyen por otros vacíos y los antiguos se
+    leen en la recogida siguiente, de modo que un incremento en curso durante
+    el intercambio no se pierde.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_CounterShard] = []
+        self._retired: List[Dict[Tuple[int, str], int]] = []
+        self._registry_lock = threading.Lock()
+
+    def _shard(self) -> _CounterShard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _CounterShard()
+            self._local.shard = shard
+            with self._registry_lock:
+                self._shards.append(shard)
+        return shard
+
+    def increment(self, key: Tuple[int, str], amount: int = 1) -> None:
+        counts = self._shard().counts
+        counts[key] = counts.get(key, 0) + amount
+
+    def drain(self, include_current: bool = False) -> Dict[Tuple[int, str], int]:
+        """
+        Devuelve los incrementos acumulados desde la recogida anterior.
+
+        Args:
+            include_current: lee también los contadores recién retirados (para
+                el volcado final al apagar la aplicación).
+        """
+        with self._registry_lock:
+            retired, self._retired = self._retired, []
+            for shard in self._shards:
+                counts = shard.counts
+                if counts:
+                    shard.counts = {}
+                    self._retired.append(counts)
+            if include_current:
+                retired += self._retired
+                self._retired = []
+
+        totals: Dict[Tuple[int, str], int] = {}
+        for counts in retired:
+            for key, amount in counts.items():
+                totals[key] = totals.get(key, 0) + amount
+        return totals
+
+
+class SpaceSaving:
+    """Resumen Space-Saving de los elementos más frecuentes con memoria acotada."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._counts: Dict[int, int] = {}
+        self._errors: Dict[int, int] = {}
+
+    def offer(self, key: int, count: int = 1) -> None:
+        if key in self._counts:
+            self._counts[key] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[key] = count
+            self._errors[key] = 0
+        else:
+            # Se reemplaza el elemento con menor conteo, heredando su conteo como error
+            victim = min(self._counts, key=self._counts.get)
+            floor = self._counts.pop(victim)
+            self._errors.pop(victim)
+            self._counts[key] = floor + count
+            self._errors[key] = floor
+
+    def discard(self, key: int) -> None:
+        self._counts.pop(key, None)
+        self._errors.pop(key, None)
+
+    def top(self, n: int) -> List[Tuple[int, int]]:
+        """Devuelve los n elementos con mayor conteo estimado."""
+        return heapq.nlargest(n, self._counts.items(), key=lambda item: (item[1], -item[0]))
+
+    def error(self, key: int) -> int:
+        """
+        Sobreestimación máxima del conteo de `key`: el conteo del elemento al
+        que reemplazó. El conteo real está entre conteo - error y conteo.
+        """
+        return self._errors.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class PopularityTracker:
+    """Registra eventos de popularidad y los vuelca periódicamente a la base de datos."""
+
+    def __init__(self, flush_seconds: float = POPULARITY_FLUSH_SECONDS,
+                 top_capacity: int = POPULARITY_TOP_CAPACITY):
+        self.flush_seconds = flush_seconds
+        self._counters = ShardedCounter()
+        self._top = SpaceSaving(top_capacity)
+        self._top_lock = threading.Lock()
+        self._listeners: List[Callable[[int, int], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[int, int], None]) -> None:
+        """Registra una función que recibe (component_id, incremento) en cada volcado."""
+        self._listeners.append(listener)
+
+    def record(self, event: str, component_ids: Iterable[int]) -> None:
+        """Registra un evento para cada componente indicado."""
+        if event not in EVENT_COLUMNS:
+            raise ValueError(f"Evento de popularidad desconocido: {event}")
+        for component_id in component_ids:
+            if component_id is not None:
+                self._counters.increment((component_id, event))
+
+    def forget(self, component_id: int) -> None:
+        """Elimina un componente del ranking (p. ej. tras borrarlo)."""
+        with self._top_lock:
+            self._top.discard(component_id)
+
+    def load(self, db: Session) -> None:
+        """Inicializa el ranking con los componentes más populares ya guardados."""
+        rows = (
+            db.query(ComponentPopularity.component_id, ComponentPopularity.impressions)
+            .order_by(ComponentPopularity.impressions.desc())
+            .limit(self._top.capacity)
+            .all()
+        )
+        with self._top_lock:
+            self._top = SpaceSaving(self._top.capacity)
+            for component_id, impressions in rows:
+                self._top.offer(component_id, impressions or 0)
+        for component_id, impressions in rows:
+            for listener in self._listeners:
+                listener(component_id, impressions or 0)
+
+    def flush(self, db: Session, final: bool = False) -> int:
+        """
+        Vuelca los contadores pendientes a la base de datos en una sola transacción.
+
+        Returns:
+            Número de componentes actualizados.
+        """
+        deltas = self._counters.drain(include_current=final)
+        if not deltas:
+            return 0
+
+        per_component: Dict[int, Dict[str, int]] = {}
+        for (component_id, event), amount in deltas.items():
+            per_component.setdefault(component_id, {})[EVENT_COLUMNS[event]] = amount
+
+        ids = list(per_component)
+        existing_components = {
+            component_id for (component_id,) in
+            db.query(Component.id).filter(Component.id.in_(ids))
+        }
+        rows = {
+            row.component_id: row for row in
+            db.query(ComponentPopularity).filter(ComponentPopularity.component_id.in_(ids))
+        }
+        for component_id, columns in per_component.items():
+            if component_id not in existing_components:
+                continue
+            row = rows.get(component_id)
+            if row is None:
+                row = ComponentPopularity(
+                    component_id=component_id, views=0, comparisons=0,
+                    recommendations=0, impressions=0
+                )
+                db.add(row)
+            for column, amount in columns.items():
+                setattr(row, column, (getattr(row, column) or 0) + amount)
+            row.impressions = (row.impressions or 0) + sum(columns.values())
+        db.commit()
+
+        updated = 0
+        with self._top_lock:
+            for component_id, columns in per_component.items():
+                if component_id in existing_components:
+                    self._top.offer(component_id, sum(columns.values()))
+                    updated += 1
+        for component_id, columns in per_component.items():
+            if component_id in existing_components:
+                for listener in self._listeners:
+                    listener(component_id, sum(columns.values()))
+        return updated
+
+    def top(self, limit: int) -> List[Tuple[int, int, int]]:
+        """
+        Devuelve los componentes más populares como (component_id,
+        impresiones, cota superior). El ranking usa la estimación de
+        Space-Saving, que puede incluir conteos heredados del elemento
+        reemplazado: las impresiones descuentan ese error (son exactas si el
+        componente no reemplazó a otro) y la cota superior es la estimación.
+        """
+        with self._top_lock:
+            return [
+                (component_id, count - self._top.error(component_id), count)
+                for component_id, count in self._top.top(limit)
+            ]
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Arranca el hilo de volcado periódico."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(self.flush_seconds):
+                db = session_factory()
+                try:
+                    self.flush(db)
+                except Exception as e:
+                    logger.error(f"Error volcando popularidad: {e}")
+                    db.rollback()
+                finally:
+                    db.close()
+
+        self._thread = threading.Thread(target=run, name="popularity-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, session_factory: Optional[Callable[[], Session]] = None) -> None:
+        """Detiene el hilo y, si se indica una sesión, vuelca los contadores pendientes."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if session_factory is not None:
+            db = session_factory()
+            try:
+                self.flush(db, final=True)
+            except Exception as e:
+                logger.error(f"Error en el volcado final de popularidad: {e}")
+            finally:
+                db.close()
+
+
+# Instancia global del seguimiento de popularidad
+popularity_tracker = PopularityTracker()
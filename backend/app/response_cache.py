@@ -0,0 +1,171 @@
+"""
+Caché de respuestas HTTP del catálogo con ETags fuertes.
+
+Los ETags del catálogo y de cada componente se derivan de las versiones
+guardadas en component_changes (crud.record_component_change), no de
+contadores del proceso: las escrituras de otros workers o de scripts como
+populate_db.py también los cambian. Las versiones se sincronizan con una
+consulta incremental (versiones mayores que la última vista) como mucho cada
+CATALOG_VERSION_SYNC_SECONDS, y en la siguiente petición tras una escritura
+de este proceso; ese intervalo acota cuánto puede tardar un ETag en cambiar.
+Los cuerpos JSON ya serializados se guardan en una caché LRU en memoria por
+URL y ETag.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import os
+import threading
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .models import ComponentChange
+
+# Segundos que clientes y nginx pueden reutilizar una respuesta sin revalidar
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "10"))
+# Número máximo de cuerpos serializados en memoria
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+# Vida máxima de un cuerpo en caché; acota el desfase si se lee de una réplica
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+# Cada cuánto se leen de la base de datos las versiones escritas por otros procesos
+CATALOG_VERSION_SYNC_SECONDS = float(os.getenv("CATALOG_VERSION_SYNC_SECONDS", "1"))
+
+_changes = ComponentChange.__table__
+
+class CatalogVersions:
+    """
+    Versión global del catálogo y versión de cada componente, leídas de
+    component_changes. Al primer sincronizado se toma la versión más alta como
+    base: los componentes sin cambios posteriores usan esa base como versión
+    (su contenido no ha cambiado desde entonces), así que no hace falta cargar
+    la versión de todo el catálogo en memoria.
+    """
+
+    def __init__(self, sync_seconds: float = CATALOG_VERSION_SYNC_SECONDS):
+        # Época del proceso, solo para ETags de datos propios del proceso (estadísticas)
+        self._epoch = format(time.time_ns(), "x")
+        self.sync_seconds = sync_seconds
+        self._baseline: Optional[int] = None
+        self._catalog_version = 0
+        self._component_versions: Dict[int, int] = {}
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def sync(self, db: Session) -> None:
+        """
+        Incorpora las versiones guardadas desde la última sincronización. No
+        consulta la base de datos si se sincronizó hace menos de
+        `sync_seconds` y no ha habido escrituras en este proceso. El cerrojo
+        no se mantiene durante la consulta (con AsyncSession.run_sync la
+        consulta cede el bucle de eventos a otras peticiones).
+        """
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_seconds
+        if self._baseline is None:
+            latest = db.execute(select(func.max(_changes.c.version))).scalar() or 0
+            with self._lock:
+                if self._baseline is None:
+                    self._baseline = self._catalog_version = latest
+            return
+        rows = db.execute(
+            select(_changes.c.component_id, _changes.c.version).where(_changes.c.version > self._catalog_version)
+        ).all()
+        with self._lock:
+            for component_id, version in rows:
+                if version > self._component_versions.get(component_id, 0):
+                    self._component_versions[component_id] = version
+                self._catalog_version = max(self._catalog_version, version)
+
+    def bump(self, component_id: Optional[int] = None) -> None:
+        """Escritura confirmada en este proceso: la próxima petición vuelve a sincronizar."""
+        self._next_sync = 0.0
+
+    @property
+    def catalog_version(self) -> int:
+        return self._catalog_version
+
+    def component_version(self, component_id: int) -> int:
+        return self._component_versions.get(component_id, self._baseline or 0)
+
+    def make_etag(self, *parts: Any) -> str:
+        """ETag fuerte de datos propios del proceso: época del proceso y las partes indicadas."""
+        return '"' + "-".join([self._epoch, *(str(part) for part in parts)]) + '"'
+
+    def catalog_etag(self) -> str:
+        return f'"catalog-{self._catalog_version}"'
+
+    def component_etag(self, component_id: int) -> str:
+        return f'"component-{component_id}-{self.component_version(component_id)}"'
+
+class ResponseCache:
+    """Caché LRU de cuerpos JSON serializados, indexada por clave y ETag."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, etag: str) -> Optional[bytes]:
+        """Devuelve el cuerpo guardado para `key` si corresponde al ETag actual."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag or time.monotonic() - entry[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Compara If-None-Match con el ETag (comparación débil, como exige RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={CATALOG_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+def json_response(body: bytes, etag: str) -> Response:
+    return Response(content=body, media_type="application/json", headers=cache_headers(etag))
+
+# Instancias globales
+catalog_versions = CatalogVersions()
+response_cache = ResponseCache()
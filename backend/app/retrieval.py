@@ -0,0 +1,268 @@
+"""
+Índice de recuperación de componentes para las respuestas del chatbot.
+
+Cada componente se representa con los términos de su nombre, marca, modelo,
+tipo y especificaciones (sin acentos y en minúsculas) como un vector TF-IDF en
+esquema lnc.ltc: en el documento, 1 + log(tf) normalizado a norma 1; en la
+consulta, 1 + log(tf) por la IDF del término. Los pesos de un documento no
+dependen del resto del catálogo, así que las altas no obligan a recalcular
+nada: la IDF se aplica en la consulta con las frecuencias de documento
+actuales.
+
+Las filas se guardan en una matriz dispersa CSC (una columna por término) y
+la puntuación de todo el catálogo para un mensaje es un único producto
+matriz-vector sobre las columnas de sus términos. Las altas recientes se
+acumulan en un bloque delta que se fusiona con la matriz principal al superar
+RETRIEVAL_DELTA_ROWS filas; las bajas marcan la fila como muerta y la matriz
+se compacta cuando las filas muertas son mayoría.
+"""
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+import os
+import re
+import threading
+import unicodedata
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy.orm import Session, selectinload
+
+from .models import Component
+
+# Filas nuevas que se acumulan antes de fusionarlas con la matriz principal
+RETRIEVAL_DELTA_ROWS = int(os.getenv("RETRIEVAL_DELTA_ROWS", "2048"))
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+def normalize_text(text: str) -> str:
+    """Minúsculas y sin acentos ("Gráfica" -> "grafica")."""
+    text = text.casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+def component_terms(component: Component) -> List[str]:
+    """Términos de nombre, marca, modelo, tipo y especificaciones de un componente."""
+    parts = [component.name, component.brand, component.model, component.type]
+    for spec in getattr(component, "specifications", None) or []:
+        parts.append(spec.name.replace("_", " "))
+        parts.append(spec.value)
+    return tokenize(" ".join(part for part in parts if part))
+
+class ComponentRetrievalIndex:
+    """Vectores TF-IDF del catálogo para buscar los componentes más relevantes de un mensaje."""
+
+    def __init__(self, delta_rows: int = RETRIEVAL_DELTA_ROWS, initial_capacity: int = 1024):
+        self.delta_rows = delta_rows
+        self._lock = threading.Lock()
+        self._reset(initial_capacity)
+
+    def _reset(self, capacity: int) -> None:
+        self._vocabulary: Dict[str, int] = {}
+        # Frecuencia de documento por término, solo de filas vivas
+        self._df: List[int] = []
+        # Términos de cada componente vivo, para descontarlos de _df al reemplazarlo o borrarlo
+        self._terms: Dict[int, List[int]] = {}
+        self._main = sparse.csc_matrix((0, 0), dtype=np.float32)
+        # Filas aún no fusionadas: términos y pesos ya normalizados de cada una
+        self._delta_indices: List[List[int]] = []
+        self._delta_weights: List[List[float]] = []
+        self._delta_matrix: Optional[sparse.csc_matrix] = None
+        self._capacity = max(capacity, 1)
+        self._row_ids = np.zeros(self._capacity, dtype=np.int64)
+        self._row_types = np.zeros(self._capacity, dtype=np.int32)
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._type_codes: Dict[str, int] = {}
+        self._rows: Dict[int, int] = {}
+        self._n_rows = 0
+        self._dead = 0
+
+    def _grow(self) -> None:
+        """Duplica la capacidad de los arrays por fila."""
+        extra = self._capacity
+        self._row_ids = np.concatenate([self._row_ids, np.zeros(extra, dtype=np.int64)])
+        self._row_types = np.concatenate([self._row_types, np.zeros(extra, dtype=np.int32)])
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        self._capacity += extra
+
+    def _add(self, component: Component) -> None:
+        self._remove(component.id)
+        counts = Counter(component_terms(component))
+        indices: List[int] = []
+        for term in counts:
+            term_id = self._vocabulary.get(term)
+            if term_id is None:
+                term_id = self._vocabulary[term] = len(self._df)
+                self._df.append(0)
+            self._df[term_id] += 1
+            indices.append(term_id)
+        weights = [1.0 + math.log(tf) for tf in counts.values()]
+        norm = math.sqrt(sum(weight * weight for weight in weights)) or 1.0
+        weights = [weight / norm for weight in weights]
+
+        if self._n_rows >= self._capacity:
+            self._grow()
+        row = self._n_rows
+        self._n_rows += 1
+        self._row_ids[row] = component.id
+        self._row_types[row] = self._type_codes.setdefault((component.type or "").casefold(), len(self._type_codes))
+        self._alive[row] = True
+        self._rows[component.id] = row
+        self._terms[component.id] = indices
+        self._delta_indices.append(indices)
+        self._delta_weights.append(weights)
+        self._delta_matrix = None
+        if len(self._delta_indices) >= self.delta_rows:
+            self._merge()
+
+    def _remove(self, component_id: int) -> None:
+        row = self._rows.pop(component_id, None)
+        if row is None:
+            return
+        for term_id in self._terms.pop(component_id):
+            self._df[term_id] -= 1
+        self._alive[row] = False
+        self._dead += 1
+        if self._dead > 1024 and self._dead * 2 > self._n_rows:
+            self._compact()
+
+    def _delta(self) -> sparse.csc_matrix:
+        """Bloque de filas aún no fusionadas, como matriz CSC (se cachea hasta la siguiente alta)."""
+        if self._delta_matrix is None:
+            lengths = [len(indices) for indices in self._delta_indices]
+            indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=indptr[1:])
+            total = int(indptr[-1])
+            data = np.fromiter(chain.from_iterable(self._delta_weights), dtype=np.float32, count=total)
+            indices = np.fromiter(chain.from_iterable(self._delta_indices), dtype=np.int32, count=total)
+            self._delta_matrix = sparse.csr_matrix(
+                (data, indices, indptr), shape=(len(lengths), len(self._df))
+            ).tocsc()
+        return self._delta_matrix
+
+    def _merge(self) -> None:
+        """Fusiona el bloque delta con la matriz principal."""
+        if not self._delta_indices:
+            return
+        delta = self._delta()
+        main = self._main
+        main.resize((main.shape[0], len(self._df)))
+        delta.resize((delta.shape[0], len(self._df)))
+        self._main = sparse.vstack([main, delta], format="csc", dtype=np.float32)
+        self._delta_indices, self._delta_weights, self._delta_matrix = [], [], None
+
+    def _compact(self) -> None:
+        """Elimina las filas muertas de la matriz."""
+        self._merge()
+        keep = np.flatnonzero(self._alive[:self._n_rows])
+        self._main = self._main[keep].tocsc()
+        count = len(keep)
+        self._row_ids[:count] = self._row_ids[keep]
+        self._row_types[:count] = self._row_types[keep]
+        self._alive[:count] = True
+        self._alive[count:] = False
+        self._n_rows = count
+        self._dead = 0
+        self._rows = {int(component_id): row for row, component_id in enumerate(self._row_ids[:count])}
+
+    def add_component(self, component: Component) -> None:
+        """Añade o reemplaza un componente en el índice."""
+        with self._lock:
+            self._add(component)
+
+    def add_components(self, components: Iterable[Component]) -> None:
+        """Añade o reemplaza varios componentes a la vez (escrituras masivas)."""
+        with self._lock:
+            for component in components:
+                self._add(component)
+
+    def remove_component(self, component_id: int) -> None:
+        """Elimina un componente del índice."""
+        with self._lock:
+            self._remove(component_id)
+
+    def rebuild(self, components: Iterable[Component]) -> None:
+        """Reconstruye el índice completo a partir de los componentes dados."""
+        components = list(components)
+        with self._lock:
+            self._reset(max(len(components) * 2, 1024))
+            # Todas las filas van al bloque delta y se fusionan una sola vez
+            delta_rows, self.delta_rows = self.delta_rows, len(components) + 1
+            try:
+                for component in components:
+                    self._add(component)
+            finally:
+                self.delta_rows = delta_rows
+            self._merge()
+
+    def build_from_db(self, db: Session) -> None:
+        """Carga todo el catálogo, con sus especificaciones, en el índice."""
+        self.rebuild(db.query(Component).options(selectinload(Component.specifications)).all())
+
+    def search(self, query: str, k: int = 3, component_type: Optional[str] = None) -> List[Tuple[int, float]]:
+        """
+        Devuelve hasta `k` pares (id, puntuación) con los componentes más
+        relevantes para `query`, opcionalmente solo de un tipo (sin distinguir
+        mayúsculas). Los componentes sin ningún término en común no aparecen.
+        """
+        counts = Counter(tokenize(query))
+        with self._lock:
+            documents = len(self._rows)
+            columns: List[int] = []
+            weights: List[float] = []
+            for term, tf in counts.items():
+                term_id = self._vocabulary.get(term)
+                if term_id is not None and self._df[term_id]:
+                    columns.append(term_id)
+                    weights.append((1.0 + math.log(tf)) * math.log(1.0 + documents / self._df[term_id]))
+            if not columns or not documents:
+                return []
+            vector = np.asarray(weights, dtype=np.float32)
+
+            # Un producto matriz-vector por bloque, solo sobre las columnas de la consulta
+            scores = np.zeros(self._n_rows, dtype=np.float32)
+            main_rows, main_terms = self._main.shape
+            in_main = [position for position, column in enumerate(columns) if column < main_terms]
+            if main_rows and in_main:
+                scores[:main_rows] = self._main[:, [columns[p] for p in in_main]] @ vector[in_main]
+            if self._delta_indices:
+                delta = self._delta()
+                scores[main_rows:] = delta[:, columns] @ vector
+
+            valid = self._alive[:self._n_rows].copy()
+            if component_type is not None:
+                code = self._type_codes.get(component_type.casefold())
+                if code is None:
+                    return []
+                valid &= self._row_types[:self._n_rows] == code
+            scores[~valid] = 0.0
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(int(self._row_ids[row]), float(scores[row])) for row in ranked]
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "components": len(self._rows),
+                "terms": len(self._vocabulary),
+                "main_rows": self._main.shape[0],
+                "delta_rows": len(self._delta_indices),
+                "dead_rows": self._dead,
+                "nonzeros": int(self._main.nnz) + sum(len(indices) for indices in self._delta_indices),
+            }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+# Instancia global del índice de recuperación
+retrieval_index = ComponentRetrievalIndex()
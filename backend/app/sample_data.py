@@ -2,8 +2,8 @@
 Datos de muestra para poblar la base de datos con componentes de PC.
 """
 from sqlalchemy.orm import Session
-from app.models import Component
 from app.database import get_db
+from app.seeding import import_components
 
 def create_sample_components(db: Session):
     """Crea componentes de muestra en la base de datos."""
@@ -246,16 +246,9 @@ def create_sample_components(db: Session):
     # Combinar todos los componentes
     all_components = cpus + gpus + ram_modules + storage_devices + motherboards + psus
     
-    # Crear componentes en la base de datos
-    for comp_data in all_components:
-        # Verificar si el componente ya existe
-        existing = db.query(Component).filter(Component.name == comp_data["name"]).first()
-        if not existing:
-            component = Component(**comp_data)
-            db.add(component)
-    
-    db.commit()
-    print(f"Se han creado {len(all_components)} componentes de muestra en la base de datos.")
+    # Crear o actualizar los componentes en bloque (idempotente por tipo, marca y nombre)
+    stats = import_components(db, all_components)
+    print(f"Componentes de muestra: {stats['created']} creados, {stats['updated']} actualizados.")
 
 if __name__ == "__main__":
     # Ejecutar solo si se llama directamente
@@ -36,6 +36,9 @@ class ComponentBase(BaseModel):
 class ComponentCreate(ComponentBase):
     specifications: List[SpecificationCreate] = []
 
+class ComponentBulkUpdate(ComponentCreate):
+    id: int
+
 class Component(ComponentBase):
     id: int
     specifications: List[Specification] = []
@@ -43,6 +46,36 @@ class Component(ComponentBase):
     class Config:
         orm_mode = True
 
+class ComponentSuggestion(BaseModel):
+    id: int
+    name: str
+    brand: Optional[str] = None
+    model: Optional[str] = None
+    type: Optional[str] = None
+
+class FacetSearchResult(BaseModel):
+    total: int
+    items: List[Component]
+    facets: Dict[str, Dict[str, int]]
+
+class PopularComponent(BaseModel):
+    component: Component
+    # Impresiones contadas con seguridad (mínimo garantizado)
+    impressions: int
+    # Estimación del ranking (Space-Saving): las impresiones reales no la superan
+    impressions_upper_bound: int
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: str  # created, updated, deleted, not_found, invalid, error
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkOperationResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
 class CompatibilityRequest(BaseModel):
     components: List[int]
 
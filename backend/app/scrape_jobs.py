@@ -0,0 +1,187 @@
+"""
+Cola de scraping en segundo plano para los huecos del catálogo del chat.
+
+Cuando el chat no encuentra componentes de un tipo no hace scraping dentro de
+la petición (varias peticiones HTTP con pausas de segundos): encola un trabajo
+y responde con lo que haya. Un único hilo procesa los trabajos de uno en uno;
+cada tipo se encola como mucho una vez mientras está pendiente y no se repite
+antes de SCRAPE_JOB_COOLDOWN_SECONDS. Quien necesite saber cuándo llegan los
+datos nuevos (el chat en streaming) espera con `wait` sin ocupar un hilo.
+"""
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from . import crud, schemas
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Tiempo mínimo entre dos scrapings del mismo tipo
+SCRAPE_JOB_COOLDOWN_SECONDS = float(os.getenv("SCRAPE_JOB_COOLDOWN_SECONDS", "600"))
+# Componentes que se guardan como máximo por trabajo
+SCRAPE_JOB_MAX_COMPONENTS = int(os.getenv("SCRAPE_JOB_MAX_COMPONENTS", "5"))
+
+def scrape_components(db: Session, component_type: str, max_components: int = SCRAPE_JOB_MAX_COMPONENTS) -> int:
+    """Hace scraping de una página de Newegg y guarda los componentes; devuelve cuántos se crearon."""
+    from .scraper import ComponentScraper
+
+    scraped = ComponentScraper().scrape_newegg_components(component_type, max_pages=1)[:max_components]
+    components = [
+        schemas.ComponentCreate(
+            name=data.name,
+            type=data.type,
+            brand=data.brand,
+            model=data.model,
+            price=data.price,
+            description=data.description,
+            image_url=data.image_url,
+            performance_score=data.performance_score,
+            power_consumption=data.power_consumption,
+            specifications=[
+                schemas.SpecificationCreate(name=name, value=value)
+                for name, value in (data.specifications or {}).items()
+            ]
+        )
+        for data in scraped
+    ]
+    return len(crud.bulk_create_components(db, components) or [])
+
+Waiter = Tuple[asyncio.AbstractEventLoop, "asyncio.Future[int]"]
+
+class ScrapeJobQueue:
+    """Trabajos de scraping por tipo de componente, procesados en un hilo propio."""
+
+    def __init__(self, scrape: Callable[[Session, str], int] = scrape_components,
+                 cooldown_seconds: float = SCRAPE_JOB_COOLDOWN_SECONDS):
+        self.scrape = scrape
+        self.cooldown_seconds = cooldown_seconds
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: Set[str] = set()
+        # Último trabajo terminado por tipo: (instante, componentes creados)
+        self._last_finished: Dict[str, Tuple[float, int]] = {}
+        self._waiters: Dict[str, List[Waiter]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.created_components = 0
+
+    def enqueue(self, component_type: str) -> bool:
+        """
+        Encola el scraping de un tipo. Devuelve si hay un trabajo pendiente
+        para él (recién encolado o ya en la cola); False si se hizo hace menos
+        de `cooldown_seconds`.
+        """
+        with self._lock:
+            if component_type in self._pending:
+                return True
+            finished = self._last_finished.get(component_type)
+            if finished is not None and time.monotonic() - finished[0] < self.cooldown_seconds:
+                self.skipped += 1
+                return False
+            self._pending.add(component_type)
+        self._queue.put(component_type)
+        return True
+
+    def is_pending(self, component_type: str) -> bool:
+        return component_type in self._pending
+
+    async def wait(self, component_type: str, timeout: float, since: Optional[float] = None) -> Optional[int]:
+        """
+        Espera a que termine el trabajo pendiente del tipo. Devuelve cuántos
+        componentes creó, o None si no había trabajo o se agotó el tiempo. Si
+        el trabajo ya terminó después de `since` (time.monotonic() de antes de
+        encolarlo), devuelve su resultado sin esperar.
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[int]" = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if component_type not in self._pending:
+                finished = self._last_finished.get(component_type)
+                if since is not None and finished is not None and finished[0] >= since:
+                    return finished[1]
+                return None
+            self._waiters.setdefault(component_type, []).append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(component_type, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+
+    def run_job(self, session_factory: Callable[[], Session], component_type: str) -> int:
+        """Ejecuta un trabajo y avisa a quienes esperan su resultado."""
+        created = 0
+        db = session_factory()
+        try:
+            created = self.scrape(db, component_type)
+            self.completed += 1
+            self.created_components += created
+            logger.info(f"Scraping en segundo plano de {component_type}: {created} componentes nuevos")
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Error en el scraping en segundo plano de {component_type}: {e}")
+        finally:
+            db.close()
+        with self._lock:
+            self._pending.discard(component_type)
+            self._last_finished[component_type] = (time.monotonic(), created)
+            waiters = self._waiters.pop(component_type, [])
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future, created)
+            except RuntimeError:
+                # El bucle de eventos de quien esperaba ya se cerró
+                pass
+        return created
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Arranca el hilo que procesa la cola."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run():
+            while True:
+                component_type = self._queue.get()
+                if component_type is None:
+                    break
+                self.run_job(session_factory, component_type)
+
+        self._thread = threading.Thread(target=run, name="scrape-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo cuando termina los trabajos ya encolados (espera como mucho 5 s)."""
+        if self._thread:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_metrics(self) -> Dict:
+        return {
+            "pending": sorted(self._pending),
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped_cooldown": self.skipped,
+            "created_components": self.created_components,
+            "cooldown_seconds": self.cooldown_seconds,
+        }
+
+def _resolve(future: "asyncio.Future[int]", created: int) -> None:
+    if not future.done():
+        future.set_result(created)
+
+# Instancia global de la cola de scraping
+scrape_jobs = ScrapeJobQueue()
@@ -644,7 +644,10 @@ def scrape_and_populate_database(db: Session, component_types: List[str] = None)
                     # Actualizar precio si es diferente
                     if existing.price != component_data.price and component_data.price > 0:
                         existing.price = component_data.price
+                        crud.record_component_change(db, existing.id)
+                        crud.record_price(db, existing.id, existing.price)
                         db.commit()
+                        crud._sync_component_indexes(existing)
                 
             except Exception as e:
                 logger.error(f"Error guardando componente {component_data.name}: {e}")
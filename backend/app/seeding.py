@@ -0,0 +1,167 @@
+"""
+Carga masiva e idempotente del catálogo desde fixtures (listas de dicts o
+ficheros JSONL).
+
+Los registros se procesan por lotes: se normalizan, se buscan los existentes
+por clave natural (tipo, marca, nombre) con una consulta por lote y se
+insertan o actualizan con las operaciones masivas de crud, de modo que volver
+a cargar el mismo fichero deja la base de datos en el mismo estado.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import gzip
+import logging
+import time
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import crud, models
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+SEED_BATCH_SIZE = 10000
+
+NaturalKey = Tuple[str, str, str]
+
+class SeedSpecification(NamedTuple):
+    name: str
+    value: str
+
+class SeedComponent(NamedTuple):
+    """
+    Registro normalizado con los mismos atributos que ComponentCreate. Se usa
+    una tupla en lugar del modelo Pydantic porque construir millones de
+    modelos domina el tiempo de carga; las operaciones masivas de crud leen
+    los campos por atributo y aceptan ambos.
+    """
+    name: str
+    type: str
+    brand: str
+    model: str
+    price: float
+    description: Optional[str]
+    image_url: Optional[str]
+    performance_score: Optional[float]
+    power_consumption: Optional[int]
+    specifications: List[SeedSpecification]
+
+def natural_key(component: SeedComponent) -> NaturalKey:
+    return (component.type, component.brand, component.name)
+
+def normalize_record(raw: Dict[str, Any]) -> SeedComponent:
+    """
+    Convierte un registro de fixture en SeedComponent. Acepta las
+    especificaciones como lista de {"name", "value"} o como dict, e incorpora
+    `compatibility_info` como especificaciones adicionales.
+    """
+    missing = [field for field in ("name", "type", "brand", "price") if raw.get(field) in (None, "")]
+    if missing:
+        raise ValueError(f"Faltan campos obligatorios: {', '.join(missing)}")
+
+    specs = raw.get("specifications") or []
+    if isinstance(specs, dict):
+        specs = [{"name": name, "value": value} for name, value in specs.items()]
+    spec_values = {str(spec["name"]): str(spec["value"]) for spec in specs}
+    for name, value in (raw.get("compatibility_info") or {}).items():
+        spec_values.setdefault(str(name), str(value))
+
+    performance_score = raw.get("performance_score")
+    power_consumption = raw.get("power_consumption")
+    return SeedComponent(
+        name=str(raw["name"]),
+        type=str(raw["type"]),
+        brand=str(raw["brand"]),
+        model=str(raw.get("model") or raw["name"]),
+        price=float(raw["price"]),
+        description=raw.get("description"),
+        image_url=raw.get("image_url"),
+        performance_score=float(performance_score) if performance_score is not None else None,
+        power_consumption=int(power_consumption) if power_consumption is not None else None,
+        specifications=[SeedSpecification(name, value) for name, value in spec_values.items()]
+    )
+
+def _find_existing(db: Session, keys: List[NaturalKey]) -> Dict[NaturalKey, int]:
+    """IDs de los componentes existentes con las claves naturales dadas."""
+    existing: Dict[NaturalKey, int] = {}
+    wanted = set(keys)
+    names = list({name for _, _, name in keys})
+    for chunk in crud._chunks(names):
+        rows = db.execute(
+            select(models.Component.id, models.Component.type, models.Component.brand, models.Component.name)
+            .where(models.Component.name.in_(chunk))
+        )
+        for component_id, *key in rows:
+            if tuple(key) in wanted:
+                existing[tuple(key)] = component_id
+    return existing
+
+def _batches(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def import_components(db: Session, records: Iterable[Dict[str, Any]], batch_size: int = SEED_BATCH_SIZE,
+                      progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                      sync_indexes: bool = False) -> Dict[str, Any]:
+    """
+    Inserta o actualiza (por clave natural) los componentes de `records`.
+    Cada lote se confirma en su propia transacción. Devuelve los totales de
+    registros procesados, creados, actualizados, sin cambios e inválidos.
+    """
+    stats = {"processed": 0, "created": 0, "updated": 0, "unchanged": 0, "invalid": 0, "elapsed": 0.0}
+    start = time.perf_counter()
+    for batch in _batches(records, batch_size):
+        components: Dict[NaturalKey, SeedComponent] = {}
+        for raw in batch:
+            try:
+                component = normalize_record(raw)
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                stats["invalid"] += 1
+                logger.warning(f"Registro inválido omitido: {e}")
+                continue
+            # Dentro de un lote, la última aparición de una clave prevalece
+            components[natural_key(component)] = component
+
+        existing = _find_existing(db, list(components))
+        creates = [component for key, component in components.items() if key not in existing]
+        updates = [(existing[key], component) for key, component in components.items() if key in existing]
+        # Altas y cambios del lote en una transacción; los registros idénticos a
+        # lo guardado no se reescriben ni cambian de versión
+        result = crud.bulk_upsert_components(db, creates, updates, sync_indexes=sync_indexes)
+        if result is None:
+            raise RuntimeError("Error de base de datos durante la importación; el último lote no se aplicó")
+        created, updated = result
+
+        stats["processed"] += len(batch)
+        stats["created"] += len(created)
+        stats["updated"] += len(updated)
+        stats["unchanged"] += len(updates) - len(updated)
+        stats["elapsed"] = time.perf_counter() - start
+        if progress:
+            progress(stats)
+    return stats
+
+def read_jsonl(path: str, on_position: Optional[Callable[[int], None]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lee un fichero JSONL (opcionalmente .gz) registro a registro. `on_position`
+    recibe los bytes leídos del fichero en disco, para informar del progreso.
+    """
+    with open(path, "rb") as raw_file:
+        stream = gzip.GzipFile(fileobj=raw_file) if path.endswith(".gz") else raw_file
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Línea {line_number} inválida: {e}")
+                yield {}
+            if on_position and line_number % 1000 == 0:
+                on_position(raw_file.tell())
@@ -0,0 +1,84 @@
+"""
+Contenedor de servicios compartidos de la aplicación.
+
+El chatbot (con su clasificador de intenciones y su almacén de sesiones) se
+construye una sola vez, en el arranque de la API, y se comparte entre todas
+las peticiones. El motor de recomendaciones, en cambio, se crea por petición
+con la sesión de base de datos de esa petición: un motor nunca conserva una
+sesión ya cerrada.
+Si el arranque no se ha ejecutado (p. ej. pruebas con ASGITransport), los
+servicios se construyen en el primer uso.
+"""
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from .ai_engine import AIRecommendationEngine, get_ai_engine
+from .chat_sessions import SessionStore, create_session_store
+from .chatbot import ComputerChatbot
+from .database import ReadSessionLocal, get_read_db
+from .intent_service import IntentClassifier, create_intent_classifier
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+EngineFactory = Callable[[Session], AIRecommendationEngine]
+
+class ServiceContainer:
+    """Servicios de larga duración, creados una vez por proceso."""
+
+    def __init__(self, engine_factory: EngineFactory = get_ai_engine):
+        self.engine_factory = engine_factory
+        self._chatbot: Optional[ComputerChatbot] = None
+        self.intent_classifier: Optional[IntentClassifier] = None
+        self._lock = threading.Lock()
+        self.startup_seconds: Optional[float] = None
+
+    def start(self) -> None:
+        """Construye los servicios (idempotente)."""
+        with self._lock:
+            if self._chatbot is not None:
+                return
+            start = time.perf_counter()
+            self.intent_classifier = create_intent_classifier()
+            self._chatbot = ComputerChatbot(
+                session_store=create_session_store(),
+                engine_factory=self.engine_factory,
+                intent_classifier=self.intent_classifier,
+                session_factory=ReadSessionLocal
+            )
+            self.startup_seconds = time.perf_counter() - start
+        logger.info(f"Servicios inicializados en {self.startup_seconds:.3f}s")
+
+    def stop(self) -> None:
+        with self._lock:
+            self._chatbot = None
+
+    @property
+    def chatbot(self) -> ComputerChatbot:
+        if self._chatbot is None:
+            self.start()
+        return self._chatbot
+
+    @property
+    def session_store(self) -> SessionStore:
+        return self.chatbot.session_store
+
+    def create_engine(self, db: Session) -> AIRecommendationEngine:
+        """Motor de recomendaciones ligado a la sesión de la petición actual."""
+        return self.engine_factory(db)
+
+# Instancia global del contenedor
+services = ServiceContainer()
+
+def get_chatbot() -> ComputerChatbot:
+    """Dependencia de FastAPI: el chatbot compartido."""
+    return services.chatbot
+
+def get_recommendation_engine(db: Session = Depends(get_read_db)) -> AIRecommendationEngine:
+    """Dependencia de FastAPI: un motor nuevo por petición con su sesión de lectura."""
+    return services.create_engine(db)
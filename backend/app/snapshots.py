@@ -0,0 +1,170 @@
+"""
+Instantáneas columnares del catálogo para análisis offline.
+
+Cada instantánea escribe las tablas de componentes, especificaciones e
+historial de precios con columnas tipadas en dos formatos:
+- Parquet (comprimido), pensado para descargar y leer con pandas.
+- Arrow IPC sin comprimir, que se puede abrir con memory-mapping y leer sin
+  copiar los datos a memoria.
+Las filas se leen por lotes con yield_per y se escriben lote a lote, así que
+la memoria usada no depende del tamaño del catálogo. Cada instantánea se
+escribe en un directorio temporal que se renombra al terminar, y el fichero
+LATEST apunta a la última completa.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.path.abspath(os.getenv("SNAPSHOT_DIR", "./snapshots"))
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", "3"))
+SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", "50000"))
+LATEST_FILE = "LATEST"
+
+# Esquema tipado de cada tabla exportada
+SNAPSHOT_TABLES: Dict[str, pa.Schema] = {
+    "components": pa.schema([
+        ("id", pa.int64()),
+        ("name", pa.string()),
+        ("type", pa.string()),
+        ("brand", pa.string()),
+        ("model", pa.string()),
+        ("price", pa.float64()),
+        ("description", pa.string()),
+        ("image_url", pa.string()),
+        ("performance_score", pa.float64()),
+        ("power_consumption", pa.int32()),
+    ]),
+    "specifications": pa.schema([
+        ("id", pa.int64()),
+        ("component_id", pa.int64()),
+        ("name", pa.string()),
+        ("value", pa.string()),
+    ]),
+    "price_history": pa.schema([
+        ("id", pa.int64()),
+        ("component_id", pa.int64()),
+        ("price", pa.float64()),
+        ("recorded_at", pa.timestamp("us")),
+    ]),
+}
+
+_TABLE_MODELS = {
+    "components": models.Component,
+    "specifications": models.Specification,
+    "price_history": models.PriceHistory,
+}
+
+def _iter_batches(db: Session, table_name: str, batch_size: int):
+    """Lee la tabla por lotes y los convierte en RecordBatch con el esquema tipado."""
+    schema = SNAPSHOT_TABLES[table_name]
+    table = _TABLE_MODELS[table_name].__table__
+    query = (
+        select(*(table.c[field.name] for field in schema))
+        .order_by(table.c.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for rows in db.execute(query).partitions():
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        )
+
+def _write_table(db: Session, table_name: str, directory: str, batch_size: int) -> int:
+    """Escribe una tabla en Parquet y Arrow IPC; devuelve el número de filas."""
+    schema = SNAPSHOT_TABLES[table_name]
+    rows = 0
+    parquet_path = os.path.join(directory, f"{table_name}.parquet")
+    arrow_path = os.path.join(directory, f"{table_name}.arrow")
+    with pq.ParquetWriter(parquet_path, schema, compression="zstd") as parquet_writer, \
+            pa.OSFile(arrow_path, "wb") as sink, \
+            pa.ipc.new_file(sink, schema) as arrow_writer:
+        for batch in _iter_batches(db, table_name, batch_size):
+            parquet_writer.write_batch(batch)
+            arrow_writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+def get_latest_snapshot_dir(base_dir: str = SNAPSHOT_DIR) -> Optional[str]:
+    """Directorio de la última instantánea completa, o None si no hay ninguna."""
+    try:
+        with open(os.path.join(base_dir, LATEST_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    path = os.path.join(base_dir, name)
+    return path if name and os.path.isdir(path) else None
+
+def get_latest_manifest(base_dir: str = SNAPSHOT_DIR) -> Optional[Dict]:
+    directory = get_latest_snapshot_dir(base_dir)
+    if directory is None:
+        return None
+    with open(os.path.join(directory, "manifest.json")) as f:
+        return json.load(f)
+
+def _prune_snapshots(base_dir: str, keep: int) -> None:
+    snapshots = sorted(
+        name for name in os.listdir(base_dir)
+        if name.startswith("snapshot-") and os.path.isdir(os.path.join(base_dir, name))
+    )
+    for name in snapshots[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
+
+def create_snapshot(db: Session, base_dir: str = SNAPSHOT_DIR,
+                    batch_size: int = SNAPSHOT_BATCH_SIZE, keep: int = SNAPSHOT_KEEP) -> Dict:
+    """Genera una instantánea nueva y la marca como la última; devuelve su manifiesto."""
+    os.makedirs(base_dir, exist_ok=True)
+    created_at = datetime.utcnow()
+    name = f"snapshot-{created_at.strftime('%Y%m%dT%H%M%S%f')}"
+    tmp_dir = os.path.join(base_dir, f".{name}.tmp")
+    os.makedirs(tmp_dir)
+    try:
+        tables = {
+            table_name: {"rows": _write_table(db, table_name, tmp_dir, batch_size)}
+            for table_name in SNAPSHOT_TABLES
+        }
+        manifest = {"name": name, "created_at": created_at.isoformat(), "tables": tables}
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(tmp_dir, os.path.join(base_dir, name))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Publicar la instantánea de forma atómica
+    latest_tmp = os.path.join(base_dir, f".{LATEST_FILE}.tmp")
+    with open(latest_tmp, "w") as f:
+        f.write(name)
+    os.replace(latest_tmp, os.path.join(base_dir, LATEST_FILE))
+    _prune_snapshots(base_dir, keep)
+    logger.info(f"Instantánea {name} creada: {tables}")
+    return manifest
+
+def load_snapshot_table(table_name: str, base_dir: str = SNAPSHOT_DIR,
+                        columns: Optional[List[str]] = None) -> pa.Table:
+    """
+    Abre una tabla de la última instantánea con memory-mapping (Arrow IPC):
+    los datos no se copian a memoria hasta que se usan. Para pandas:
+    load_snapshot_table("components").to_pandas()
+    """
+    if table_name not in SNAPSHOT_TABLES:
+        raise ValueError(f"Tabla desconocida: {table_name}")
+    directory = get_latest_snapshot_dir(base_dir)
+    if directory is None:
+        raise FileNotFoundError(f"No hay instantáneas en {base_dir}")
+    source = pa.memory_map(os.path.join(directory, f"{table_name}.arrow"), "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
@@ -0,0 +1,183 @@
+"""
+Estadísticas agregadas del catálogo de componentes.
+Calcula conteos, percentiles de precio y puntuaciones medias por tipo con una
+única consulta agregada y mantiene una instantánea materializada que se
+refresca tras las escrituras o periódicamente, de forma que los endpoints de
+estadísticas responden en tiempo constante.
+"""
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+import logging
+import os
+import threading
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .models import Component
+
+logger = logging.getLogger(__name__)
+
+PRICE_PERCENTILES = (25, 50, 75, 90)
+
+# Tipos que siempre aparecen en el resumen heredado de /components/stats
+DEFAULT_COMPONENT_TYPES = ['CPU', 'GPU', 'RAM', 'Motherboard', 'Storage', 'PSU', 'Case', 'Cooler']
+
+STATS_REFRESH_SECONDS = float(os.getenv("STATS_REFRESH_SECONDS", "60"))
+# Espera tras una escritura para agrupar ráfagas (p. ej. el scraper) en un solo refresco
+STATS_DEBOUNCE_SECONDS = float(os.getenv("STATS_DEBOUNCE_SECONDS", "1"))
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(float(value), 2) if value is not None else None
+
+
+def compute_component_stats(db: Session) -> Dict[str, Dict]:
+    """
+    Calcula las estadísticas por tipo de componente.
+
+    En PostgreSQL los percentiles se obtienen en la misma consulta GROUP BY con
+    percentile_cont; en otros motores (SQLite) se calculan a partir de un único
+    recorrido ordenado de precios.
+    """
+    columns = [
+        Component.type,
+        func.count(Component.id),
+        func.avg(Component.price),
+        func.min(Component.price),
+        func.max(Component.price),
+        func.avg(Component.performance_score),
+        func.avg(Component.power_consumption),
+    ]
+    use_sql_percentiles = db.get_bind().dialect.name == "postgresql"
+    if use_sql_percentiles:
+        columns += [
+            func.percentile_cont(p / 100.0).within_group(Component.price.asc())
+            for p in PRICE_PERCENTILES
+        ]
+
+    by_type: Dict[str, Dict] = {}
+    for row in db.query(*columns).group_by(Component.type).all():
+        component_type, count, avg_price, min_price, max_price, avg_score, avg_power = row[:7]
+        by_type[component_type] = {
+            "count": int(count),
+            "avg_price": _round(avg_price),
+            "min_price": _round(min_price),
+            "max_price": _round(max_price),
+            "avg_performance_score": _round(avg_score),
+            "avg_power_consumption": _round(avg_power),
+            "price_percentiles": {
+                f"p{p}": _round(value) for p, value in zip(PRICE_PERCENTILES, row[7:])
+            } if use_sql_percentiles else {},
+        }
+
+    if not use_sql_percentiles:
+        prices: Dict[str, List[float]] = {}
+        rows = (
+            db.query(Component.type, Component.price)
+            .filter(Component.price.isnot(None))
+            .order_by(Component.type, Component.price)
+        )
+        for component_type, price in rows:
+            prices.setdefault(component_type, []).append(price)
+        for component_type, values in prices.items():
+            percentiles = np.percentile(np.asarray(values), PRICE_PERCENTILES)
+            by_type[component_type]["price_percentiles"] = {
+                f"p{p}": _round(value) for p, value in zip(PRICE_PERCENTILES, percentiles)
+            }
+
+    return by_type
+
+
+class StatsService:
+    """Mantiene una instantánea de las estadísticas del catálogo."""
+
+    def __init__(self, refresh_seconds: float = STATS_REFRESH_SECONDS,
+                 debounce_seconds: float = STATS_DEBOUNCE_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.debounce_seconds = debounce_seconds
+        self._snapshot: Optional[Dict] = None
+        self._version = 0
+        self._stale = True
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, db: Session) -> Dict:
+        """Recalcula la instantánea desde la base de datos."""
+        self._stale = False
+        by_type = compute_component_stats(db)
+        with self._lock:
+            self._version += 1
+            snapshot = {
+                "version": self._version,
+                "total": sum(stats["count"] for stats in by_type.values()),
+                "by_type": by_type,
+                "generated_at": datetime.utcnow().isoformat(),
+            }
+            self._snapshot = snapshot
+        return snapshot
+
+    def mark_stale(self) -> None:
+        """Marca la instantánea como desactualizada tras una escritura del catálogo."""
+        self._stale = True
+        self._wake_event.set()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._stale
+
+    def get_snapshot(self, db: Session) -> Dict:
+        """Devuelve la instantánea actual; solo la calcula si todavía no existe."""
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self.refresh(db)
+        return snapshot
+
+    def get_type_counts(self, db: Session) -> Dict[str, int]:
+        """Resumen de conteos por tipo con el formato heredado de /components/stats."""
+        by_type = self.get_snapshot(db)["by_type"]
+        counts = {component_type: 0 for component_type in DEFAULT_COMPONENT_TYPES}
+        for component_type, stats in by_type.items():
+            counts[component_type] = stats["count"]
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Arranca el hilo que refresca la instantánea tras escrituras o por temporizador."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.is_set():
+                if self._wake_event.wait(self.refresh_seconds):
+                    self._stop_event.wait(self.debounce_seconds)
+                self._wake_event.clear()
+                if self._stop_event.is_set():
+                    break
+                db = session_factory()
+                try:
+                    self.refresh(db)
+                except Exception as e:
+                    logger.error(f"Error refrescando estadísticas: {e}")
+                finally:
+                    db.close()
+
+        self._thread = threading.Thread(target=run, name="stats-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo de refresco."""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+# Instancia global del servicio de estadísticas
+stats_service = StatsService()
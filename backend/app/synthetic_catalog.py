@@ -0,0 +1,190 @@
+"""
+Generador determinista de catálogos sintéticos para pruebas de carga.
+
+Produce registros con el mismo formato que sample_data (especificaciones en
+dict) y distribuciones realistas: mezcla de tipos y marcas, sockets y chipsets
+coherentes entre CPU y placa base, DDR4/DDR5, precios log-normales por gama y
+puntuaciones de rendimiento y consumos correlacionados con el precio. La misma
+semilla produce siempre el mismo catálogo, y los N primeros registros de un
+catálogo grande coinciden con un catálogo de tamaño N.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import math
+import random
+
+DEFAULT_SEED = 42
+
+# Proporción de cada tipo en el catálogo
+TYPE_WEIGHTS: Dict[str, float] = {
+    "cpu": 0.14, "gpu": 0.16, "ram": 0.2, "storage": 0.22, "motherboard": 0.16, "psu": 0.12,
+}
+
+BRANDS: Dict[str, List[Tuple[str, float]]] = {
+    "cpu": [("AMD", 0.5), ("Intel", 0.5)],
+    "gpu": [("NVIDIA", 0.55), ("AMD", 0.35), ("Intel", 0.1)],
+    "ram": [("Corsair", 0.3), ("G.Skill", 0.25), ("Kingston", 0.25), ("Crucial", 0.2)],
+    "storage": [("Samsung", 0.3), ("Western Digital", 0.3), ("Crucial", 0.2), ("Seagate", 0.2)],
+    "motherboard": [("ASUS", 0.35), ("MSI", 0.3), ("Gigabyte", 0.25), ("ASRock", 0.1)],
+    "psu": [("Corsair", 0.35), ("EVGA", 0.2), ("Seasonic", 0.25), ("be quiet!", 0.2)],
+}
+
+# Mediana y dispersión (sigma del logaritmo) del precio por tipo
+PRICE_DISTRIBUTION: Dict[str, Tuple[float, float]] = {
+    "cpu": (250.0, 0.55), "gpu": (450.0, 0.7), "ram": (90.0, 0.5),
+    "storage": (100.0, 0.6), "motherboard": (180.0, 0.5), "psu": (110.0, 0.4),
+}
+MIN_PRICE = 15.0
+
+# Sockets con su memoria soportada y chipsets de placa base
+SOCKETS: Dict[str, Tuple[str, List[str]]] = {
+    "AM4": ("DDR4", ["A520", "B550", "X570"]),
+    "AM5": ("DDR5", ["A620", "B650", "X670"]),
+    "LGA1200": ("DDR4", ["H510", "B560", "Z590"]),
+    "LGA1700": ("DDR4/DDR5", ["H610", "B760", "Z790"]),
+}
+CPU_SOCKETS = {"AMD": ["AM4", "AM5"], "Intel": ["LGA1200", "LGA1700"]}
+CPU_SERIES = {"AMD": ["Ryzen 3", "Ryzen 5", "Ryzen 7", "Ryzen 9"], "Intel": ["Core i3", "Core i5", "Core i7", "Core i9"]}
+GPU_SERIES = {"NVIDIA": ["RTX 3050", "RTX 4060", "RTX 4070", "RTX 4080", "RTX 4090"],
+              "AMD": ["RX 6600", "RX 7600", "RX 7700 XT", "RX 7800 XT", "RX 7900 XTX"],
+              "Intel": ["Arc A310", "Arc A380", "Arc A580", "Arc A750", "Arc A770"]}
+FORM_FACTORS = [("ATX", 0.55), ("Micro-ATX", 0.3), ("Mini-ITX", 0.15)]
+PSU_WATTAGES = [450, 550, 650, 750, 850, 1000, 1200]
+PSU_EFFICIENCIES = ["80+ Bronze", "80+ Gold", "80+ Platinum", "80+ Titanium"]
+
+def _choice(rng: random.Random, weighted: List[Tuple[Any, float]]) -> Any:
+    return rng.choices([value for value, _ in weighted], [weight for _, weight in weighted])[0]
+
+def _tier(price: float, component_type: str) -> float:
+    """Posición de 0 a 1 del precio dentro de la distribución de su tipo."""
+    median, sigma = PRICE_DISTRIBUTION[component_type]
+    z = math.log(price / median) / sigma
+    return min(max(0.5 + z / 5.0, 0.0), 1.0)
+
+def _pick(options: List[Any], tier: float) -> Any:
+    """Elige la opción correspondiente a la gama: las caras, las altas."""
+    return options[min(int(tier * len(options)), len(options) - 1)]
+
+def _cpu(rng: random.Random, brand: str, tier: float) -> Tuple[str, Dict[str, Any], int]:
+    socket = rng.choice(CPU_SOCKETS[brand])
+    series = _pick(CPU_SERIES[brand], tier)
+    cores = _pick([4, 6, 8, 12, 16, 24], tier)
+    tdp = _pick([65, 65, 105, 125, 170], tier)
+    specs = {
+        "cores": cores,
+        "threads": cores * 2,
+        "base_clock": f"{rng.uniform(2.5, 4.2):.1f} GHz",
+        "boost_clock": f"{rng.uniform(4.2, 5.8):.1f} GHz",
+        "socket": socket,
+        "tdp": f"{tdp}W",
+        "memory_support": SOCKETS[socket][0],
+    }
+    return f"{brand} {series} {rng.randint(10, 99)}00", specs, tdp
+
+def _gpu(rng: random.Random, brand: str, tier: float) -> Tuple[str, Dict[str, Any], int]:
+    series = _pick(GPU_SERIES[brand], tier)
+    memory = _pick([4, 8, 12, 16, 24], tier)
+    power = int(_pick([75, 130, 165, 220, 320, 450], tier))
+    specs = {
+        "memory": f"{memory}GB GDDR{6 if tier < 0.6 else rng.choice([6, 7])}",
+        "memory_bus": _pick(["64-bit", "128-bit", "192-bit", "256-bit", "384-bit"], tier),
+        "boost_clock": f"{rng.randint(1800, 2700)} MHz",
+        "pcie": "PCIe 4.0 x16",
+        "power_requirement": f"{power}W",
+    }
+    return f"{brand} {series}", specs, power
+
+def _ram(rng: random.Random, brand: str, tier: float) -> Tuple[str, Dict[str, Any], int]:
+    memory_type = "DDR5" if rng.random() < 0.3 + 0.5 * tier else "DDR4"
+    modules, size = _pick([(2, 4), (2, 8), (2, 16), (2, 32), (4, 32)], tier)
+    speed = _pick([3200, 3600] if memory_type == "DDR4" else [4800, 5600, 6000, 6400], tier)
+    specs = {
+        "type": memory_type,
+        "capacity": f"{modules * size}GB ({modules}x{size}GB)",
+        "speed": f"{memory_type}-{speed}",
+        "cas_latency": f"CL{rng.choice([14, 16, 18, 30, 32, 36, 40])}",
+        "form_factor": "DIMM",
+    }
+    return f"{brand} {modules * size}GB ({modules}x{size}GB) {memory_type}-{speed}", specs, 5 * modules
+
+def _storage(rng: random.Random, brand: str, tier: float) -> Tuple[str, Dict[str, Any], int]:
+    kind = _choice(rng, [("NVMe SSD", 0.55), ("SATA SSD", 0.25), ("HDD", 0.2)])
+    capacity = _pick([500, 1000, 2000, 4000] if kind != "HDD" else [1000, 2000, 4000, 8000, 16000], tier)
+    read_speed = {"NVMe SSD": rng.randint(2000, 7400), "SATA SSD": rng.randint(500, 560), "HDD": rng.randint(150, 260)}[kind]
+    specs = {
+        "type": kind,
+        "capacity": f"{capacity // 1000}TB" if capacity >= 1000 else f"{capacity}GB",
+        "interface": {"NVMe SSD": "PCIe 4.0 x4", "SATA SSD": "SATA III", "HDD": "SATA III"}[kind],
+        "read_speed": f"{read_speed} MB/s",
+    }
+    return f"{brand} {specs['capacity']} {kind}", specs, 8 if kind == "HDD" else 5
+
+def _motherboard(rng: random.Random, brand: str, tier: float) -> Tuple[str, Dict[str, Any], int]:
+    socket = rng.choice(list(SOCKETS))
+    memory_support, chipsets = SOCKETS[socket]
+    chipset = _pick(chipsets, tier)
+    memory_type = rng.choice(memory_support.split("/"))
+    form_factor = _choice(rng, FORM_FACTORS)
+    specs = {
+        "socket": socket,
+        "chipset": chipset,
+        "form_factor": form_factor,
+        "memory_type": memory_type,
+        "memory_slots": 2 if form_factor == "Mini-ITX" else 4,
+    }
+    return f"{brand} {chipset} {form_factor} {memory_type}", specs, 50
+
+def _psu(rng: random.Random, brand: str, tier: float) -> Tuple[str, Dict[str, Any], int]:
+    wattage = _pick(PSU_WATTAGES, tier)
+    efficiency = _pick(PSU_EFFICIENCIES, tier)
+    specs = {
+        "wattage": f"{wattage}W",
+        "efficiency": efficiency,
+        "modular": _pick(["No", "Semi", "Full"], tier),
+        "form_factor": "SFX" if rng.random() < 0.1 else "ATX",
+    }
+    return f"{brand} {wattage}W {efficiency}", specs, 0
+
+_BUILDERS: Dict[str, Callable[[random.Random, str, float], Tuple[str, Dict[str, Any], int]]] = {
+    "cpu": _cpu, "gpu": _gpu, "ram": _ram, "storage": _storage, "motherboard": _motherboard, "psu": _psu,
+}
+
+def generate_component(rng: random.Random, index: int, component_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Genera el registro `index` del catálogo consumiendo el generador `rng`.
+    Sin `component_type`, el tipo se elige según TYPE_WEIGHTS.
+    """
+    if component_type is None:
+        component_type = _choice(rng, list(TYPE_WEIGHTS.items()))
+    brand = _choice(rng, BRANDS[component_type])
+    median, sigma = PRICE_DISTRIBUTION[component_type]
+    price = round(max(rng.lognormvariate(math.log(median), sigma), MIN_PRICE), 2)
+    tier = _tier(price, component_type)
+    name, specs, power = _BUILDERS[component_type](rng, brand, tier)
+    score = min(max(15.0 + 80.0 * tier + rng.gauss(0, 4), 1.0), 100.0)
+    # El SKU hace única la clave natural (tipo, marca, nombre) de cada registro
+    sku = f"SYN-{index:08d}"
+    return {
+        "name": f"{name} [{sku}]",
+        "type": component_type,
+        "brand": brand,
+        "model": sku,
+        "price": price,
+        "description": f"Componente sintético {component_type} de gama {_pick(['baja', 'media', 'alta'], tier)}",
+        "performance_score": round(score, 1),
+        "power_consumption": power,
+        "specifications": specs,
+    }
+
+def generate_catalog(count: int, seed: int = DEFAULT_SEED) -> Iterator[Dict[str, Any]]:
+    """Genera `count` componentes de forma perezosa y reproducible."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield generate_component(rng, index)
+
+def generate_components_of_type(component_type: str, count: int, seed: int = DEFAULT_SEED) -> Iterator[Dict[str, Any]]:
+    """Genera `count` componentes de un solo tipo (p. ej. N por tipo en benchmarks)."""
+    if component_type not in _BUILDERS:
+        raise ValueError(f"Tipo desconocido: {component_type}")
+    rng = random.Random(f"{seed}-{component_type}")
+    for index in range(count):
+        yield generate_component(rng, index, component_type)
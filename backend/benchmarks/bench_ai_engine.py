@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks de las etapas de AIRecommendationEngine con catálogos en
+memoria de 1k, 10k y 100k componentes por tipo: distribución del presupuesto,
+ajuste por preferencias, selección por presupuesto, compatibilidad,
+puntuación de rendimiento y la recomendación completa.
+
+Los resultados (mediana y mínimo por llamada) se guardan en JSON con el
+commit actual; con --baseline se comparan con una ejecución anterior y el
+script termina con error si alguna mediana empeora más del umbral.
+
+Ejecutar desde el directorio backend:
+    python benchmarks/bench_ai_engine.py [--sizes 1000,10000,100000]
+    python benchmarks/bench_ai_engine.py --baseline benchmarks/results/ai-anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+# Agregar el directorio backend al path para importar módulos
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from app.ai_engine import AIRecommendationEngine
+from app.models import Component, Specification
+from app.synthetic_catalog import DEFAULT_SEED, TYPE_WEIGHTS, generate_components_of_type
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+BUDGET = 1500.0
+USAGE_TYPE = "gaming"
+PREFERENCES = {"prefer_performance": True, "prefer_storage": True, "prefer_silence": True}
+# El motor solo lee el socket de CPU y placa base; crear el resto de
+# especificaciones como objetos ORM multiplica el tiempo de preparación
+SOCKET_TYPES = {"cpu", "motherboard"}
+
+
+def build_catalog(per_type: int, seed: int) -> Dict[str, List[Component]]:
+    """Catálogo por tipo con objetos ORM transitorios, como el que carga async_crud."""
+    catalog: Dict[str, List[Component]] = {}
+    next_id = 1
+    for component_type in TYPE_WEIGHTS:
+        components = []
+        for record in generate_components_of_type(component_type, per_type, seed):
+            specs = record.pop("specifications")
+            component = Component(id=next_id, **record)
+            if component_type in SOCKET_TYPES:
+                component.specifications = [Specification(name="socket", value=specs["socket"])]
+            components.append(component)
+            next_id += 1
+        catalog[component_type] = components
+    return catalog
+
+
+def build_cases(engine: AIRecommendationEngine) -> Dict[str, Callable[[], Any]]:
+    distribution = engine._calculate_budget_distribution(BUDGET, USAGE_TYPE)
+    adjusted = engine._adjust_budget_for_preferences(distribution, PREFERENCES)
+    selected = engine._select_components_by_budget(adjusted)
+    return {
+        "_calculate_budget_distribution": lambda: engine._calculate_budget_distribution(BUDGET, USAGE_TYPE),
+        "_adjust_budget_for_preferences": lambda: engine._adjust_budget_for_preferences(distribution, PREFERENCES),
+        "_select_components_by_budget": lambda: engine._select_components_by_budget(adjusted),
+        "_check_compatibility": lambda: engine._check_compatibility(selected),
+        "_estimate_performance_score": lambda: engine._estimate_performance_score(selected),
+        "generate_recommendation": lambda: engine.generate_recommendation(BUDGET, USAGE_TYPE, PREFERENCES),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """Tiempo por llamada: `number` se ajusta para que cada repetición dure al menos `min_time`."""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed) if elapsed else number * 10)
+    timings = [elapsed / number] + [timer.timeit(number) / number for _ in range(repeat - 1)]
+    return {
+        "iterations": number,
+        "repeat": repeat,
+        "median_us": round(statistics.median(timings) * 1e6, 3),
+        "min_us": round(min(timings) * 1e6, 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, max_regression: float) -> bool:
+    """Compara medianas con una ejecución anterior; False si alguna empeora más del umbral."""
+    with open(baseline_path) as f:
+        previous_report = json.load(f)
+    baseline = {(r["size"], r["case"]): r for r in previous_report["results"]}
+    ok = True
+    print(f"\nComparación con {baseline_path} (commit {previous_report['meta'].get('commit')}, "
+          f"umbral {max_regression:+.0f}%)")
+    for result in results:
+        previous = baseline.get((result["size"], result["case"]))
+        if previous is None or not previous["median_us"]:
+            continue
+        change = (result["median_us"] / previous["median_us"] - 1) * 100
+        regression = change > max_regression
+        ok = ok and not regression
+        print(f"{result['size']:>8} {result['case']:<32}{previous['median_us']:>14.1f} -> "
+              f"{result['median_us']:>14.1f} µs ({change:+6.1f}%){'  REGRESIÓN' if regression else ''}")
+    return ok
+
+
+def main(args) -> int:
+    print(f"{'por tipo':>8} {'caso':<32}{'mediana µs':>14}{'mínimo µs':>14}{'iteraciones':>12}")
+    results = []
+    for size in args.sizes:
+        start = time.perf_counter()
+        engine = AIRecommendationEngine(None, catalog=build_catalog(size, args.seed))
+        print(f"# Catálogo de {size} componentes por tipo preparado en {time.perf_counter() - start:.1f}s")
+        for case, func in build_cases(engine).items():
+            stats = measure(func, args.repeat, args.min_time)
+            results.append({"size": size, "case": case, **stats})
+            print(f"{size:>8} {case:<32}{stats['median_us']:>14.1f}{stats['min_us']:>14.1f}{stats['iterations']:>12}")
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "commit": git_commit(),
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"ai-engine-{report['meta']['commit']}-{datetime.now():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en {output}")
+
+    if args.baseline and not compare(results, args.baseline, args.max_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[1000, 10000, 100000], help="Componentes por tipo, separados por comas")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por caso")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Duración mínima de cada repetición (s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", help="Fichero JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--max-regression", type=float, default=25.0,
+                        help="Empeoramiento máximo de la mediana (%%) antes de fallar")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo de la API sobre catálogos sintéticos de tamaño
+creciente. Mide latencias p50/p95/p99 y peticiones por segundo de los
+endpoints principales y guarda los resultados en JSON para compararlos entre
+ejecuciones.
+
+Modos:
+- asgi: la aplicación en el mismo proceso (httpx.ASGITransport).
+- uvicorn: arranca un servidor uvicorn por cada tamaño de catálogo.
+- --base-url: contra un servidor ya en marcha, con su catálogo actual.
+
+Ejecutar desde el directorio backend:
+    python benchmarks/bench_api.py --sizes 1000,10000 --requests 500
+    python benchmarks/bench_api.py --mode uvicorn --baseline benchmarks/results/anterior.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Usar una base de datos temporal antes de importar la aplicación
+_db_dir = tempfile.mkdtemp(prefix="computer-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+# Agregar el directorio backend al path para importar módulos
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+import httpx
+
+from app.database import SessionLocal, engine
+from app.models import Base
+from app.seeding import import_components
+from app.synthetic_catalog import DEFAULT_SEED, generate_catalog
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+USAGE_TYPES = ["gaming", "office", "design", "development"]
+# Mensajes sin palabras clave de componentes: el chat no debe lanzar scraping
+CHAT_MESSAGES = [
+    "hola, quiero montar un ordenador nuevo",
+    "¿qué presupuesto necesito para empezar?",
+    "buenas, ¿me ayudas a elegir piezas?",
+]
+CHAT_SESSIONS = 50
+
+Request = Tuple[str, str, Optional[Any]]  # método, ruta, cuerpo JSON
+
+
+def build_scenarios(ids: List[int]) -> Dict[str, Callable[[random.Random], Request]]:
+    """Generadores de peticiones por endpoint a partir de IDs existentes."""
+    return {
+        "GET /components/": lambda rng: ("GET", f"/components/?skip={rng.randrange(0, max(len(ids) - 50, 1))}&limit=50", None),
+        "GET /components/{id}": lambda rng: ("GET", f"/components/{rng.choice(ids)}", None),
+        "POST /recommendations/": lambda rng: ("POST", "/recommendations/", {
+            "budget": rng.choice([600, 1000, 1500, 2500]), "usage_type": rng.choice(USAGE_TYPES),
+        }),
+        "POST /compatibility/check/": lambda rng: ("POST", "/compatibility/check/", {"components": rng.sample(ids, 4)}),
+        "POST /components/compare": lambda rng: ("POST", "/components/compare", rng.sample(ids, 3)),
+        "POST /api/chatbot/chat": lambda rng: ("POST", "/api/chatbot/chat", {
+            "message": rng.choice(CHAT_MESSAGES), "session_id": f"bench-{rng.randrange(CHAT_SESSIONS)}",
+        }),
+    }
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_load(client: httpx.AsyncClient, make_request: Callable[[random.Random], Request],
+                   total_requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    """Lanza `total_requests` peticiones con la concurrencia indicada y mide cada una."""
+    rng = random.Random(seed)
+    requests = [make_request(rng) for _ in range(total_requests)]
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for method, path, body in pending:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "errors": errors,
+        "rps": round(total_requests / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def sample_ids(client: httpx.AsyncClient, limit: int = 1000) -> List[int]:
+    response = await client.get(f"/components/?limit={limit}")
+    response.raise_for_status()
+    return [component["id"] for component in response.json()]
+
+
+async def bench_catalog(client: httpx.AsyncClient, size: Any, args) -> List[Dict[str, Any]]:
+    """Ejecuta todos los escenarios contra el catálogo servido por `client`."""
+    ids = await sample_ids(client)
+    if len(ids) < 4:
+        raise RuntimeError("El catálogo necesita al menos 4 componentes")
+    results = []
+    for index, (endpoint, make_request) in enumerate(build_scenarios(ids).items()):
+        # Calentamiento para poblar cachés y pools de conexiones
+        await run_load(client, make_request, args.warmup, args.concurrency, args.seed + index)
+        stats = await run_load(client, make_request, args.requests, args.concurrency, args.seed + index)
+        results.append({"size": size, "endpoint": endpoint, **stats})
+        print(f"{str(size):>9} {endpoint:<28}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+              f"{stats['p99_ms']:>9.2f}{stats['rps']:>10.1f}{stats['errors']:>8}")
+    return results
+
+
+def load_catalog(size: int, loaded: int, seed: int) -> None:
+    """Añade al catálogo los registros que faltan hasta `size` (mismo generador, prefijos iguales)."""
+    if size <= loaded:
+        return
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        import_components(db, itertools.islice(generate_catalog(size, seed), loaded, None))
+        print(f"# Catálogo de {size} componentes cargado en {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn terminó durante el arranque")
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError("uvicorn no respondió a tiempo")
+
+
+async def run_asgi(args) -> List[Dict[str, Any]]:
+    from app.main import app
+    from app.response_cache import catalog_versions
+
+    results, loaded = [], 0
+    for size in args.sizes:
+        load_catalog(size, loaded, args.seed)
+        loaded = size
+        # Reconstruir los índices en memoria e invalidar las respuestas cacheadas
+        await app.router.startup()
+        catalog_versions.bump()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            results.extend(await bench_catalog(client, size, args))
+    await app.router.shutdown()
+    return results
+
+
+async def run_uvicorn(args) -> List[Dict[str, Any]]:
+    results, loaded = [], 0
+    for size in args.sizes:
+        load_catalog(size, loaded, args.seed)
+        loaded = size
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--workers", str(args.workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=dict(os.environ)
+        )
+        try:
+            await _wait_until_ready(base_url, process)
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+                results.extend(await bench_catalog(client, size, args))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    return results
+
+
+async def run_external(args) -> List[Dict[str, Any]]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        return await bench_catalog(client, "external", args)
+
+
+def compare(results: List[Dict[str, Any]], meta: Dict[str, Any], baseline_path: str, max_regression: float) -> bool:
+    """Compara con una ejecución anterior; devuelve False si algún p95 empeora más del umbral."""
+    with open(baseline_path) as f:
+        previous_report = json.load(f)
+    baseline = {(r["size"], r["endpoint"]): r for r in previous_report["results"]}
+    ok = True
+    print(f"\nComparación con {baseline_path} (umbral p95 {max_regression:+.0f}%)")
+    for key in ("mode", "concurrency", "database"):
+        if previous_report["meta"].get(key) != meta[key]:
+            print(f"⚠️  {key} distinto: {previous_report['meta'].get(key)} -> {meta[key]}; las cifras no son comparables")
+    for result in results:
+        previous = baseline.get((result["size"], result["endpoint"]))
+        if previous is None or not previous["p95_ms"]:
+            continue
+        change = (result["p95_ms"] / previous["p95_ms"] - 1) * 100
+        regression = change > max_regression
+        ok = ok and not regression
+        print(f"{str(result['size']):>9} {result['endpoint']:<28}p95 {previous['p95_ms']:>9.2f} -> "
+              f"{result['p95_ms']:>9.2f} ms ({change:+6.1f}%){'  REGRESIÓN' if regression else ''}")
+    return ok
+
+
+async def main(args) -> int:
+    if not args.base_url:
+        Base.metadata.create_all(bind=engine)
+    mode = "external" if args.base_url else args.mode
+    print(f"Modo: {mode} | peticiones: {args.requests} | concurrencia: {args.concurrency}")
+    print(f"{'tamaño':>9} {'endpoint':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'errores':>8}")
+    runner = {"asgi": run_asgi, "uvicorn": run_uvicorn, "external": run_external}[mode]
+    results = await runner(args)
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "mode": mode,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.url.get_backend_name(),
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"api-{mode}-{datetime.now():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en {output}")
+
+    if args.baseline and not compare(results, report["meta"], args.baseline, args.max_regression):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--base-url", help="Servidor ya en marcha (ignora --mode y --sizes)")
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=[1000, 10000],
+                        help="Tamaños de catálogo separados por comas, en orden creciente")
+    parser.add_argument("--requests", type=int, default=300, help="Peticiones medidas por endpoint")
+    parser.add_argument("--warmup", type=int, default=30, help="Peticiones de calentamiento por endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1, help="Procesos de uvicorn (modo uvicorn)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Timeout por petición en segundos")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", help="Fichero JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior con la que comparar")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="Empeoramiento máximo del p95 (%%) antes de fallar")
+    sys.exit(asyncio.run(main(parser.parse_args())))
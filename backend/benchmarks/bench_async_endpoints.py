@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los endpoints de lectura: handlers síncronos (SessionLocal en el
+threadpool) frente a los handlers asíncronos (AsyncSession).
+Ejecutar desde el directorio backend: python benchmarks/bench_async_endpoints.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+# Usar una base de datos temporal antes de importar la aplicación
+_db_dir = tempfile.mkdtemp(prefix="computer-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}")
+
+# Agregar el directorio backend al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.database import SessionLocal, async_engine, get_db
+from app.main import app as async_app
+from app.models import Component, Specification
+
+COMPONENT_TYPES = ["CPU", "GPU", "RAM", "Motherboard", "Storage", "PSU"]
+
+# Aplicación con los handlers síncronos originales como referencia
+sync_app = FastAPI()
+
+@sync_app.get("/components/", response_model=List[schemas.Component])
+def read_components_sync(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    return crud.get_components(db, skip=skip, limit=limit)
+
+@sync_app.get("/components/{component_id}", response_model=schemas.Component)
+def read_component_sync(component_id: int, db: Session = Depends(get_db)):
+    component = crud.get_component(db, component_id)
+    if component is None:
+        raise HTTPException(status_code=404)
+    return component
+
+
+def seed(count: int) -> None:
+    """Crea `count` componentes con dos especificaciones cada uno."""
+    db = SessionLocal()
+    try:
+        if db.query(Component).count() >= count:
+            return
+        components = [
+            Component(
+                name=f"Componente {i}", type=COMPONENT_TYPES[i % len(COMPONENT_TYPES)],
+                brand="Bench", model=f"B{i}", price=50.0 + i % 500,
+                performance_score=float(i % 100), power_consumption=i % 300
+            )
+            for i in range(count)
+        ]
+        db.add_all(components)
+        db.flush()
+        db.add_all(
+            Specification(component_id=c.id, name=name, value=value)
+            for c in components for name, value in (("socket", "AM4"), ("tdp", "65W"))
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_load(app, paths, total_requests: int, concurrency: int) -> Tuple[float, int]:
+    """
+    Lanza las peticiones con la concurrencia indicada.
+
+    Returns:
+        Peticiones por segundo y número de respuestas con error.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        queue = asyncio.Queue()
+        for i in range(total_requests):
+            queue.put_nowait(paths[i % len(paths)])
+
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                response = await client.get(path)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total_requests / (time.perf_counter() - start), errors
+
+
+async def main(args) -> None:
+    seed(args.components)
+    scenarios = {
+        "/components/?limit=20": ["/components/?limit=20"],
+        "/components/{id}": [f"/components/{i}" for i in range(1, min(args.components, 500) + 1)],
+    }
+    print(f"Componentes: {args.components} | peticiones: {args.requests} | concurrencia: {args.concurrency}")
+    print(f"{'endpoint':<24}{'sync req/s':>12}{'async req/s':>13}{'cambio':>10}{'errores sync/async':>20}")
+    for name, paths in scenarios.items():
+        # Calentamiento para poblar cachés y pools de conexiones
+        await run_load(sync_app, paths, 50, args.concurrency)
+        await run_load(async_app, paths, 50, args.concurrency)
+        sync_rps, sync_errors = await run_load(sync_app, paths, args.requests, args.concurrency)
+        async_rps, async_errors = await run_load(async_app, paths, args.requests, args.concurrency)
+        change = (async_rps / sync_rps - 1) * 100
+        print(f"{name:<24}{sync_rps:>12.1f}{async_rps:>13.1f}{change:>+9.1f}%{sync_errors:>13}/{async_errors}")
+    # Cerrar el pool asíncrono para que los hilos de aiosqlite no bloqueen la salida
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--components", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
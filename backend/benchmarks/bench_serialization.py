@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark del coste de serialización por cada 1000 componentes: ruta de
+response_model (validación Pydantic desde ORM + jsonable_encoder + json)
+frente a la ruta rápida (filas de Core codificadas con orjson y fragmentos
+cacheados concatenados).
+Ejecutar desde el directorio backend: python benchmarks/bench_serialization.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, List
+
+# Agregar el directorio backend al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.catalog_json import COMPONENT_COLUMNS, encode_components, join_fragments
+from app.models import Component, Specification
+from app.schemas import Component as ComponentSchema
+
+COMPONENT_TYPES = ["CPU", "GPU", "RAM", "Motherboard", "Storage", "PSU"]
+
+
+def build_rows(count: int, specs_per_component: int):
+    """Filas de componentes y especificaciones como las devuelve un select de Core."""
+    component_rows = [
+        {
+            "name": f"Componente {i}", "type": COMPONENT_TYPES[i % len(COMPONENT_TYPES)],
+            "brand": "Bench", "model": f"B{i}", "price": 50.0 + i % 500,
+            "description": f"Descripción del componente {i}", "image_url": None,
+            "performance_score": float(i % 100), "power_consumption": i % 300, "id": i + 1,
+        }
+        for i in range(count)
+    ]
+    spec_rows = [
+        {"name": f"spec_{j}", "value": f"valor {j}", "id": i * specs_per_component + j + 1, "component_id": i + 1}
+        for i in range(count) for j in range(specs_per_component)
+    ]
+    return component_rows, spec_rows
+
+
+def build_orm_objects(component_rows, spec_rows) -> List[Component]:
+    """Objetos ORM equivalentes (sin sesión) para la ruta de response_model."""
+    components = {row["id"]: Component(**{column: row[column] for column in COMPONENT_COLUMNS}) for row in component_rows}
+    for spec in spec_rows:
+        components[spec["component_id"]].specifications.append(Specification(**spec))
+    return list(components.values())
+
+
+def measure(fn: Callable[[], bytes], repeat: int) -> float:
+    """Mejor tiempo en milisegundos de `repeat` ejecuciones."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(args) -> None:
+    component_rows, spec_rows = build_rows(args.components, args.specs)
+    orm_objects = build_orm_objects(component_rows, spec_rows)
+    adapter = TypeAdapter(List[ComponentSchema])
+    fragments = list(encode_components(component_rows, spec_rows).values())
+
+    def response_model_path() -> bytes:
+        validated = adapter.validate_python(orm_objects, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    def orjson_cold_path() -> bytes:
+        return join_fragments(list(encode_components(component_rows, spec_rows).values()))
+
+    def fragments_warm_path() -> bytes:
+        return join_fragments(fragments)
+
+    # Las tres rutas deben producir el mismo JSON
+    reference = json.loads(response_model_path())
+    assert json.loads(orjson_cold_path()) == reference
+    assert json.loads(fragments_warm_path()) == reference
+
+    scale = 1000 / args.components
+    print(f"Componentes: {args.components} | especificaciones por componente: {args.specs}")
+    print(f"{'ruta':<36}{'ms por 1k componentes':>24}")
+    for name, fn in (
+        ("response_model (Pydantic + json)", response_model_path),
+        ("orjson desde filas de Core", orjson_cold_path),
+        ("fragmentos cacheados", fragments_warm_path),
+    ):
+        print(f"{name:<36}{measure(fn, args.repeat) * scale:>24.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--components", type=int, default=1000)
+    parser.add_argument("--specs", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Script para generar un catálogo sintético determinista (pruebas de carga y de
+escalado sin red). Carga directamente en la base de datos de DATABASE_URL
+(SQLite o PostgreSQL) o escribe un fichero JSONL para populate_db.py --from.
+Ejecutar desde el directorio backend:
+    python generate_catalog.py --count 100000 [--seed 42]
+    python generate_catalog.py --count 1000000 --output catalogo.jsonl.gz
+"""
+import argparse
+import gzip
+import sys
+import os
+import time
+
+import orjson
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine, SessionLocal
+from app.models import Base
+from app.seeding import SEED_BATCH_SIZE, import_components
+from app.synthetic_catalog import DEFAULT_SEED, generate_catalog
+
+def write_jsonl(path: str, count: int, seed: int):
+    """Escribe el catálogo en JSONL (comprimido si la ruta termina en .gz)."""
+    start = time.perf_counter()
+    with (gzip.open(path, "wb", compresslevel=6) if path.endswith(".gz") else open(path, "wb")) as f:
+        for index, record in enumerate(generate_catalog(count, seed), start=1):
+            f.write(orjson.dumps(record))
+            f.write(b"\n")
+            if index % 100000 == 0:
+                print(f"\r  {index / count * 100:5.1f}% | {index} registros", end="", flush=True)
+    print(f"\n✅ {count} componentes escritos en {path} en {time.perf_counter() - start:.1f}s.")
+
+def load_database(count: int, seed: int, batch_size: int):
+    """Genera el catálogo y lo carga por lotes con upserts por clave natural."""
+    Base.metadata.create_all(bind=engine)
+
+    def report(stats):
+        rate = stats["processed"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        print(
+            f"\r  {stats['processed'] / count * 100:5.1f}% | {stats['created']} creados | "
+            f"{stats['updated']} actualizados | {rate:,.0f} registros/s",
+            end="", flush=True
+        )
+
+    db = SessionLocal()
+    try:
+        stats = import_components(db, generate_catalog(count, seed), batch_size=batch_size, progress=report)
+        print(f"\n✅ {count} componentes cargados en {engine.url.render_as_string(hide_password=True)} "
+              f"en {stats['elapsed']:.1f}s.")
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un catálogo sintético reproducible")
+    parser.add_argument("--count", type=int, default=10000, help="Número de componentes (p. ej. 10000 a 10000000)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semilla; la misma semilla genera el mismo catálogo")
+    parser.add_argument("--output", help="Fichero JSONL (o .jsonl.gz) de salida en lugar de cargar en la base de datos")
+    parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE, help="Registros por transacción")
+    args = parser.parse_args()
+
+    if args.count <= 0:
+        parser.error("--count debe ser positivo")
+    try:
+        if args.output:
+            write_jsonl(args.output, args.count, args.seed)
+        else:
+            load_database(args.count, args.seed, args.batch_size)
+    except Exception as e:
+        print(f"\n❌ Error generando el catálogo: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
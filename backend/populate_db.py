@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """
-Script para poblar la base de datos con componentes de muestra.
-Ejecutar desde el directorio backend: python populate_db.py
+Script para poblar la base de datos con componentes de muestra o importar
+un catálogo desde un fichero JSONL (uno por línea, opcionalmente .gz).
+Ejecutar desde el directorio backend:
+    python populate_db.py
+    python populate_db.py --from catalogo.jsonl [--batch-size 10000]
 """
+import argparse
 import sys
 import os
 
@@ -12,6 +16,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app.database import engine, SessionLocal
 from app.models import Base
 from app.sample_data import create_sample_components
+from app.seeding import SEED_BATCH_SIZE, import_components, read_jsonl
 
 def init_database():
     """Inicializa la base de datos y crea las tablas."""
@@ -34,8 +39,41 @@ def populate_database():
     finally:
         db.close()
 
+def import_file(path: str, batch_size: int):
+    """Importa un catálogo JSONL con inserciones masivas y upserts por clave natural."""
+    print(f"Importando componentes desde {path}...")
+    total_bytes = os.path.getsize(path)
+    position = {"bytes": 0}
+
+    def report(stats):
+        percent = position["bytes"] / total_bytes * 100 if total_bytes else 100.0
+        rate = stats["processed"] / stats["elapsed"] if stats["elapsed"] else 0.0
+        print(
+            f"\r  {percent:5.1f}% | {stats['processed']} procesados | {stats['created']} creados | "
+            f"{stats['updated']} actualizados | {stats['unchanged']} sin cambios | {stats['invalid']} inválidos | "
+            f"{rate:,.0f} registros/s",
+            end="", flush=True
+        )
+
+    def track(bytes_read):
+        position["bytes"] = bytes_read
+
+    db = SessionLocal()
+    try:
+        stats = import_components(db, read_jsonl(path, on_position=track), batch_size=batch_size, progress=report)
+        position["bytes"] = total_bytes
+        report(stats)
+        print(f"\n✅ Importación completada en {stats['elapsed']:.1f}s.")
+    finally:
+        db.close()
+
 def main():
     """Función principal."""
+    parser = argparse.ArgumentParser(description="Inicializa y puebla la base de datos de ComPuter")
+    parser.add_argument("--from", dest="source", help="Fichero JSONL (o .jsonl.gz) con los componentes a importar")
+    parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE, help="Registros por transacción")
+    args = parser.parse_args()
+
     print("=== Inicialización de la Base de Datos ComPuter ===")
     print()
     
@@ -43,6 +81,10 @@ def main():
         # Inicializar base de datos
         init_database()
         
+        if args.source:
+            import_file(args.source, args.batch_size)
+            return
+
         # Poblar con datos de muestra
         populate_database()
         
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Script para generar una instantánea Parquet/Arrow del catálogo.
+Ejecutar desde el directorio backend: python snapshot_catalog.py [--dir ./snapshots]
+Pensado para ejecutarse periódicamente (cron) contra la réplica de lectura.
+"""
+import argparse
+import sys
+import os
+import time
+
+# Agregar el directorio actual al path para importar módulos
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import ReadSessionLocal, engine
+from app.models import Base
+from app.snapshots import SNAPSHOT_BATCH_SIZE, SNAPSHOT_DIR, SNAPSHOT_KEEP, create_snapshot
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera una instantánea columnar del catálogo")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="Directorio de las instantáneas")
+    parser.add_argument("--batch-size", type=int, default=SNAPSHOT_BATCH_SIZE)
+    parser.add_argument("--keep", type=int, default=SNAPSHOT_KEEP, help="Instantáneas a conservar")
+    args = parser.parse_args()
+
+    # Asegurar que existen las tablas (p. ej. price_history en bases antiguas)
+    Base.metadata.create_all(bind=engine)
+
+    db = ReadSessionLocal()
+    try:
+        start = time.perf_counter()
+        manifest = create_snapshot(db, base_dir=args.dir, batch_size=args.batch_size, keep=args.keep)
+        elapsed = time.perf_counter() - start
+        for table_name, info in manifest["tables"].items():
+            print(f"  {table_name}: {info['rows']} filas")
+        print(f"✅ Instantánea {manifest['name']} creada en {elapsed:.1f}s en {args.dir}")
+    except Exception as e:
+        print(f"❌ Error generando la instantánea: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import unittest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app import async_crud
+from app.database import Base
+from app.models import Component, Specification
+
+
+class TestAsyncCrud(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        async with self.session_factory() as db:
+            catalog = [
+                (1, "cpu", 150.0, 60.0, "AM5"), (2, "cpu", 320.0, 90.0, "AM5"), (3, "CPU", 500.0, 99.0, "LGA1700"),
+                (4, "gpu", 280.0, 70.0, None), (5, "gpu", 900.0, 95.0, None),
+                (6, "motherboard", 90.0, 50.0, "AM5"), (7, "ram", 60.0, 40.0, None),
+                (8, "storage", 70.0, 45.0, None), (9, "psu", 50.0, 30.0, None),
+            ]
+            for component_id, component_type, price, score, socket in catalog:
+                db.add(Component(id=component_id, name=f"C{component_id}", type=component_type, brand="B",
+                                 model=f"M{component_id}", price=price, performance_score=score))
+                db.add(Specification(component_id=component_id, name="socket" if socket else "color",
+                                     value=socket or "negro"))
+            await db.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_get_component_loads_specifications(self):
+        """get_component devuelve el componente con sus especificaciones, o None si no existe"""
+        async with self.session_factory() as db:
+            component = await async_crud.get_component(db, 2)
+            missing = await async_crud.get_component(db, 99)
+
+        self.assertEqual(component.name, "C2")
+        self.assertEqual([(s.name, s.value) for s in component.specifications], [("socket", "AM5")])
+        self.assertIsNone(missing)
+
+    async def test_list_filters(self):
+        """Paginación, filtro por tipo exacto, por variantes de mayúsculas y por IDs en orden"""
+        async with self.session_factory() as db:
+            page = await async_crud.get_components(db, skip=2, limit=3)
+            by_type = await async_crud.get_components_by_type(db, "cpu")
+            variants = await async_crud.get_components_by_type_variants(db, "cpu")
+            by_ids = await async_crud.get_components_by_ids(db, [5, 99, 1])
+
+        self.assertEqual([c.id for c in page], [3, 4, 5])
+        self.assertEqual([c.id for c in by_type], [1, 2])
+        self.assertEqual(sorted(c.id for c in variants), [1, 2, 3])
+        self.assertEqual([c.id for c in by_ids], [5, 1])
+
+    async def test_generate_recommendations_loads_only_chosen_components(self):
+        """Se elige el mejor asequible por tipo y solo los elegidos se cargan completos"""
+        async with self.session_factory() as db:
+            result = await async_crud.generate_recommendations(db, budget=1000, usage_type="gaming")
+            loaded = {obj.id for obj in db.identity_map.values() if isinstance(obj, Component)}
+
+        chosen = {c.type: c.id for c in result["components"]}
+        # cpu: 250€ (+10%) -> el de 150€; gpu: 350€ -> el de 280€
+        self.assertEqual(chosen, {"cpu": 1, "gpu": 4, "ram": 7, "storage": 8, "motherboard": 6, "psu": 9})
+        self.assertEqual(loaded, set(chosen.values()))
+        self.assertEqual(result["total_price"], 150.0 + 280.0 + 60.0 + 70.0 + 90.0 + 50.0)
+        self.assertTrue(result["compatibility_details"]["compatible"])
+        self.assertEqual([s.value for s in result["components"][0].specifications], ["AM5"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from types import SimpleNamespace
+
+from app.autocomplete import AutocompleteIndex, normalize_text
+
+
+def make_component(id, name, brand, model, type="CPU", performance_score=50.0):
+    return SimpleNamespace(
+        id=id, name=name, brand=brand, model=model,
+        type=type, performance_score=performance_score
+    )
+
+
+class TestAutocompleteIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AutocompleteIndex(max_suggestions=3)
+        self.index.rebuild([
+            make_component(1, "AMD Ryzen 5 5600X", "AMD", "Ryzen 5 5600X", performance_score=80.0),
+            make_component(2, "AMD Ryzen 7 5800X3D", "AMD", "Ryzen 7 5800X3D", performance_score=92.0),
+            make_component(3, "Intel Core i5-12400F", "Intel", "i5-12400F", performance_score=75.0),
+            make_component(4, "NVIDIA GeForce RTX 4090", "NVIDIA", "RTX 4090", type="GPU", performance_score=100.0),
+        ])
+
+    def test_normalize_text(self):
+        """Normaliza acentos, mayúsculas y puntuación"""
+        self.assertEqual(normalize_text("  Tarjeta GRÁFICA, RTX-4090 "), "tarjeta grafica rtx 4090")
+
+    def test_suggest_orders_by_weight(self):
+        """Las sugerencias se ordenan por peso descendente"""
+        ids = [s["id"] for s in self.index.suggest("ryz")]
+        self.assertEqual(ids, [2, 1])
+
+    def test_suggest_matches_inner_words_and_brand(self):
+        """Cualquier palabra del nombre y la marca sirven como prefijo"""
+        self.assertEqual([s["id"] for s in self.index.suggest("geforce")], [4])
+        self.assertEqual([s["id"] for s in self.index.suggest("intel")], [3])
+        self.assertEqual(self.index.suggest("zzz"), [])
+
+    def test_incremental_updates(self):
+        """Altas, bajas y popularidad se reflejan sin reconstruir el índice"""
+        self.index.add_component(make_component(5, "AMD Ryzen 9 7950X", "AMD", "Ryzen 9 7950X", performance_score=99.0))
+        self.assertEqual([s["id"] for s in self.index.suggest("ryzen")], [5, 2, 1])
+
+        self.index.remove_component(2)
+        self.assertEqual([s["id"] for s in self.index.suggest("ryzen")], [5, 1])
+
+        self.index.add_popularity(1, 50.0)
+        self.assertEqual([s["id"] for s in self.index.suggest("ryzen")], [1, 5])
+
+        self.index.add_component(make_component(1, "Intel Core i3-12100", "Intel", "i3-12100", performance_score=60.0))
+        self.assertEqual([s["id"] for s in self.index.suggest("ryzen")], [5])
+        self.assertEqual([s["id"] for s in self.index.suggest("core")], [1, 3])
+
+if __name__ == "__main__":
+    unittest.main()
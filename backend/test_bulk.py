@@ -0,0 +1,149 @@
+import unittest
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas
+from app.api.endpoints import bulk
+from app.database import Base, get_write_db
+
+
+def make_component(name, price=100.0, specs=(("socket", "AM4"),)):
+    return schemas.ComponentCreate(
+        name=name, type="CPU", brand="AMD", model=name, price=price,
+        specifications=[schemas.SpecificationCreate(name=n, value=v) for n, v in specs]
+    )
+
+
+class TestBulkComponents(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_bulk_create_returns_ids_in_order(self):
+        """Los IDs devueltos corresponden al orden de entrada, con especificaciones y versiones"""
+        ids = crud.bulk_create_components(self.db, [make_component(f"C{i}") for i in range(5)])
+
+        names = dict(self.db.query(models.Component.id, models.Component.name).all())
+        self.assertEqual([names[component_id] for component_id in ids], [f"C{i}" for i in range(5)])
+        self.assertEqual(self.db.query(models.Specification).count(), 5)
+        self.assertEqual(self.db.query(models.ComponentChange).count(), 5)
+        self.assertEqual(self.db.query(models.PriceHistory).count(), 5)
+
+    def test_bulk_update_and_delete(self):
+        """Se actualizan y borran los existentes; los inexistentes se omiten"""
+        ids = crud.bulk_create_components(self.db, [make_component("A"), make_component("B")])
+
+        updated = crud.bulk_update_components(self.db, [
+            (ids[0], make_component("A2", price=150.0, specs=(("socket", "AM5"), ("cores", "8")))),
+            (9999, make_component("X")),
+        ])
+        self.assertEqual(updated, [ids[0]])
+        component = self.db.get(models.Component, ids[0])
+        self.assertEqual((component.name, component.price), ("A2", 150.0))
+        self.assertEqual(sorted(s.value for s in component.specifications), ["8", "AM5"])
+        self.assertEqual(self.db.query(models.PriceHistory).filter_by(component_id=ids[0]).count(), 2)
+
+        deleted = crud.bulk_delete_components(self.db, [ids[1], 9999])
+        self.assertEqual(deleted, [ids[1]])
+        self.assertIsNone(self.db.get(models.Component, ids[1]))
+        self.assertTrue(self.db.get(models.ComponentChange, ids[1]).deleted)
+
+
+class TestBulkEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        # StaticPool: el endpoint escribe desde el threadpool sobre la misma base en memoria
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.addCleanup(engine.dispose)
+        self.session_factory = sessionmaker(bind=engine)
+
+        def override_get_write_db():
+            db = self.session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(bulk.router, prefix="/components/bulk")
+        app.dependency_overrides[get_write_db] = override_get_write_db
+        self.client = TestClient(app)
+
+    def item(self, name, **extra):
+        return {"name": name, "type": "CPU", "brand": "AMD", "model": name, "price": 100.0,
+                "specifications": [{"name": "socket", "value": "AM4"}], **extra}
+
+    def statuses(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [(result["index"], result["status"]) for result in response.json()["results"]]
+
+    def test_create_from_json_array(self):
+        """Un array JSON crea los válidos e informa los inválidos por índice"""
+        response = self.client.post("/components/bulk", json=[self.item("A"), {"name": "sin tipo"}, self.item("B")])
+
+        self.assertEqual(self.statuses(response), [(0, "created"), (1, "invalid"), (2, "created")])
+        body = response.json()
+        self.assertEqual((body["succeeded"], body["failed"]), (2, 1))
+        self.assertIn("type", body["results"][1]["error"])
+        with self.session_factory() as db:
+            names = dict(db.query(models.Component.id, models.Component.name).all())
+        self.assertEqual([names[body["results"][i]["id"]] for i in (0, 2)], ["A", "B"])
+
+    def test_create_from_ndjson_split_across_chunks(self):
+        """Las líneas NDJSON partidas entre trozos se recomponen; una línea mal formada es inválida"""
+        payload = b"\n".join([orjson.dumps(self.item("A")), b"{no es json", orjson.dumps(self.item("B"))])
+        # Trozos pequeños que cortan las líneas por la mitad; sin salto de línea final
+        chunks = [payload[i:i + 7] for i in range(0, len(payload), 7)]
+
+        response = self.client.post("/components/bulk", content=iter(chunks),
+                                    headers={"Content-Type": "application/x-ndjson"})
+
+        self.assertEqual(self.statuses(response), [(0, "created"), (1, "invalid"), (2, "created")])
+        self.assertIn("JSON inválido", response.json()["results"][1]["error"])
+        with self.session_factory() as db:
+            self.assertEqual(sorted(name for name, in db.query(models.Component.name)), ["A", "B"])
+
+    def test_update_duplicate_and_missing_ids(self):
+        """Un ID repetido en la petición es inválido y uno inexistente queda como not_found"""
+        with self.session_factory() as db:
+            component_id, = crud.bulk_create_components(db, [make_component("A")])
+
+        response = self.client.put("/components/bulk", json=[
+            self.item("A2", id=component_id, price=150.0),
+            self.item("A3", id=component_id),
+            self.item("X", id=9999),
+        ])
+
+        self.assertEqual(self.statuses(response), [(0, "updated"), (1, "invalid"), (2, "not_found")])
+        self.assertEqual(response.json()["results"][1]["error"], "ID duplicado en la petición")
+        with self.session_factory() as db:
+            component = db.get(models.Component, component_id)
+            self.assertEqual((component.name, component.price), ("A2", 150.0))
+
+    def test_delete_ndjson_ids_and_objects(self):
+        """El borrado acepta IDs sueltos u objetos y marca los inexistentes como not_found"""
+        with self.session_factory() as db:
+            ids = crud.bulk_create_components(db, [make_component("A"), make_component("B")])
+
+        payload = f'{ids[0]}\n{{"id": {ids[1]}}}\n9999\n"x"\n'.encode()
+        response = self.client.request("DELETE", "/components/bulk", content=payload,
+                                       headers={"Content-Type": "application/x-ndjson"})
+
+        self.assertEqual(self.statuses(response), [(0, "deleted"), (1, "deleted"), (2, "not_found"), (3, "invalid")])
+        with self.session_factory() as db:
+            self.assertEqual(db.query(models.Component).count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
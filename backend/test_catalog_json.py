@@ -0,0 +1,41 @@
+import json
+import unittest
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.catalog_json import encode_components, join_fragments
+from app.schemas import Component
+
+
+class TestCatalogJSON(unittest.TestCase):
+
+    def test_fragments_match_response_model(self):
+        """Los fragmentos concatenados equivalen a la serialización de schemas.Component"""
+        components = [
+            {"name": "Ryzen 5", "type": "CPU", "brand": "AMD", "model": "5600X", "price": 199.0,
+             "description": None, "image_url": None, "performance_score": 80.0,
+             "power_consumption": 65, "id": 1},
+            {"name": "RTX 3060", "type": "GPU", "brand": "NVIDIA", "model": "3060", "price": 329.9,
+             "description": "GPU", "image_url": None, "performance_score": None,
+             "power_consumption": None, "id": 2},
+        ]
+        specifications = [
+            {"name": "socket", "value": "AM4", "id": 1, "component_id": 1},
+            {"name": "vram", "value": "12GB", "id": 2, "component_id": 2},
+        ]
+
+        fragments = encode_components(components, specifications)
+        body = join_fragments([fragments[2], fragments[1]])
+
+        adapter = TypeAdapter(List[Component])
+        expected = adapter.dump_python(adapter.validate_python(
+            [{**components[1], "specifications": [specifications[1]]},
+             {**components[0], "specifications": [specifications[0]]}]
+        ))
+        self.assertEqual(json.loads(body), expected)
+        self.assertEqual(join_fragments([]), b"[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.chat_sessions import DatabaseSessionStore, MemorySessionStore, SessionStore
+from app.chatbot import ChatMessage, ChatSession, ComputerChatbot
+from app.database import Base
+from app.models import ChatSessionRecord
+
+
+def make_session(session_id, messages=0):
+    return ChatSession(
+        session_id=session_id,
+        messages=[ChatMessage(role="user", content=f"mensaje {i}") for i in range(messages)]
+    )
+
+
+class TestMemorySessionStore(unittest.TestCase):
+
+    def test_lru_eviction_and_message_cap(self):
+        """Se expulsa la sesión menos usada y el historial se recorta"""
+        store = MemorySessionStore(max_sessions=2, ttl_seconds=60, max_messages=3)
+        store.save(make_session("a", messages=5))
+        store.save(make_session("b"))
+        store.get("a")
+        store.save(make_session("c"))
+
+        self.assertIsNone(store.get("b"))
+        self.assertEqual([m.content for m in store.get("a").messages], ["mensaje 2", "mensaje 3", "mensaje 4"])
+        metrics = store.get_metrics()
+        self.assertEqual((metrics["sessions"], metrics["lru_evictions"], metrics["trimmed_messages"]), (2, 1, 2))
+
+    def test_ttl_expiry(self):
+        """Las sesiones inactivas más allá del TTL desaparecen"""
+        store = MemorySessionStore(ttl_seconds=0)
+        store.save(make_session("a"))
+
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.get_metrics()["expired_evictions"], 1)
+
+    def test_get_returns_independent_copies(self):
+        """Los cambios sobre una sesión leída no se ven hasta guardarla"""
+        store = MemorySessionStore()
+        store.save(make_session("a", messages=1))
+        first, second = store.get("a"), store.get("a")
+
+        first.messages.append(ChatMessage(role="assistant", content="respuesta"))
+        first.context["clave"] = "valor"
+        self.assertEqual((len(second.messages), second.context), (1, {}))
+        self.assertEqual(len(store.get("a").messages), 1)
+
+        store.save(first)
+        first.messages.clear()
+        self.assertEqual(len(store.get("a").messages), 2)
+
+    def test_session_store_is_abstract(self):
+        """Un almacén sin los métodos de la interfaz no se puede instanciar"""
+        class IncompleteStore(SessionStore):
+            def get(self, session_id):
+                return None
+
+        with self.assertRaises(TypeError):
+            IncompleteStore()
+
+
+class TestDatabaseSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        self.session_factory = sessionmaker(bind=engine)
+        self.store = DatabaseSessionStore(self.session_factory, ttl_seconds=3600, max_messages=4)
+
+    def test_sessions_survive_new_store(self):
+        """Otra instancia (otro worker o un reinicio) lee la misma sesión"""
+        chatbot = ComputerChatbot(session_store=self.store)
+        chatbot.process_message("s1", "hola")
+        chatbot.process_message("s1", "¿qué presupuesto necesito?")
+        chatbot.process_message("s1", "gracias")
+
+        other = DatabaseSessionStore(self.session_factory, max_messages=4)
+        session = other.get("s1")
+        self.assertEqual(len(session.messages), 4)
+        self.assertEqual(session.messages[-2].content, "gracias")
+
+    def test_purge_expired(self):
+        """Las sesiones caducadas se borran de la tabla"""
+        self.store.save(make_session("viejo"))
+        self.store.save(make_session("nuevo"))
+        db = self.session_factory()
+        db.get(ChatSessionRecord, "viejo").updated_at = datetime.utcnow() - timedelta(hours=2)
+        db.commit()
+        db.close()
+
+        self.assertEqual(self.store.purge_expired(), 1)
+        self.assertIsNone(self.store.get("viejo"))
+        self.assertTrue(self.store.delete("nuevo"))
+        self.assertEqual(self.store.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
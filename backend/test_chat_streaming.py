@@ -0,0 +1,90 @@
+import contextlib
+import json
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints import chatbot as chatbot_endpoints
+from app.chat_sessions import MemorySessionStore
+from app.chatbot import ComputerChatbot
+from app.database import get_async_read_session_factory
+from app.openai_integration import FakeStreamingBackend, OpenAIHandler, openai_handler
+from app.services import get_chatbot
+
+
+class FailingBackend:
+    def stream(self, user_message, chat_history, system_prompt):
+        raise RuntimeError("sin conexión")
+        yield
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestChatStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.original_backend = openai_handler.streaming_backend
+        openai_handler.streaming_backend = FakeStreamingBackend(["Hola", ", ", "mundo"])
+        self.chatbot = ComputerChatbot(session_store=MemorySessionStore())
+        app = FastAPI()
+        app.include_router(chatbot_endpoints.router, prefix="/api/chatbot")
+        app.dependency_overrides[get_chatbot] = lambda: self.chatbot
+        app.dependency_overrides[get_async_read_session_factory] = lambda: contextlib.nullcontext
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        openai_handler.streaming_backend = self.original_backend
+
+    def test_handler_falls_back_to_local_reply(self):
+        """Sin backend o si falla antes del primer fragmento se usa la respuesta local"""
+        local = OpenAIHandler(model="")
+        failing = OpenAIHandler(model="", streaming_backend=FailingBackend())
+
+        self.assertEqual(list(local.stream_response("hola")), [local.generate_response("hola")])
+        self.assertEqual(list(failing.stream_response("hola")), [local.generate_response("hola")])
+
+    def test_stream_saves_session_once_finished(self):
+        """La sesión guarda el mensaje y la respuesta completa al terminar el stream"""
+        chunks = list(self.chatbot.stream_message("s1", "hola"))
+        session = self.chatbot.get_session("s1")
+
+        self.assertEqual(chunks, ["Hola", ", ", "mundo"])
+        self.assertEqual([m.content for m in session.messages], ["hola", "Hola, mundo"])
+
+    def test_sse_events(self):
+        """El endpoint SSE envía la sesión, cada fragmento y el final"""
+        response = self.client.post("/api/chatbot/chat/stream", json={"message": "hola", "session_id": "s2"})
+
+        self.assertEqual(response.headers["content-type"].split(";")[0], "text/event-stream")
+        self.assertEqual(parse_sse(response.text), [
+            ("session", {"type": "session", "session_id": "s2"}),
+            ("chunk", {"type": "chunk", "text": "Hola"}),
+            ("chunk", {"type": "chunk", "text": ", "}),
+            ("chunk", {"type": "chunk", "text": "mundo"}),
+            ("done", {"type": "done"}),
+        ])
+
+    def test_websocket_events(self):
+        """El WebSocket envía los mismos eventos y admite varios mensajes por conexión"""
+        with self.client.websocket_connect("/api/chatbot/ws") as websocket:
+            for message in ("hola", "gracias"):
+                websocket.send_json({"message": message, "session_id": "s3"})
+                events = [websocket.receive_json()]
+                while events[-1]["type"] != "done":
+                    events.append(websocket.receive_json())
+                self.assertEqual("".join(e["text"] for e in events if e["type"] == "chunk"), "Hola, mundo")
+            websocket.send_json({"session_id": "s3"})
+            self.assertEqual(websocket.receive_json()["type"], "error")
+
+        self.assertEqual(len(self.chatbot.get_session("s3").messages), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app import database
+from app.database import (
+    PRIMARY_STICKY_COOKIE, READ_YOUR_WRITES_SECONDS, SQLITE_BUSY_TIMEOUT_MS,
+    configure_sqlite_pragmas, get_engine_options, get_pool_metrics, get_read_db, get_write_db, mark_primary_sticky,
+)
+
+
+class TestReadWriteRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.primary, self.replica = MagicMock(name="primary"), MagicMock(name="replica")
+        # Motor de lectura distinto del principal, como con réplica o SQLite en fichero
+        for name, value in (("SessionLocal", lambda: self.primary), ("ReadSessionLocal", lambda: self.replica),
+                            ("read_engine", object())):
+            patcher = patch.object(database, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        app = FastAPI()
+
+        @app.post("/write")
+        def write(response: Response, db=Depends(get_write_db)):
+            mark_primary_sticky(response)
+            return {"primary": db is self.primary}
+
+        @app.get("/read")
+        def read(db=Depends(get_read_db)):
+            return {"primary": db is self.primary}
+
+        self.client = TestClient(app)
+
+    def test_write_sets_cookie_and_pins_reads_to_primary(self):
+        """Una escritura fija la cookie y las lecturas siguientes van al principal"""
+        self.assertFalse(self.client.get("/read").json()["primary"])
+
+        response = self.client.post("/write")
+        self.assertTrue(response.json()["primary"])
+        until = float(response.cookies[PRIMARY_STICKY_COOKIE])
+        self.assertAlmostEqual(until, time.time() + READ_YOUR_WRITES_SECONDS, delta=2)
+        self.assertIn(f"Max-Age={READ_YOUR_WRITES_SECONDS}", response.headers["set-cookie"])
+
+        self.assertTrue(self.client.get("/read").json()["primary"])
+        self.primary.close.assert_called()
+
+    def test_expired_or_malformed_cookie_reads_from_replica(self):
+        """Una cookie caducada o mal formada no fija la lectura al principal"""
+        for value in (f"{time.time() - 1:.3f}", "no-es-un-numero", ""):
+            self.client.cookies.set(PRIMARY_STICKY_COOKIE, value)
+            self.assertFalse(self.client.get("/read").json()["primary"], value)
+        self.replica.close.assert_called()
+
+    def test_without_separate_read_engine_reads_share_primary_engine(self):
+        """Sin motor de lectura propio la cookie no cambia nada"""
+        with patch.object(database, "read_engine", database.engine):
+            self.client.cookies.set(PRIMARY_STICKY_COOKIE, f"{time.time() + 60:.3f}")
+            self.assertFalse(self.client.get("/read").json()["primary"])
+
+
+class TestSQLiteEngines(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.url = f"sqlite:///{os.path.join(directory.name, 'test.db')}"
+        self.write_engine = create_engine(self.url, **get_engine_options(self.url))
+        self.read_engine = create_engine(self.url, **get_engine_options(self.url))
+        configure_sqlite_pragmas(self.write_engine)
+        configure_sqlite_pragmas(self.read_engine, read_only=True)
+        self.addCleanup(self.write_engine.dispose)
+        self.addCleanup(self.read_engine.dispose)
+
+    def pragma(self, db_engine, name):
+        with db_engine.connect() as connection:
+            return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_pragmas_applied_on_connect(self):
+        """Cada conexión nueva usa WAL y busy_timeout; solo las de lectura son query_only"""
+        for db_engine in (self.write_engine, self.read_engine):
+            self.assertEqual(self.pragma(db_engine, "journal_mode"), "wal")
+            self.assertEqual(self.pragma(db_engine, "busy_timeout"), SQLITE_BUSY_TIMEOUT_MS)
+        self.assertEqual(self.pragma(self.write_engine, "query_only"), 0)
+        self.assertEqual(self.pragma(self.read_engine, "query_only"), 1)
+
+        with self.write_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        with self.assertRaises(OperationalError):
+            with self.read_engine.begin() as connection:
+                connection.execute(text("INSERT INTO t VALUES (1)"))
+
+    def test_pool_metrics(self):
+        """Las métricas reflejan el tamaño configurado y las conexiones prestadas de cada pool"""
+        with patch.object(database, "engine", self.write_engine), \
+                patch.object(database, "read_engine", self.read_engine), \
+                patch.object(database, "_READ_URL", self.url):
+            with self.read_engine.connect():
+                metrics = get_pool_metrics()
+
+        self.assertEqual(set(metrics), {"sync", "async", "sync_read", "async_read"})
+        self.assertEqual(metrics["sync"]["pool_class"], "QueuePool")
+        self.assertEqual(metrics["sync"]["size"], database.DB_POOL_SIZE)
+        self.assertEqual(metrics["sync"]["checkedout"], 0)
+        self.assertEqual(metrics["sync_read"]["checkedout"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.ai_engine import AIRecommendationEngine
+from app.chat_sessions import MemorySessionStore
+from app.chatbot import ComputerChatbot
+from app.dialogue_state import DialogueState, parse_budget
+
+
+class TestDialogueState(unittest.TestCase):
+
+    def test_parse_budget(self):
+        """Se reconocen cantidades con moneda o tras "presupuesto", no tamaños ni resoluciones"""
+        self.assertEqual(parse_budget("tengo 1.200€ para gastar")[0], 1200.0)
+        self.assertEqual(parse_budget("unos 1.5k euros")[0], 1500.0)
+        self.assertEqual(parse_budget("mi presupuesto es de 900.")[0], 900.0)
+        self.assertIsNone(parse_budget("una ram de 80€")[0])
+        self.assertIsNone(parse_budget("hasta 1440p con 16gb")[0])
+
+    def test_part_prices_are_not_budgets(self):
+        """Una cantidad que acompaña a un componente es su precio, salvo si se dice que es el presupuesto"""
+        self.assertIsNone(parse_budget("una ram de 80€ y una gpu de 500€")[0])
+        self.assertIsNone(parse_budget("un core i7 por 400€")[0])
+        self.assertEqual(parse_budget("tengo 1000€ y quiero una rtx 4070 de 600€")[0], 1000.0)
+        self.assertEqual(parse_budget("para videojuegos 1000€")[0], 1000.0)
+        self.assertEqual(parse_budget("mi presupuesto para la gpu es de 500€")[0], 500.0)
+
+        state = DialogueState()
+        state.update("Es para gaming, una RAM de 80€ y una GPU de 500€")
+        self.assertIsNone(state.budget)
+        self.assertFalse(state.ready)
+
+    def test_slots_accumulate_across_messages(self):
+        """Cada mensaje añade sus slots sin perder los anteriores"""
+        state = DialogueState()
+        self.assertTrue(state.update("Quiero un PC para jugar en 4K"))
+        self.assertTrue(state.update("Ya tengo una RTX 3060 y la placa base"))
+        self.assertFalse(state.ready)
+        self.assertTrue(state.update("Mi presupuesto es de 1500€"))
+        self.assertFalse(state.update("¿qué es una cpu?"))
+
+        self.assertEqual(state.budget, 1500.0)
+        self.assertEqual(state.usage_type, "gaming")
+        self.assertEqual(state.resolution, "4k")
+        # La RTX es una pieza que ya tiene, no una marca preferida
+        self.assertIsNone(state.brand)
+        self.assertEqual(set(state.chosen_parts), {"gpu", "motherboard"})
+        self.assertTrue(state.needs_recommendation)
+
+    def test_brand_does_not_trigger_new_recommendation(self):
+        """La marca se recuerda, pero no cambia la huella de la recomendación"""
+        state = DialogueState(budget=1000.0, usage_type="gaming")
+        state.recommended = state.signature()
+
+        self.assertTrue(state.update("prefiero AMD"))
+        self.assertEqual(state.brand, "AMD")
+        self.assertFalse(state.needs_recommendation)
+
+
+class TestChatbotRecommendation(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = MagicMock()
+        self.engine._calculate_budget_distribution.return_value = {"cpu": 400.0, "gpu": 600.0}
+        self.engine._adjust_budget_for_preferences.side_effect = lambda distribution, preferences: distribution
+        self.engine._select_components_by_budget.return_value = {
+            "cpu": SimpleNamespace(name="AMD Ryzen 5 7600", price=229.0)
+        }
+        self.sessions = MagicMock()
+        self.chatbot = ComputerChatbot(
+            session_store=MemorySessionStore(),
+            engine_factory=lambda db: self.engine,
+            session_factory=lambda: self.sessions
+        )
+
+    def test_recommends_once_slots_are_filled(self):
+        """Con presupuesto y uso la respuesta es la configuración del motor, una sola vez"""
+        self.chatbot.process_message("s1", "Es para gaming")
+        self.engine._select_components_by_budget.assert_not_called()
+
+        response = self.chatbot.process_message("s1", "Tengo 1000€ y ya tengo la gpu")
+        self.assertIn("AMD Ryzen 5 7600", response)
+        # El presupuesto de la GPU que ya tiene se reparte entre el resto
+        self.engine._select_components_by_budget.assert_called_once_with({"cpu": 1000.0})
+        self.sessions.close.assert_called_once()
+
+        self.chatbot.process_message("s1", "gracias")
+        self.engine._select_components_by_budget.assert_called_once()
+        context = self.chatbot.get_session("s1").context
+        self.assertEqual(context["dialogue_state"]["budget"], 1000.0)
+
+    def test_workstation_uses_design_weights(self):
+        """Una conversación de diseño pide al motor el reparto de "design", no el de gaming"""
+        engine = AIRecommendationEngine(None, catalog={
+            "cpu": [SimpleNamespace(name="AMD Ryzen 9 7900", price=290.0, performance_score=90.0)]
+        })
+        engine._select_components_by_budget = MagicMock(wraps=engine._select_components_by_budget)
+        chatbot = ComputerChatbot(
+            session_store=MemorySessionStore(),
+            engine_factory=lambda db: engine,
+            session_factory=lambda: self.sessions
+        )
+
+        response = chatbot.process_message("s3", "Es para diseño y renderizado, tengo 1000€")
+
+        distribution = engine._select_components_by_budget.call_args.args[0]
+        self.assertEqual(distribution, {t: 1000.0 * w for t, w in engine.usage_weights["design"].items()})
+        self.assertIn("AMD Ryzen 9 7900", response)
+
+    def test_intent_classifier_fills_usage(self):
+        """El chat en vivo pasa por el clasificador (con caché) y una intención de uso completa el slot"""
+        classifier = MagicMock(available=True, version=1)
+        classifier.predict_intent.return_value = {"intent": "gaming_usage", "confidence": 0.9}
+        chatbot = ComputerChatbot(session_store=MemorySessionStore(), intent_classifier=classifier)
+
+        chatbot.process_message("s2", "Lo quiero para Fortnite")
+        chatbot.process_message("s2", "Lo quiero para Fortnite!")
+
+        classifier.predict_intent.assert_called_once_with("lo quiero para fortnite")
+        state = chatbot.get_session("s2").context["dialogue_state"]
+        self.assertEqual((state["intent"], state["usage_type"]), ("gaming_usage", "gaming"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app import crud
+from app.export import begin_export, export_response, stream_export
+from app.models import CatalogVersionCounter, Component, ComponentChange, Specification
+
+
+class TestCatalogExport(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.session_factory = sessionmaker(bind=engine)
+        db = self.session_factory()
+        for i in range(1, 4):
+            db.add(Component(id=i, name=f"C{i}", type="CPU", brand="AMD", model=f"M{i}", price=100.0 * i))
+            db.add(Specification(component_id=i, name="socket", value="AM4"))
+            db.add(Specification(component_id=i, name="cores", value=str(i * 2)))
+            db.add(ComponentChange(component_id=i, version=i))
+        db.add(ComponentChange(component_id=9, version=4, deleted=True))
+        db.get(CatalogVersionCounter, 1).value = 4
+        db.commit()
+        db.close()
+
+    def test_full_ndjson_export(self):
+        """La exportación completa incluye cada componente con sus especificaciones"""
+        body = b"".join(stream_export(*begin_export(self.session_factory)))
+        records = [json.loads(line) for line in body.splitlines()]
+
+        self.assertEqual([r["id"] for r in records], [1, 2, 3])
+        self.assertEqual([s["name"] for s in records[1]["specifications"]], ["socket", "cores"])
+
+    def test_incremental_export_includes_tombstones(self):
+        """Con `since` solo salen los cambios posteriores y los borrados"""
+        body = b"".join(stream_export(*begin_export(self.session_factory), since=2))
+        records = [json.loads(line) for line in body.splitlines()]
+
+        self.assertEqual([(r["id"], r["version"]) for r in records], [(3, 3), (9, 4)])
+        self.assertTrue(records[1]["deleted"])
+
+    def test_gzip_csv_export(self):
+        """El CSV comprimido se descomprime con una cabecera y una fila por componente"""
+        body = b"".join(stream_export(*begin_export(self.session_factory), format="csv", gzip=True))
+        lines = gzip.decompress(body).decode().splitlines()
+
+        self.assertTrue(lines[0].startswith("id,version,deleted,name"))
+        self.assertEqual(len(lines), 4)
+
+    def test_changes_during_export_go_to_next_export(self):
+        """Lo escrito tras leer la versión no sale en esta exportación, sí en la siguiente"""
+        db, version = begin_export(self.session_factory)
+        self.assertEqual(version, 4)
+
+        writer = self.session_factory()
+        crud.record_component_change(writer, 1)
+        writer.commit()
+        writer.close()
+
+        records = [json.loads(line) for line in b"".join(stream_export(db, version, since=0)).splitlines()]
+        self.assertEqual([r["id"] for r in records], [2, 3, 9])
+
+        db, next_version = begin_export(self.session_factory)
+        records = [json.loads(line) for line in b"".join(stream_export(db, next_version, since=version)).splitlines()]
+        self.assertEqual([(r["id"], r["version"]) for r in records], [(1, 5)])
+
+
+class TestCatalogVersionOrdering(unittest.TestCase):
+
+    def test_versions_follow_commit_order(self):
+        """Una escritura concurrente espera al commit de la anterior y recibe una versión mayor"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "versions.db")
+        engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 10})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        commits = []
+
+        first = session_factory()
+        first_version = crud.record_component_change(first, 1)
+
+        def second_writer():
+            db = session_factory()
+            commits.append(("second", crud.record_component_change(db, 2)))
+            db.commit()
+            db.close()
+
+        thread = threading.Thread(target=second_writer)
+        thread.start()
+        time.sleep(0.2)
+        # La segunda escritura sigue bloqueada en el contador hasta este commit
+        self.assertEqual(commits, [])
+        commits.append(("first", first_version))
+        first.commit()
+        first.close()
+        thread.join(timeout=10)
+
+        self.assertEqual([name for name, _ in commits], ["first", "second"])
+        self.assertLess(commits[0][1], commits[1][1])
+        engine.dispose()
+
+
+class TestExportResponse(unittest.TestCase):
+
+    def test_session_released_if_body_never_starts(self):
+        """Si el cliente se desconecta antes del primer bloque, la conexión vuelve al pool"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        engine = create_engine(f"sqlite:///{os.path.join(directory.name, 'export.db')}")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+
+        response = export_response(sessionmaker(bind=engine))
+        self.assertEqual(response.headers["x-catalog-version"], "0")
+        self.assertEqual(engine.pool.checkedout(), 1)
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            # El envío de la cabecera no termina: el cuerpo no llega a recorrerse
+            await asyncio.Event().wait()
+
+        asyncio.run(response({"type": "http"}, receive, send))
+        del response
+        self.assertEqual(engine.pool.checkedout(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from types import SimpleNamespace
+
+from app.facets import FacetIndex, price_range_label
+
+
+def make_component(id, type, brand, price, specs=None, name=""):
+    return SimpleNamespace(
+        id=id, type=type, brand=brand, price=price, name=name,
+        specifications=[SimpleNamespace(name=k, value=v) for k, v in (specs or {}).items()]
+    )
+
+
+class TestFacetIndex(unittest.TestCase):
+
+    def setUp(self):
+        # Capacidad mínima para forzar el crecimiento de los bitmaps
+        self.index = FacetIndex(initial_capacity=2)
+        self.index.rebuild([
+            make_component(1, "CPU", "AMD", 199.0, {"socket": "AM4", "memory_support": "DDR4"}),
+            make_component(2, "CPU", "Intel", 329.0, {"socket": "LGA1700", "memory_support": "DDR4/DDR5"}),
+            make_component(3, "Motherboard", "ASUS", 180.0, {"socket": "AM4"}),
+            make_component(4, "RAM", "Corsair", 60.0, name="Corsair Vengeance 16GB DDR4"),
+            make_component(5, "GPU", "NVIDIA", 1600.0),
+        ])
+
+    def test_price_range_label(self):
+        """Los importes se asignan al rango correcto"""
+        self.assertEqual(price_range_label(99.99), "0-100")
+        self.assertEqual(price_range_label(100.0), "100-250")
+        self.assertEqual(price_range_label(5000.0), "1000+")
+
+    def test_and_across_facets_or_within(self):
+        """Los valores de una faceta se unen y las facetas se intersecan"""
+        result = self.index.search({"socket": ["AM4"]})
+        self.assertEqual(result["ids"], [1, 3])
+
+        result = self.index.search({"socket": ["AM4"], "type": ["cpu"]})
+        self.assertEqual(result["ids"], [1])
+
+        result = self.index.search({"brand": ["AMD", "Intel"]}, max_price=300.0)
+        self.assertEqual(result["ids"], [1])
+
+    def test_facet_counts_ignore_own_selection(self):
+        """Los conteos de una faceta no se restringen por su propia selección"""
+        result = self.index.search({"type": ["CPU"]})
+        self.assertEqual(result["facets"]["type"]["CPU"], 2)
+        self.assertEqual(result["facets"]["type"]["GPU"], 1)
+        self.assertEqual(result["facets"]["memory_type"], {"DDR4": 2, "DDR5": 1})
+        self.assertEqual(result["facets"]["price_range"]["100-250"], 1)
+
+    def test_incremental_updates(self):
+        """Las altas, cambios y bajas actualizan los bitmaps"""
+        self.index.add_component(make_component(3, "Motherboard", "ASUS", 180.0, {"socket": "LGA1700"}))
+        self.assertEqual(self.index.search({"socket": ["AM4"]})["ids"], [1])
+
+        self.index.remove_component(1)
+        result = self.index.search()
+        self.assertNotIn("AM4", result["facets"]["socket"])
+        self.assertEqual(result["ids"], [2, 3, 4, 5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from app.intent_service import IntentClassifier
+from app.nlp_training import NLPTrainer, preprocess_text
+
+
+def train_pipeline():
+    data = NLPTrainer().get_training_data()
+    pipeline = Pipeline([('tfidf', TfidfVectorizer(ngram_range=(1, 2))), ('classifier', MultinomialNB(alpha=0.1))])
+    pipeline.fit([preprocess_text(item["text"]) for item in data], [item["intent"] for item in data])
+    return pipeline
+
+
+class TestIntentClassifier(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = train_pipeline()
+        cls.texts = ["hola, necesito ayuda", "es compatible esta RAM", "tengo 800 dólares de presupuesto"]
+
+    def test_batch_matches_pipeline(self):
+        """El lote coincide con predict y las puntuaciones usan el orden de classes_"""
+        classifier = IntentClassifier()
+        classifier.set_pipeline(self.pipeline)
+        results = classifier.predict_intents(self.texts)
+        expected = self.pipeline.predict([preprocess_text(text) for text in self.texts])
+
+        self.assertEqual([r["intent"] for r in results], list(expected))
+        for result in results:
+            self.assertEqual(result["confidence"], max(result["all_scores"].values()))
+            self.assertEqual(result["all_scores"][result["intent"]], result["confidence"])
+        self.assertEqual(classifier.predict_intent(self.texts[1]), results[1])
+
+    def test_load_with_mmap(self):
+        """El modelo guardado se carga una vez desde una ruta absoluta con memory-mapping"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "nlp_model.joblib")
+            joblib.dump(self.pipeline, path)
+            classifier = IntentClassifier(model_path=path, mmap=True)
+
+            self.assertTrue(classifier.load())
+            self.assertEqual(classifier.predict_intent(self.texts[0])["intent"], self.pipeline.predict(["hola necesito ayuda"])[0])
+
+    def test_cache_by_preprocessed_text(self):
+        """Variantes que se preprocesan igual comparten la entrada de la caché"""
+        classifier = IntentClassifier()
+        classifier.set_pipeline(self.pipeline)
+        first = classifier.predict_intent("Hola, necesito ayuda!")
+        results = classifier.predict_intents(["hola necesito ayuda", "  HOLA necesito   ayuda", "gracias"])
+
+        self.assertEqual(results[:2], [first, first])
+        # Los textos repetidos dentro de un lote se consultan una sola vez
+        self.assertEqual(classifier.cache.hits, 1)
+        self.assertEqual(classifier.cache.misses, 2)
+
+    def test_model_file_change_invalidates_cache(self):
+        """Al cambiar el fichero del modelo se recarga y las entradas antiguas no se sirven"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "nlp_model.joblib")
+            joblib.dump(self.pipeline, path)
+            classifier = IntentClassifier(model_path=path, check_seconds=0)
+            classifier.load()
+            classifier.predict_intent("hola")
+            version = classifier.version
+
+            joblib.dump(self.pipeline, path)
+            mtime = os.stat(path).st_mtime + 10
+            os.utime(path, (mtime, mtime))
+            classifier.predict_intent("hola")
+
+            self.assertEqual(classifier.version, version + 1)
+            self.assertEqual(classifier.reloads, 1)
+            self.assertEqual(classifier.cache.hits, 0)
+            self.assertEqual(classifier.cache.misses, 2)
+
+    def test_set_pipeline_publishes_model_together(self):
+        """Pipeline, clases y versión se sustituyen a la vez y las predicciones usan las clases del modelo nuevo"""
+        other = Pipeline([('tfidf', TfidfVectorizer()), ('classifier', MultinomialNB())])
+        other.fit(["hola buenas", "adios gracias"], ["saludo", "despedida"])
+        classifier = IntentClassifier()
+        classifier.set_pipeline(self.pipeline)
+        classifier.predict_intent("hola")
+
+        classifier.set_pipeline(other)
+
+        self.assertEqual(classifier._model, (other, ["despedida", "saludo"], 2))
+        self.assertEqual(classifier.predict_intent("hola")["intent"], "saludo")
+        self.assertEqual(classifier.cache.hits, 0)
+
+    def test_missing_model(self):
+        """Sin modelo el clasificador no está disponible y no lanza al cargar"""
+        classifier = IntentClassifier(model_path="/nonexistent/nlp_model.joblib")
+
+        self.assertFalse(classifier.load())
+        with self.assertRaises(ValueError):
+            classifier.predict_intents(["hola"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from app.keyword_matcher import KeywordMatcher, chat_matcher
+
+
+class TestKeywordMatcher(unittest.TestCase):
+
+    def test_all_tables_in_one_match(self):
+        """Un solo análisis responde a intención, tema, componente y tipo de catálogo"""
+        matches = chat_matcher.match("Hola, ¿cuál es la mejor tarjeta gráfica para gaming en 1440p?")
+
+        self.assertEqual(matches.labels("intent"), ["best_component", "gaming_usage"])
+        self.assertEqual(matches.first("topic"), "greeting")
+        self.assertEqual(matches.first("component"), "gpu")
+        self.assertEqual(matches.first("catalog_type"), "GPU")
+        self.assertTrue(matches.has("modifier", "1440p"))
+        self.assertFalse(matches.has("modifier", "4k"))
+
+    def test_table_order_and_substrings(self):
+        """La prioridad sigue el orden de la tabla y las palabras coinciden como subcadenas"""
+        matcher = KeywordMatcher({"type": [("GPU", ["tarjeta"], None), ("Motherboard", ["tarjeta madre"], None)]})
+
+        self.assertEqual(matcher.match("Una TARJETA MADRE").labels("type"), ["GPU", "Motherboard"])
+        self.assertEqual(matcher.match("tarjetas").first("type"), "GPU")
+        self.assertIsNone(matcher.match("placa").first("type"))
+
+    def test_pattern_requires_keyword_and_regex(self):
+        """Las entradas con expresión regular exigen la palabra y el patrón"""
+        self.assertEqual(chat_matcher.match("que es una cpu").first("intent"), "component_info")
+        self.assertEqual(chat_matcher.match("que es ").first("intent", "unknown"), "unknown")
+        self.assertEqual(chat_matcher.match("recomienda una gpu").first("intent"), "component_recommendation")
+
+
+if __name__ == '__main__':
+    unittest.main()
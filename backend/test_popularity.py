@@ -0,0 +1,55 @@
+import threading
+import unittest
+
+from app.popularity import PopularityTracker, ShardedCounter, SpaceSaving
+
+
+class TestPopularityStructures(unittest.TestCase):
+
+    def test_sharded_counter_keeps_every_increment(self):
+        """Los incrementos de varios hilos se recogen completos tras dos recogidas"""
+        counter = ShardedCounter()
+
+        def worker():
+            for _ in range(1000):
+                counter.increment((1, "view"))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        first = counter.drain()
+        for thread in threads:
+            thread.join()
+        second = counter.drain()
+        third = counter.drain()
+
+        total = sum(d.get((1, "view"), 0) for d in (first, second, third))
+        self.assertEqual(total, 4000)
+        self.assertEqual(counter.drain(include_current=True), {})
+
+    def test_space_saving_keeps_heavy_hitters(self):
+        """Los elementos frecuentes sobreviven a los reemplazos"""
+        summary = SpaceSaving(capacity=3)
+        for key in range(100):
+            summary.offer(key)
+            summary.offer(7, 5)
+            summary.offer(42, 3)
+        top = dict(summary.top(2))
+        self.assertEqual(set(top), {7, 42})
+        self.assertGreaterEqual(top[7], 500)
+        self.assertEqual(len(summary), 3)
+
+        summary.discard(7)
+        self.assertNotIn(7, dict(summary.top(3)))
+    def test_tracker_top_subtracts_space_saving_error(self):
+        """Las impresiones descuentan el conteo heredado y la estimación queda como cota superior"""
+        tracker = PopularityTracker(top_capacity=2)
+        tracker._top.offer(1, 10)
+        tracker._top.offer(2, 4)
+        # Reemplaza al 2 y hereda sus 4 impresiones como error
+        tracker._top.offer(3, 1)
+
+        self.assertEqual(tracker.top(2), [(1, 10, 10), (3, 1, 5)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud
+from app.database import Base
+from app.response_cache import CatalogVersions, ResponseCache, etag_matches
+
+
+def make_request(if_none_match=None):
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return SimpleNamespace(headers=headers)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_versions_change_etags(self):
+        """Una escritura (también de otro proceso) cambia el ETag del catálogo y solo el del componente afectado"""
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        crud.record_component_change(db, 1)
+        crud.record_component_change(db, 2)
+        db.commit()
+
+        versions = CatalogVersions(sync_seconds=3600)
+        versions.sync(db)
+        catalog_etag = versions.catalog_etag()
+        first, second = versions.component_etag(1), versions.component_etag(2)
+
+        # Escritura de otro proceso: se ve al sincronizar tras el intervalo
+        crud.record_component_change(db, 1)
+        db.commit()
+        versions.sync(db)
+        self.assertEqual(versions.catalog_etag(), catalog_etag)
+        versions._next_sync = 0.0
+        versions.sync(db)
+
+        self.assertNotEqual(versions.catalog_etag(), catalog_etag)
+        self.assertNotEqual(versions.component_etag(1), first)
+        self.assertEqual(versions.component_etag(2), second)
+        db.close()
+
+    def test_etag_matches_if_none_match(self):
+        """If-None-Match admite listas, ETags débiles y el comodín"""
+        etag = '"abc-catalog-3"'
+        self.assertTrue(etag_matches(make_request(etag), etag))
+        self.assertTrue(etag_matches(make_request(f'"otro", W/{etag}'), etag))
+        self.assertTrue(etag_matches(make_request("*"), etag))
+        self.assertFalse(etag_matches(make_request('"abc-catalog-2"'), etag))
+        self.assertFalse(etag_matches(make_request(), etag))
+
+    def test_cache_is_keyed_by_etag_and_bounded(self):
+        """Un ETag distinto invalida la entrada y se expulsa la menos usada"""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", '"1"', b"[1]")
+        cache.put("b", '"1"', b"[2]")
+
+        self.assertEqual(cache.get("a", '"1"'), b"[1]")
+        self.assertIsNone(cache.get("a", '"2"'))
+
+        cache.put("c", '"1"', b"[3]")
+        self.assertIsNone(cache.get("b", '"1"'))
+        self.assertEqual(cache.get("a", '"1"'), b"[1]")
+        self.assertEqual(cache.get_metrics()["entries"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
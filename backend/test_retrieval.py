@@ -0,0 +1,80 @@
+import unittest
+from types import SimpleNamespace
+
+from app.retrieval import ComponentRetrievalIndex, tokenize
+
+
+def make_component(id, type, name, brand="", model="", specs=None):
+    return SimpleNamespace(
+        id=id, type=type, name=name, brand=brand, model=model,
+        specifications=[SimpleNamespace(name=k, value=v) for k, v in (specs or {}).items()]
+    )
+
+
+class TestComponentRetrievalIndex(unittest.TestCase):
+
+    def setUp(self):
+        # Bloque delta pequeño para que las altas pasen por la fusión con la matriz principal
+        self.index = ComponentRetrievalIndex(delta_rows=2)
+        self.index.rebuild([
+            make_component(1, "cpu", "AMD Ryzen 5 5600X", "AMD", "5600X", {"socket": "AM4", "cores": "6"}),
+            make_component(2, "cpu", "Intel Core i5-12400F", "Intel", "i5-12400F", {"socket": "LGA1700"}),
+            make_component(3, "gpu", "NVIDIA GeForce RTX 3060", "NVIDIA", "RTX 3060", {"memory_type": "GDDR6"}),
+            make_component(4, "motherboard", "ASUS TUF B550", "ASUS", "B550", {"socket": "AM4"}),
+        ])
+
+    def test_tokenize_folds_case_and_accents(self):
+        """Los términos se comparan en minúsculas y sin acentos"""
+        self.assertEqual(tokenize("Tarjeta Gráfica RTX-3060"), ["tarjeta", "grafica", "rtx", "3060"])
+
+    def test_ranks_by_relevance(self):
+        """Los componentes con más términos en común (y más raros) puntúan más"""
+        ids = [component_id for component_id, _ in self.index.search("procesador ryzen am4 cpu", k=3)]
+        self.assertEqual(ids[0], 1)
+        self.assertEqual(set(ids), {1, 2, 4})
+
+    def test_type_filter_and_top_k(self):
+        """El filtro de tipo no distingue mayúsculas y k limita los resultados"""
+        hits = self.index.search("socket am4", k=1, component_type="CPU")
+        self.assertEqual([component_id for component_id, _ in hits], [1])
+        self.assertEqual(self.index.search("am4", component_type="psu"), [])
+        self.assertEqual(self.index.search("hola"), [])
+
+    def test_incremental_updates(self):
+        """Altas, cambios y bajas se reflejan sin reconstruir el índice"""
+        self.index.add_component(make_component(5, "gpu", "AMD Radeon RX 6700 XT", "AMD", "RX 6700 XT"))
+        self.assertEqual(self.index.search("radeon")[0][0], 5)
+
+        self.index.add_component(make_component(3, "gpu", "NVIDIA GeForce RTX 4070", "NVIDIA", "RTX 4070"))
+        self.assertEqual(self.index.search("3060 gddr6"), [])
+        self.assertEqual(self.index.search("4070")[0][0], 3)
+
+        self.index.remove_component(1)
+        self.assertNotIn(1, [component_id for component_id, _ in self.index.search("ryzen am4")])
+        self.assertEqual(len(self.index), 4)
+
+    def test_document_frequencies_follow_updates(self):
+        """Reemplazar o borrar un componente descuenta sus términos antiguos de la frecuencia de documento"""
+        def df(term):
+            return self.index._df[self.index._vocabulary[term]]
+
+        self.assertEqual((df("am4"), df("3060"), df("nvidia")), (2, 1, 1))
+        self.index.add_component(make_component(3, "gpu", "NVIDIA GeForce RTX 4070", "NVIDIA", "RTX 4070"))
+        self.index.remove_component(4)
+
+        self.assertEqual((df("am4"), df("3060"), df("nvidia"), df("4070")), (1, 0, 1, 1))
+        self.index._compact()
+        self.assertEqual((df("am4"), df("3060"), df("nvidia"), df("4070")), (1, 0, 1, 1))
+
+    def test_compaction_keeps_results(self):
+        """Compactar elimina las filas muertas sin cambiar los resultados"""
+        self.index.remove_component(2)
+        before = self.index.search("socket am4 amd")
+        self.index._compact()
+        self.assertEqual(self.index.get_metrics()["dead_rows"], 0)
+        after = self.index.search("socket am4 amd")
+        self.assertEqual([component_id for component_id, _ in after], [component_id for component_id, _ in before])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from app.scrape_jobs import ScrapeJobQueue
+
+
+class TestScrapeJobQueue(unittest.TestCase):
+
+    def test_enqueue_deduplicates_and_respects_cooldown(self):
+        """Un tipo se encola una vez mientras está pendiente y no se repite durante el cooldown"""
+        scrape = MagicMock(return_value=3)
+        jobs = ScrapeJobQueue(scrape=scrape, cooldown_seconds=60)
+
+        self.assertTrue(jobs.enqueue("GPU"))
+        self.assertTrue(jobs.enqueue("GPU"))
+        self.assertEqual(jobs._queue.qsize(), 1)
+
+        self.assertEqual(jobs.run_job(MagicMock, "GPU"), 3)
+        self.assertFalse(jobs.is_pending("GPU"))
+        self.assertFalse(jobs.enqueue("GPU"))
+        self.assertEqual(jobs.get_metrics()["skipped_cooldown"], 1)
+        self.assertEqual(jobs.get_metrics()["created_components"], 3)
+
+    def test_wait_is_notified_from_worker_thread(self):
+        """Quien espera recibe el número de componentes creados por el hilo de trabajo"""
+        jobs = ScrapeJobQueue(scrape=MagicMock(return_value=2), cooldown_seconds=0)
+
+        async def scenario():
+            since = time.monotonic()
+            jobs.enqueue("RAM")
+            jobs.start(MagicMock)
+            try:
+                # Si el trabajo termina antes de empezar a esperar, `since` evita perder el aviso
+                return await jobs.wait("RAM", timeout=5, since=since), await jobs.wait("RAM", timeout=5)
+            finally:
+                jobs.stop()
+
+        self.assertEqual(asyncio.run(scenario()), (2, None))
+
+    def test_failed_job_is_not_pending(self):
+        """Un scraping que falla libera el tipo y cuenta como fallido"""
+        jobs = ScrapeJobQueue(scrape=MagicMock(side_effect=RuntimeError("sin red")), cooldown_seconds=0)
+        jobs.enqueue("PSU")
+
+        self.assertEqual(jobs.run_job(MagicMock, "PSU"), 0)
+        self.assertFalse(jobs.is_pending("PSU"))
+        self.assertEqual(jobs.failed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
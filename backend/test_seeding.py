@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base
+from app.models import Component, ComponentChange, Specification
+from app.seeding import import_components, normalize_record
+
+
+class TestSeeding(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        self.records = [
+            {"name": "Ryzen 5 5600X", "type": "cpu", "brand": "AMD", "price": 199.99,
+             "specifications": {"cores": 6, "threads": 12}, "compatibility_info": {"socket": "AM4"}},
+            {"name": "RTX 3060", "type": "gpu", "brand": "NVIDIA", "model": "GA106", "price": 329.99},
+            {"name": "Sin precio", "type": "gpu", "brand": "NVIDIA"},
+        ]
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_normalize_record_accepts_spec_dicts(self):
+        """Las especificaciones en dict y la compatibilidad se convierten en pares nombre/valor"""
+        component = normalize_record(self.records[0])
+
+        self.assertEqual(component.model, "Ryzen 5 5600X")
+        self.assertEqual(
+            [(spec.name, spec.value) for spec in component.specifications],
+            [("cores", "6"), ("threads", "12"), ("socket", "AM4")]
+        )
+
+    def test_import_is_idempotent(self):
+        """Cargar dos veces el mismo lote actualiza en lugar de duplicar"""
+        first = import_components(self.db, self.records)
+        self.records[1]["price"] = 299.99
+        second = import_components(self.db, self.records)
+
+        self.assertEqual((first["created"], first["updated"], first["invalid"]), (2, 0, 1))
+        self.assertEqual((second["created"], second["updated"], second["unchanged"]), (0, 1, 1))
+        self.assertEqual(self.db.query(Component).count(), 2)
+        self.assertEqual(self.db.query(Specification).count(), 3)
+        self.assertEqual(self.db.query(Component).filter_by(name="RTX 3060").one().price, 299.99)
+
+    def test_reimport_unchanged_writes_nothing(self):
+        """Volver a cargar el mismo fichero no reescribe filas ni asigna versiones nuevas"""
+        import_components(self.db, self.records)
+        version = self.db.query(func.max(ComponentChange.version)).scalar()
+        spec_ids = sorted(spec_id for spec_id, in self.db.query(Specification.id))
+
+        stats = import_components(self.db, self.records)
+
+        self.assertEqual((stats["created"], stats["updated"], stats["unchanged"]), (0, 0, 2))
+        self.assertEqual(self.db.query(func.max(ComponentChange.version)).scalar(), version)
+        self.assertEqual(self.db.query(Component).count(), 2)
+        self.assertEqual(sorted(spec_id for spec_id, in self.db.query(Specification.id)), spec_ids)
+
+    def test_batch_is_one_transaction(self):
+        """Si falla la actualización del lote, tampoco se guardan sus altas"""
+        import_components(self.db, self.records)
+        self.records[1]["price"] = 299.99
+        self.records.append({"name": "RX 6600", "type": "gpu", "brand": "AMD", "price": 219.99})
+
+        with patch.object(crud, "_update_rows", side_effect=OperationalError("UPDATE", {}, Exception("bloqueada"))):
+            with self.assertRaises(RuntimeError):
+                import_components(self.db, self.records)
+
+        self.assertEqual(self.db.query(Component).count(), 2)
+        self.assertEqual(self.db.query(Component).filter_by(name="RTX 3060").one().price, 329.99)
+
+
+if __name__ == '__main__':
+    unittest.main()
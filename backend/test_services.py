@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.chat_sessions import MemorySessionStore
+from app.chatbot import ComputerChatbot
+from app.services import ServiceContainer
+
+
+class TestServiceContainer(unittest.TestCase):
+
+    def test_chatbot_is_built_once(self):
+        """El chatbot se construye una vez y se comparte"""
+        container = ServiceContainer()
+        container.start()
+        chatbot = container.chatbot
+        container.start()
+
+        self.assertIs(container.chatbot, chatbot)
+        self.assertIs(container.session_store, chatbot.session_store)
+
+    def test_engine_per_request_session(self):
+        """Cada petición obtiene un motor ligado a su propia sesión"""
+        factory = MagicMock(side_effect=lambda db: MagicMock(db=db))
+        container = ServiceContainer(engine_factory=factory)
+        first_db, second_db = object(), object()
+
+        self.assertIs(container.create_engine(first_db).db, first_db)
+        self.assertIs(container.create_engine(second_db).db, second_db)
+
+    def test_chatbot_recommendation_uses_given_session(self):
+        """El chatbot no guarda motor: lo crea con la sesión recibida"""
+        factory = MagicMock()
+        factory.return_value._calculate_budget_distribution.return_value = {}
+        factory.return_value._select_components_by_budget.return_value = {}
+        chatbot = ComputerChatbot(session_store=MemorySessionStore(), engine_factory=factory)
+        db = object()
+
+        chatbot.generate_recommendation(db, 1000, "gaming")
+
+        factory.assert_called_once_with(db)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Component, PriceHistory, Specification
+from app.snapshots import create_snapshot, get_latest_manifest, load_snapshot_table
+
+
+class TestCatalogSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        for i in range(1, 6):
+            self.db.add(Component(id=i, name=f"C{i}", type="GPU", brand="NVIDIA", model=f"M{i}", price=10.0 * i))
+            self.db.add(Specification(component_id=i, name="vram", value="8GB"))
+            self.db.add(PriceHistory(component_id=i, price=10.0 * i, recorded_at=datetime(2026, 1, i)))
+        self.db.commit()
+        directory = tempfile.TemporaryDirectory(prefix="computer-snapshots-")
+        self.addCleanup(directory.cleanup)
+        self.base_dir = directory.name
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_snapshot_roundtrip_with_memory_map(self):
+        """La instantánea conserva filas y tipos y se lee con memory-mapping"""
+        manifest = create_snapshot(self.db, base_dir=self.base_dir, batch_size=2)
+
+        self.assertEqual(manifest["tables"]["components"]["rows"], 5)
+        self.assertEqual(get_latest_manifest(self.base_dir)["name"], manifest["name"])
+
+        components = load_snapshot_table("components", base_dir=self.base_dir)
+        self.assertEqual(components.column("price").to_pylist(), [10.0, 20.0, 30.0, 40.0, 50.0])
+        history = load_snapshot_table("price_history", base_dir=self.base_dir).to_pandas()
+        self.assertTrue(str(history["recorded_at"].dtype).startswith("datetime64"))
+
+    def test_old_snapshots_are_pruned(self):
+        """Solo se conservan las últimas `keep` instantáneas"""
+        for _ in range(3):
+            create_snapshot(self.db, base_dir=self.base_dir, keep=2)
+        snapshots = [name for name in os.listdir(self.base_dir) if name.startswith("snapshot-")]
+        self.assertEqual(len(snapshots), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Component
+from app.stats import StatsService, compute_component_stats
+
+
+class TestComponentStats(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        self.db = sessionmaker(bind=engine)()
+        # Precios desordenados para comprobar que los percentiles no dependen del orden de inserción
+        for i, price in enumerate([300.0, 100.0, 500.0, 200.0, 400.0], start=1):
+            self.db.add(Component(name=f"CPU {i}", type="CPU", price=price,
+                                  performance_score=10.0 * i, power_consumption=50 + 10 * i))
+        # Sin precio: cuenta para el total pero no para los percentiles
+        self.db.add(Component(name="CPU sin precio", type="CPU", price=None))
+        self.db.add(Component(name="GPU única", type="GPU", price=700.0))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_sqlite_fallback_percentiles(self):
+        """En SQLite los percentiles se calculan aparte con interpolación lineal"""
+        stats = compute_component_stats(self.db)
+
+        cpu = stats["CPU"]
+        self.assertEqual(cpu["count"], 6)
+        self.assertEqual((cpu["min_price"], cpu["max_price"], cpu["avg_price"]), (100.0, 500.0, 300.0))
+        self.assertEqual(cpu["avg_performance_score"], 30.0)
+        self.assertEqual(cpu["avg_power_consumption"], 80.0)
+        self.assertEqual(cpu["price_percentiles"], {"p25": 200.0, "p50": 300.0, "p75": 400.0, "p90": 460.0})
+        self.assertEqual(stats["GPU"]["price_percentiles"], {"p25": 700.0, "p50": 700.0, "p75": 700.0, "p90": 700.0})
+        self.assertIsNone(stats["GPU"]["avg_performance_score"])
+
+    def test_snapshot_and_type_counts(self):
+        """La instantánea se calcula una vez y solo cambia al refrescar"""
+        service = StatsService()
+        snapshot = service.get_snapshot(self.db)
+        self.db.add(Component(name="RAM", type="RAM", price=80.0))
+        self.db.commit()
+
+        self.assertIs(service.get_snapshot(self.db), snapshot)
+        self.assertEqual(snapshot["total"], 7)
+        self.assertEqual(service.refresh(self.db)["version"], 2)
+
+        counts = service.get_type_counts(self.db)
+        self.assertEqual((counts["CPU"], counts["RAM"], counts["Case"], counts["total"]), (6, 1, 0, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()
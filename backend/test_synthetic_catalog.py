@@ -0,0 +1,29 @@
+import unittest
+
+from app.seeding import normalize_record
+from app.synthetic_catalog import SOCKETS, TYPE_WEIGHTS, generate_catalog
+
+
+class TestSyntheticCatalog(unittest.TestCase):
+
+    def test_same_seed_same_catalog(self):
+        """La misma semilla reproduce el catálogo y un prefijo coincide con el catálogo menor"""
+        self.assertEqual(list(generate_catalog(200, seed=7)), list(generate_catalog(500, seed=7))[:200])
+        self.assertNotEqual(list(generate_catalog(50, seed=7)), list(generate_catalog(50, seed=8)))
+
+    def test_records_are_valid_and_coherent(self):
+        """Los registros se importan sin errores y los sockets llevan su memoria"""
+        records = list(generate_catalog(2000))
+
+        self.assertEqual(len({(r["type"], r["brand"], r["name"]) for r in records}), len(records))
+        self.assertEqual({r["type"] for r in records}, set(TYPE_WEIGHTS))
+        for record in records:
+            normalize_record(record)
+            self.assertTrue(1.0 <= record["performance_score"] <= 100.0)
+            if record["type"] == "cpu":
+                specs = record["specifications"]
+                self.assertEqual(specs["memory_support"], SOCKETS[specs["socket"]][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
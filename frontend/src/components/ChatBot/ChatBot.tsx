@@ -58,6 +58,7 @@ const ChatBot: React.FC<ChatBotProps> = ({ isOpen = false, onToggle }) => {
   const [inputMessage, setInputMessage] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [isTyping, setIsTyping] = useState(false);
+  const [sessionId, setSessionId] = useState<string | undefined>(undefined);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   
   const handleToggleChat = () => {
@@ -98,22 +99,31 @@ const ChatBot: React.FC<ChatBotProps> = ({ isOpen = false, onToggle }) => {
     setIsLoading(true);
     setIsTyping(true);
 
-    try {
-      const response = await chatService.sendMessage(inputMessage);
-      
-      setTimeout(() => {
-        const botMessage: Message = {
-          id: (Date.now() + 1).toString(),
-          text: response.message,
-          sender: 'bot',
-          timestamp: new Date(),
-          type: 'text'
-        };
+    // La respuesta se muestra en cuanto llega el primer fragmento
+    const botMessageId = (Date.now() + 1).toString();
+    let botText = '';
+    const showBotText = (text: string) => {
+      botText = text;
+      const botMessage: Message = { id: botMessageId, text, sender: 'bot', timestamp: new Date(), type: 'text' };
+      setIsTyping(false);
+      setMessages(prev => prev.some(message => message.id === botMessageId)
+        ? prev.map(message => message.id === botMessageId ? { ...message, text } : message)
+        : [...prev, botMessage]);
+    };
 
-        setMessages(prev => [...prev, botMessage]);
-        setIsLoading(false);
-        setIsTyping(false);
-      }, 1000); // Simular tiempo de escritura
+    try {
+      await chatService.streamMessage(inputMessage, {
+        onSession: setSessionId,
+        onChunk: chunk => showBotText(botText + chunk),
+        onComponents: text => showBotText(botText + text),
+        // La respuesta ya está completa; el stream sigue abierto esperando al scraping
+        onComponentsPending: text => {
+          showBotText(botText + text);
+          setIsLoading(false);
+        }
+      }, sessionId);
+      setIsLoading(false);
+      setIsTyping(false);
     } catch (error) {
       console.error('Error sending message:', error);
       const errorMessage: Message = {
@@ -138,6 +148,7 @@ const ChatBot: React.FC<ChatBotProps> = ({ isOpen = false, onToggle }) => {
   };
 
   const handleClearChat = () => {
+    setSessionId(undefined);
     setMessages([
       {
         id: '1',
@@ -185,6 +185,104 @@ export const searchComponents = async (
   }
 };
 
+export interface IComponentSuggestion {
+  id: number;
+  name: string;
+  brand?: string;
+  model?: string;
+  type?: string;
+}
+
+export const getComponentSuggestions = async (query: string, limit: number = 10): Promise<IComponentSuggestion[]> => {
+  try {
+    const response = await api.get('/components/suggest', { params: { q: query, limit } });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching component suggestions:', error);
+    throw error;
+  }
+};
+
+export interface IFacetFilters {
+  type?: string[];
+  brand?: string[];
+  price_range?: string[];
+  socket?: string[];
+  memory_type?: string[];
+  min_price?: number;
+  max_price?: number;
+  skip?: number;
+  limit?: number;
+}
+
+export interface IFacetSearchResult {
+  total: number;
+  items: IComponent[];
+  facets: Record<string, Record<string, number>>;
+}
+
+export const getComponentFacets = async (filters?: IFacetFilters): Promise<IFacetSearchResult> => {
+  try {
+    const response = await api.get('/components/facets', {
+      params: filters,
+      paramsSerializer: { indexes: null }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching component facets:', error);
+    throw error;
+  }
+};
+
+export interface IBulkItemResult {
+  index: number;
+  status: 'created' | 'updated' | 'deleted' | 'not_found' | 'invalid' | 'error';
+  id?: number;
+  error?: string;
+}
+
+export interface IBulkOperationResult {
+  succeeded: number;
+  failed: number;
+  results: IBulkItemResult[];
+}
+
+export type IComponentInput = Omit<IComponent, 'id' | 'specifications'> & {
+  specifications: Omit<ISpecification, 'id'>[];
+};
+
+export const bulkCreateComponents = async (components: IComponentInput[]): Promise<IBulkOperationResult> => {
+  try {
+    const response = await api.post('/components/bulk', components, { timeout: 120000 });
+    return response.data;
+  } catch (error) {
+    console.error('Error in bulk component creation:', error);
+    throw error;
+  }
+};
+
+export const bulkUpdateComponents = async (
+  components: (IComponentInput & { id: number })[]
+): Promise<IBulkOperationResult> => {
+  try {
+    const response = await api.put('/components/bulk', components, { timeout: 120000 });
+    return response.data;
+  } catch (error) {
+    console.error('Error in bulk component update:', error);
+    throw error;
+  }
+};
+
+export const bulkDeleteComponents = async (componentIds: number[]): Promise<IBulkOperationResult> => {
+  try {
+    const response = await api.delete('/components/bulk', { data: componentIds, timeout: 120000 });
+    return response.data;
+  } catch (error) {
+    console.error('Error in bulk component deletion:', error);
+    throw error;
+  }
+};
+
 // Compatibilidad
 export const checkCompatibility = async (
   componentIds: number[]
@@ -335,7 +433,14 @@ export const getComponentStats = async (): Promise<any> => {
   }
 };
 
-export const getPopularComponents = async (limit: number = 10): Promise<IComponent[]> => {
+export interface IPopularComponent {
+  component: IComponent;
+  // Mínimo garantizado; impressions_upper_bound es la estimación del ranking
+  impressions: number;
+  impressions_upper_bound: number;
+}
+
+export const getPopularComponents = async (limit: number = 10): Promise<IPopularComponent[]> => {
   try {
     const response = await api.get(`/stats/popular-components?limit=${limit}`);
     return response.data;
@@ -15,6 +15,21 @@ export interface IChatRequest {
 export interface IChatResponse {
   message: string;
   session_id: string;
+  catalog_refresh_pending?: boolean;
+}
+
+export interface IChatStreamComponent {
+  id: number;
+  name: string;
+  price: number;
+}
+
+export interface IChatStreamHandlers {
+  onSession?: (sessionId: string) => void;
+  onChunk: (text: string) => void;
+  onComponents?: (text: string, components: IChatStreamComponent[]) => void;
+  // El catálogo no tenía el tipo pedido; llegará un evento onComponents si el scraping encuentra algo
+  onComponentsPending?: (text: string, componentType: string) => void;
 }
 
 export interface IChatHistoryResponse {
@@ -31,6 +46,41 @@ const chatService = {
     return response.data;
   },
 
+  // Server-Sent Events por POST: fetch + ReadableStream (EventSource solo admite GET)
+  streamMessage: async (message: string, handlers: IChatStreamHandlers, sessionId?: string): Promise<void> => {
+    const response = await fetch(`${API_URL}/api/chatbot/chat/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify({ message, session_id: sessionId })
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Error en el chat (${response.status})`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const data = block.split('\n').find(line => line.startsWith('data: '));
+        if (data) {
+          const event = JSON.parse(data.slice(6));
+          if (event.type === 'session') handlers.onSession?.(event.session_id);
+          else if (event.type === 'chunk') handlers.onChunk(event.text);
+          else if (event.type === 'components') handlers.onComponents?.(event.text, event.components);
+          else if (event.type === 'components_pending') handlers.onComponentsPending?.(event.text, event.component_type);
+        }
+        boundary = buffer.indexOf('\n\n');
+      }
+    }
+  },
+
   getChatHistory: async (sessionId: string): Promise<IChatHistoryResponse> => {
     const response = await axios.get(`${API_URL}/api/chatbot/history/${sessionId}`);
     return response.data;